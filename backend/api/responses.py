@@ -0,0 +1,88 @@
+"""
+JSON responses.
+
+Serializes response models straight to bytes with pydantic-core, skipping
+FastAPI's re-validation and dict round trip, and encodes other content
+with orjson.
+"""
+from functools import lru_cache
+from typing import Any, List, Mapping, Optional, Sequence, Type, Union
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import Response
+from config import settings
+
+Content = Union[BaseModel, Sequence[BaseModel], Any]
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """TypeAdapter for a list of one response model (built once per model)."""
+    return TypeAdapter(List[model])  # type: ignore[valid-type]
+
+
+def _model_adapter(content: Any) -> Optional[Union[BaseModel, TypeAdapter]]:
+    """Find what can serialize content directly: the model itself or a list adapter."""
+    if isinstance(content, BaseModel):
+        return content
+
+    if isinstance(content, list) and content and isinstance(content[0], BaseModel):
+        model = type(content[0])
+        if all(type(item) is model for item in content):
+            return _list_adapter(model)
+
+    return None
+
+
+class ModelJSONResponse(JSONResponse):
+    """JSON response rendered by pydantic-core for models, orjson otherwise."""
+
+    def render(self, content: Any) -> bytes:
+        adapter = _model_adapter(content)
+        if isinstance(adapter, BaseModel):
+            return adapter.model_dump_json().encode()
+        if adapter is not None:
+            return adapter.dump_json(content)
+
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def model_response(
+    content: Content,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """
+    Build the JSON response for a route's response model(s).
+
+    Routes keep `response_model` for the OpenAPI schema but return this, so
+    the models they just built are not validated and converted again.
+    Setting FAST_JSON_RESPONSES=false falls back to stdlib encoding.
+
+    Args:
+        content: Response model, list of response models, or JSON-ready data
+        status_code: HTTP status code
+        headers: Extra response headers
+
+    Returns:
+        JSON Response
+
+    Examples:
+        >>> response = model_response(SessionResponse(...), status_code=201)
+        >>> response.media_type
+        'application/json'
+    """
+    if settings.fast_json_responses:
+        return ModelJSONResponse(content, status_code=status_code, headers=headers)
+
+    adapter = _model_adapter(content)
+    if isinstance(adapter, BaseModel):
+        content = adapter.model_dump(mode="json")
+    elif adapter is not None:
+        content = adapter.dump_python(content, mode="json")
+    else:
+        content = jsonable_encoder(content)
+
+    return JSONResponse(content, status_code=status_code, headers=headers)
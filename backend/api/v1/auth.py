@@ -4,10 +4,11 @@ Authentication API endpoints.
 Handles user signup, signin, and token refresh.
 """
 import logging
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Response
 from models.user import UserCreate, UserLogin, TokenResponse, UserProfile, User
 from services.auth_service import auth_service
 from dependencies.auth import get_current_user
+from api.responses import model_response
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +16,7 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
 
 
 @router.post("/signup", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-async def signup(user_data: UserCreate) -> TokenResponse:
+async def signup(user_data: UserCreate) -> Response:
     """
     Create new user account.
     
@@ -30,7 +31,7 @@ async def signup(user_data: UserCreate) -> TokenResponse:
     """
     try:
         # Sign up with Supabase Auth
-        auth_response = auth_service.supabase.auth.sign_up({
+        auth_response = await auth_service.supabase.auth.sign_up({
             "email": user_data.email,
             "password": user_data.password
         })
@@ -42,7 +43,7 @@ async def signup(user_data: UserCreate) -> TokenResponse:
             )
         
         # Create user profile
-        profile = auth_service.create_user_profile(
+        profile = await auth_service.create_user_profile(
             user_id=auth_response.user.id,
             email=auth_response.user.email
         )
@@ -57,12 +58,15 @@ async def signup(user_data: UserCreate) -> TokenResponse:
         
         logger.info(f"User signed up: {user.id}")
         
-        return TokenResponse(
-            access_token=auth_response.session.access_token,
-            token_type="bearer",
-            expires_in=auth_response.session.expires_in,
-            refresh_token=auth_response.session.refresh_token,
-            user=user
+        return model_response(
+            TokenResponse(
+                access_token=auth_response.session.access_token,
+                token_type="bearer",
+                expires_in=auth_response.session.expires_in,
+                refresh_token=auth_response.session.refresh_token,
+                user=user
+            ),
+            status_code=status.HTTP_201_CREATED
         )
         
     except Exception as e:
@@ -74,7 +78,7 @@ async def signup(user_data: UserCreate) -> TokenResponse:
 
 
 @router.post("/signin", response_model=TokenResponse)
-async def signin(credentials: UserLogin) -> TokenResponse:
+async def signin(credentials: UserLogin) -> Response:
     """
     Authenticate user and return tokens.
     
@@ -89,7 +93,7 @@ async def signin(credentials: UserLogin) -> TokenResponse:
     """
     try:
         # Sign in with Supabase Auth
-        auth_response = auth_service.supabase.auth.sign_in_with_password({
+        auth_response = await auth_service.supabase.auth.sign_in_with_password({
             "email": credentials.email,
             "password": credentials.password
         })
@@ -110,12 +114,14 @@ async def signin(credentials: UserLogin) -> TokenResponse:
         
         logger.info(f"User signed in: {user.id}")
         
-        return TokenResponse(
-            access_token=auth_response.session.access_token,
-            token_type="bearer",
-            expires_in=auth_response.session.expires_in,
-            refresh_token=auth_response.session.refresh_token,
-            user=user
+        return model_response(
+            TokenResponse(
+                access_token=auth_response.session.access_token,
+                token_type="bearer",
+                expires_in=auth_response.session.expires_in,
+                refresh_token=auth_response.session.refresh_token,
+                user=user
+            )
         )
         
     except Exception as e:
@@ -127,7 +133,7 @@ async def signin(credentials: UserLogin) -> TokenResponse:
 
 
 @router.post("/refresh", response_model=TokenResponse)
-async def refresh_token(refresh_token: str) -> TokenResponse:
+async def refresh_token(refresh_token: str) -> Response:
     """
     Refresh access token using refresh token.
     
@@ -142,7 +148,7 @@ async def refresh_token(refresh_token: str) -> TokenResponse:
     """
     try:
         # Refresh session with Supabase Auth
-        auth_response = auth_service.supabase.auth.refresh_session(refresh_token)
+        auth_response = await auth_service.supabase.auth.refresh_session(refresh_token)
         
         if not auth_response.user:
             raise HTTPException(
@@ -160,12 +166,14 @@ async def refresh_token(refresh_token: str) -> TokenResponse:
         
         logger.info(f"Token refreshed for user: {user.id}")
         
-        return TokenResponse(
-            access_token=auth_response.session.access_token,
-            token_type="bearer",
-            expires_in=auth_response.session.expires_in,
-            refresh_token=auth_response.session.refresh_token,
-            user=user
+        return model_response(
+            TokenResponse(
+                access_token=auth_response.session.access_token,
+                token_type="bearer",
+                expires_in=auth_response.session.expires_in,
+                refresh_token=auth_response.session.refresh_token,
+                user=user
+            )
         )
         
     except Exception as e:
@@ -179,7 +187,7 @@ async def refresh_token(refresh_token: str) -> TokenResponse:
 @router.get("/me", response_model=UserProfile)
 async def get_current_user_profile(
     current_user: User = Depends(get_current_user)
-) -> UserProfile:
+) -> Response:
     """
     Get current user's profile.
     
@@ -192,7 +200,7 @@ async def get_current_user_profile(
     Raises:
         HTTPException: 404 if profile not found
     """
-    profile = auth_service.get_user_profile(str(current_user.id))
+    profile = await auth_service.get_user_profile(str(current_user.id))
     
     if not profile:
         raise HTTPException(
@@ -200,4 +208,4 @@ async def get_current_user_profile(
             detail="Profile not found."
         )
     
-    return profile
+    return model_response(profile)
@@ -5,12 +5,15 @@ Handles daily check-in creation and history retrieval.
 """
 import logging
 from datetime import date
-from typing import List
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from models.user import User
 from models.daily_check import DailyCheckCreate, DailyCheckResponse
 from services.daily_check_service import daily_check_service
+from services.pagination import NEXT_CURSOR_HEADER, next_cursor
 from dependencies.auth import get_current_user
+from models.conversion import to_response, to_responses
+from api.responses import model_response
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +24,7 @@ router = APIRouter(prefix="/daily-check", tags=["daily-check"])
 async def create_daily_check(
     check_data: DailyCheckCreate,
     current_user: User = Depends(get_current_user)
-) -> DailyCheckResponse:
+) -> Response:
     """
     Create daily check-in.
     
@@ -36,18 +39,16 @@ async def create_daily_check(
         HTTPException: 409 if check already exists for today
     """
     try:
-        check = daily_check_service.create_daily_check(
+        check = await daily_check_service.create_daily_check(
             user_id=str(current_user.id),
             check_data=check_data
         )
         
         logger.info(f"Daily check created for user: {current_user.id}")
         
-        return DailyCheckResponse(
-            id=check.id,
-            check_date=check.check_date,
-            responses=check.responses,
-            completed_at=check.completed_at
+        return model_response(
+            to_response(DailyCheckResponse, check),
+            status_code=status.HTTP_201_CREATED
         )
         
     except Exception as e:
@@ -68,7 +69,7 @@ async def create_daily_check(
 @router.get("/today", response_model=DailyCheckResponse)
 async def get_today_check(
     current_user: User = Depends(get_current_user)
-) -> DailyCheckResponse:
+) -> Response:
     """
     Get today's check if exists.
     
@@ -82,7 +83,7 @@ async def get_today_check(
         HTTPException: 404 if no check exists for today
     """
     today = date.today()
-    check = daily_check_service.get_today_check(
+    check = await daily_check_service.get_today_check(
         user_id=str(current_user.id),
         check_date=today
     )
@@ -93,43 +94,45 @@ async def get_today_check(
             detail="No check for today."
         )
     
-    return DailyCheckResponse(
-        id=check.id,
-        check_date=check.check_date,
-        responses=check.responses,
-        completed_at=check.completed_at
-    )
+    return model_response(to_response(DailyCheckResponse, check))
 
 
 @router.get("/history", response_model=List[DailyCheckResponse])
 async def get_check_history(
     limit: int = Query(30, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     current_user: User = Depends(get_current_user)
-) -> List[DailyCheckResponse]:
+) -> Response:
     """
     Get past checks with pagination.
     
     Args:
         limit: Maximum number of checks to return (1-100)
-        offset: Number of checks to skip
+        offset: Number of checks to skip (ignored with a cursor)
+        cursor: X-Next-Cursor value from the previous page
         current_user: Authenticated user
         
     Returns:
         List of daily checks in reverse chronological order
     """
-    checks = daily_check_service.get_check_history(
-        user_id=str(current_user.id),
-        limit=limit,
-        offset=offset
-    )
-    
-    return [
-        DailyCheckResponse(
-            id=check.id,
-            check_date=check.check_date,
-            responses=check.responses,
-            completed_at=check.completed_at
+    try:
+        checks = await daily_check_service.get_check_history(
+            user_id=str(current_user.id),
+            limit=limit,
+            offset=offset,
+            cursor=cursor
         )
-        for check in checks
-    ]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    next_page = next_cursor(checks, limit, lambda check: check.check_date)
+    headers = {NEXT_CURSOR_HEADER: next_page} if next_page else None
+    
+    return model_response(
+        to_responses(DailyCheckResponse, checks),
+        headers=headers
+    )
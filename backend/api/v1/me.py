@@ -0,0 +1,188 @@
+"""
+Current user API endpoints.
+
+Handles aggregated reads for the signed-in user's home screen, live state
+events, and bulk export/import of their practice history.
+"""
+import asyncio
+import logging
+from typing import AsyncIterator
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from config import settings
+from models.user import User
+from models.dashboard import DashboardResponse
+from models.history import HistoryImportResponse
+from services.dashboard_service import dashboard_service
+from services.history_service import history_service, NDJSON_MEDIA_TYPE
+from services.events import event_bus, Event, SNAPSHOT
+from services.session_service import session_service
+from services.reduced_mode_service import reduced_mode_service
+from models.conversion import to_response
+from models.session import SessionResponse
+from models.reduced_mode import ReducedModeResponse
+from dependencies.auth import get_current_user
+from api.responses import model_response
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/me", tags=["me"])
+
+
+@router.get("/dashboard", response_model=DashboardResponse)
+async def get_dashboard(
+    current_user: User = Depends(get_current_user)
+) -> Response:
+    """
+    Get everything the home screen shows in one call.
+    
+    Active session, today's check, reduced mode state, active setup and the
+    latest weekly check are loaded concurrently. Optional sections that fail
+    are omitted and listed in `unavailable`.
+    
+    Args:
+        current_user: Authenticated user
+        
+    Returns:
+        Aggregated dashboard
+        
+    Raises:
+        HTTPException: 503 if a required section cannot be loaded
+    """
+    try:
+        return model_response(await dashboard_service.get_dashboard(str(current_user.id)))
+        
+    except Exception as e:
+        logger.error(f"Failed to load dashboard: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Unable to load dashboard. Try again in a moment."
+        )
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def stream_events(
+    current_user: User = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Stream live session and reduced mode changes (Server-Sent Events).
+    
+    The first event is a `snapshot` of the active session and reduced mode
+    state. After that, `session.started`, `session.ended`,
+    `session.abandoned` and `reduced_mode.changed` arrive as they happen
+    on any device, so clients do not need to poll. A comment line is sent
+    every EVENTS_HEARTBEAT seconds to keep proxies from closing the stream.
+    
+    Args:
+        current_user: Authenticated user
+        
+    Returns:
+        text/event-stream response
+    """
+    user_id = str(current_user.id)
+    
+    async def stream() -> AsyncIterator[bytes]:
+        # Subscribed before the snapshot is read, so no change falls in between
+        with event_bus.subscribe(user_id) as events:
+            session, reduced_mode = await asyncio.gather(
+                session_service.get_active_session(user_id),
+                reduced_mode_service.get_reduced_mode_state(user_id)
+            )
+            snapshot = Event(type=SNAPSHOT, data={
+                "active_session": session and to_response(SessionResponse, session).model_dump(mode="json"),
+                "reduced_mode": reduced_mode and to_response(ReducedModeResponse, reduced_mode).model_dump(mode="json"),
+            })
+            yield b"retry: 3000\n" + snapshot.sse()
+            
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.get(), settings.events_heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield event.sse()
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        # Keep proxies (nginx) from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_history(
+    current_user: User = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Download the user's full practice history as NDJSON.
+    
+    Each line is {"table": ..., "row": ...} for one session, daily check,
+    weekly check or setup activation. Rows are streamed page by page, so
+    memory use does not grow with history size.
+    
+    Args:
+        current_user: Authenticated user
+        
+    Returns:
+        Streaming NDJSON attachment
+        
+    Raises:
+        HTTPException: 503 if the first page cannot be loaded
+    """
+    chunks = history_service.export_history(str(current_user.id))
+    
+    # Read the first page before committing to a 200 so early failures get a status code
+    try:
+        first = await anext(chunks, b"")
+    except Exception as e:
+        logger.error(f"Failed to export history: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Unable to export history. Try again in a moment."
+        )
+    
+    async def body() -> AsyncIterator[bytes]:
+        yield first
+        async for chunk in chunks:
+            yield chunk
+    
+    return StreamingResponse(
+        body(),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="makana-history.ndjson"'}
+    )
+
+
+@router.post("/import", response_model=HistoryImportResponse)
+async def import_history(
+    request: Request,
+    current_user: User = Depends(get_current_user)
+) -> Response:
+    """
+    Import practice history from an NDJSON export.
+    
+    The body is read and written in batches as it arrives. Rows already
+    present are left unchanged, so a failed import can be retried with
+    the same file.
+    
+    Args:
+        request: Request carrying the NDJSON body
+        current_user: Authenticated user
+        
+    Returns:
+        Rows imported per table and lines skipped
+        
+    Raises:
+        HTTPException: 503 if a batch cannot be written
+    """
+    try:
+        result = await history_service.import_history(str(current_user.id), request.stream())
+        return model_response(result)
+        
+    except Exception as e:
+        logger.error(f"Failed to import history: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Unable to finish the import. Sending the same file again is safe."
+        )
@@ -4,11 +4,13 @@ Reduced Mode API endpoints.
 Handles reduced mode activation, deactivation, and status.
 """
 import logging
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Response
 from models.user import User
 from models.reduced_mode import ReducedModeResponse
 from services.reduced_mode_service import reduced_mode_service
 from dependencies.auth import get_current_user
+from models.conversion import to_response
+from api.responses import model_response
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +20,7 @@ router = APIRouter(prefix="/reduced-mode", tags=["reduced-mode"])
 @router.post("/activate", response_model=ReducedModeResponse)
 async def activate_reduced_mode(
     current_user: User = Depends(get_current_user)
-) -> ReducedModeResponse:
+) -> Response:
     """
     Enable reduced mode.
     
@@ -29,17 +31,13 @@ async def activate_reduced_mode(
         Updated reduced mode state
     """
     try:
-        state = reduced_mode_service.activate_reduced_mode(
+        state = await reduced_mode_service.activate_reduced_mode(
             user_id=str(current_user.id)
         )
         
         logger.info(f"Reduced mode activated for user: {current_user.id}")
         
-        return ReducedModeResponse(
-            is_active=state.is_active,
-            activated_at=state.activated_at,
-            deactivated_at=state.deactivated_at
-        )
+        return model_response(to_response(ReducedModeResponse, state))
         
     except Exception as e:
         logger.error(f"Failed to activate reduced mode: {str(e)}")
@@ -52,7 +50,7 @@ async def activate_reduced_mode(
 @router.post("/deactivate", response_model=ReducedModeResponse)
 async def deactivate_reduced_mode(
     current_user: User = Depends(get_current_user)
-) -> ReducedModeResponse:
+) -> Response:
     """
     Disable reduced mode.
     
@@ -63,17 +61,13 @@ async def deactivate_reduced_mode(
         Updated reduced mode state
     """
     try:
-        state = reduced_mode_service.deactivate_reduced_mode(
+        state = await reduced_mode_service.deactivate_reduced_mode(
             user_id=str(current_user.id)
         )
         
         logger.info(f"Reduced mode deactivated for user: {current_user.id}")
         
-        return ReducedModeResponse(
-            is_active=state.is_active,
-            activated_at=state.activated_at,
-            deactivated_at=state.deactivated_at
-        )
+        return model_response(to_response(ReducedModeResponse, state))
         
     except Exception as e:
         logger.error(f"Failed to deactivate reduced mode: {str(e)}")
@@ -86,7 +80,7 @@ async def deactivate_reduced_mode(
 @router.get("/status", response_model=ReducedModeResponse)
 async def get_reduced_mode_status(
     current_user: User = Depends(get_current_user)
-) -> ReducedModeResponse:
+) -> Response:
     """
     Get current reduced mode state.
     
@@ -96,20 +90,18 @@ async def get_reduced_mode_status(
     Returns:
         Current reduced mode state
     """
-    state = reduced_mode_service.get_reduced_mode_state(
+    state = await reduced_mode_service.get_reduced_mode_state(
         user_id=str(current_user.id)
     )
     
     if not state:
         # Return default inactive state if not found
-        return ReducedModeResponse(
-            is_active=False,
-            activated_at=None,
-            deactivated_at=None
+        return model_response(
+            ReducedModeResponse(
+                is_active=False,
+                activated_at=None,
+                deactivated_at=None
+            )
         )
     
-    return ReducedModeResponse(
-        is_active=state.is_active,
-        activated_at=state.activated_at,
-        deactivated_at=state.deactivated_at
-    )
+    return model_response(to_response(ReducedModeResponse, state))
@@ -4,12 +4,15 @@ Session API endpoints.
 Handles Ignition (start), Braking (end), and session management.
 """
 import logging
-from typing import List
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from models.user import User
-from models.session import SessionCreate, SessionEnd, SessionResponse
+from models.session import SessionCreate, SessionEnd, SessionResponse, SessionWithSetupResponse
 from services.session_service import session_service
+from services.pagination import NEXT_CURSOR_HEADER, next_cursor
 from dependencies.auth import get_current_user
+from models.conversion import to_response, to_responses
+from api.responses import model_response
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +23,7 @@ router = APIRouter(prefix="/sessions", tags=["sessions"])
 async def start_session(
     session_data: SessionCreate,
     current_user: User = Depends(get_current_user)
-) -> SessionResponse:
+) -> Response:
     """
     Start session (Ignition).
     
@@ -35,22 +38,16 @@ async def start_session(
         HTTPException: 409 if active session already exists
     """
     try:
-        session = session_service.start_session(
+        session = await session_service.start_session(
             user_id=str(current_user.id),
             session_data=session_data
         )
         
         logger.info(f"Session started for user: {current_user.id}")
         
-        return SessionResponse(
-            id=session.id,
-            setup_id=session.setup_id,
-            start_time=session.start_time,
-            end_time=session.end_time,
-            duration_minutes=session.duration_minutes,
-            next_step=session.next_step,
-            status=session.status,
-            reduced_mode_active=session.reduced_mode_active
+        return model_response(
+            to_response(SessionResponse, session),
+            status_code=status.HTTP_201_CREATED
         )
         
     except Exception as e:
@@ -73,7 +70,7 @@ async def end_session(
     session_id: str,
     end_data: SessionEnd,
     current_user: User = Depends(get_current_user)
-) -> SessionResponse:
+) -> Response:
     """
     End session (Braking).
     
@@ -86,10 +83,10 @@ async def end_session(
         Updated session
         
     Raises:
-        HTTPException: 404 if session not found, 400 if not active
+        HTTPException: 404 if session not found, 409 if not active
     """
     try:
-        session = session_service.end_session(
+        session = await session_service.end_session(
             session_id=session_id,
             user_id=str(current_user.id),
             end_data=end_data
@@ -97,16 +94,7 @@ async def end_session(
         
         logger.info(f"Session ended: {session_id}")
         
-        return SessionResponse(
-            id=session.id,
-            setup_id=session.setup_id,
-            start_time=session.start_time,
-            end_time=session.end_time,
-            duration_minutes=session.duration_minutes,
-            next_step=session.next_step,
-            status=session.status,
-            reduced_mode_active=session.reduced_mode_active
-        )
+        return model_response(to_response(SessionResponse, session))
         
     except Exception as e:
         error_msg = str(e)
@@ -115,6 +103,12 @@ async def end_session(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Session not found."
             )
+        if "not active" in error_msg.lower():
+            # Already ended or abandoned, e.g. on another device
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Session is not active."
+            )
         
         logger.error(f"Failed to end session: {error_msg}")
         raise HTTPException(
@@ -127,7 +121,7 @@ async def end_session(
 async def abandon_session(
     session_id: str,
     current_user: User = Depends(get_current_user)
-) -> SessionResponse:
+) -> Response:
     """
     Abandon session without penalty.
     
@@ -139,26 +133,17 @@ async def abandon_session(
         Updated session
         
     Raises:
-        HTTPException: 404 if session not found
+        HTTPException: 404 if session not found, 409 if not active
     """
     try:
-        session = session_service.abandon_session(
+        session = await session_service.abandon_session(
             session_id=session_id,
             user_id=str(current_user.id)
         )
         
         logger.info(f"Session abandoned: {session_id}")
         
-        return SessionResponse(
-            id=session.id,
-            setup_id=session.setup_id,
-            start_time=session.start_time,
-            end_time=session.end_time,
-            duration_minutes=session.duration_minutes,
-            next_step=session.next_step,
-            status=session.status,
-            reduced_mode_active=session.reduced_mode_active
-        )
+        return model_response(to_response(SessionResponse, session))
         
     except Exception as e:
         error_msg = str(e)
@@ -167,6 +152,12 @@ async def abandon_session(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Session not found."
             )
+        if "not active" in error_msg.lower():
+            # Already ended or abandoned, e.g. on another device
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Session is not active."
+            )
         
         logger.error(f"Failed to abandon session: {error_msg}")
         raise HTTPException(
@@ -178,7 +169,7 @@ async def abandon_session(
 @router.get("/active", response_model=SessionResponse)
 async def get_active_session(
     current_user: User = Depends(get_current_user)
-) -> SessionResponse:
+) -> Response:
     """
     Get active session if exists.
     
@@ -191,7 +182,7 @@ async def get_active_session(
     Raises:
         HTTPException: 404 if no active session
     """
-    session = session_service.get_active_session(
+    session = await session_service.get_active_session(
         user_id=str(current_user.id)
     )
     
@@ -201,51 +192,45 @@ async def get_active_session(
             detail="No active session."
         )
     
-    return SessionResponse(
-        id=session.id,
-        setup_id=session.setup_id,
-        start_time=session.start_time,
-        end_time=session.end_time,
-        duration_minutes=session.duration_minutes,
-        next_step=session.next_step,
-        status=session.status,
-        reduced_mode_active=session.reduced_mode_active
-    )
+    return model_response(to_response(SessionResponse, session))
 
 
-@router.get("/recent", response_model=List[SessionResponse])
+@router.get("/recent", response_model=List[SessionWithSetupResponse])
 async def get_recent_sessions(
     limit: int = Query(30, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     current_user: User = Depends(get_current_user)
-) -> List[SessionResponse]:
+) -> Response:
     """
     Get recent sessions with pagination.
     
     Args:
         limit: Maximum number of sessions to return (1-100)
-        offset: Number of sessions to skip
+        offset: Number of sessions to skip (ignored with a cursor)
+        cursor: X-Next-Cursor value from the previous page
         current_user: Authenticated user
         
     Returns:
-        List of sessions in reverse chronological order
+        List of sessions with their setups in reverse chronological order
     """
-    sessions = session_service.get_recent_sessions(
-        user_id=str(current_user.id),
-        limit=limit,
-        offset=offset
-    )
-    
-    return [
-        SessionResponse(
-            id=session.id,
-            setup_id=session.setup_id,
-            start_time=session.start_time,
-            end_time=session.end_time,
-            duration_minutes=session.duration_minutes,
-            next_step=session.next_step,
-            status=session.status,
-            reduced_mode_active=session.reduced_mode_active
+    try:
+        sessions = await session_service.get_recent_sessions(
+            user_id=str(current_user.id),
+            limit=limit,
+            offset=offset,
+            cursor=cursor
         )
-        for session in sessions
-    ]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    next_page = next_cursor(sessions, limit, lambda session: session.created_at)
+    headers = {NEXT_CURSOR_HEADER: next_page} if next_page else None
+    
+    return model_response(
+        to_responses(SessionWithSetupResponse, sessions),
+        headers=headers
+    )
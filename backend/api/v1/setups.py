@@ -4,38 +4,78 @@ Setup API endpoints.
 Handles preset setup listing and activation.
 """
 import logging
-from typing import List
-from fastapi import APIRouter, HTTPException, status, Depends
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response
 from models.user import User
 from models.setup import SetupActivate, SetupResponse
 from services.setup_service import setup_service
-from dependencies.auth import get_current_user
+from dependencies.auth import get_current_user, require_admin
+from models.conversion import to_response, to_responses
+from api.responses import model_response
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/setups", tags=["setups"])
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against the current ETag."""
+    if not if_none_match:
+        return False
+    
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
 @router.get("", response_model=List[SetupResponse])
-async def get_available_setups() -> List[SetupResponse]:
+async def get_available_setups(
+    request: Request
+) -> Response:
     """
     List available preset setups.
     
+    Served from the in-memory catalogue with a strong ETag; clients that send
+    a matching If-None-Match get 304 Not Modified.
+    
     Returns:
         List of available setups (Calm, Reduced, Vitality)
     """
-    setups = setup_service.get_available_setups()
+    setups = await setup_service.get_available_setups()
+    etag = setup_service.catalogue_etag
+    headers = None
+    
+    if etag:
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return model_response(
+        to_responses(SetupResponse, setups),
+        headers=headers
+    )
+
+
+@router.post("/refresh", dependencies=[Depends(require_admin)])
+async def refresh_catalogue() -> dict:
+    """
+    Reload the setups catalogue from the database (admin only).
     
-    return [
-        SetupResponse(
-            id=setup.id,
-            name=setup.name,
-            description=setup.description,
-            default_session_duration=setup.default_session_duration,
-            emphasis=setup.emphasis
+    Returns:
+        Number of setups loaded and the new ETag
+        
+    Raises:
+        HTTPException: 403 without a valid X-Admin-Key, 503 if reload fails
+    """
+    try:
+        catalogue = await setup_service.refresh_catalogue()
+    except Exception as e:
+        logger.error(f"Failed to refresh setup catalogue: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Unable to refresh setups. Try again in a moment."
         )
-        for setup in setups
-    ]
+    
+    return {"count": len(catalogue.setups), "etag": catalogue.etag}
 
 
 @router.post("/activate", status_code=status.HTTP_200_OK)
@@ -57,7 +97,7 @@ async def activate_setup(
         HTTPException: 404 if setup not found
     """
     try:
-        setup_service.activate_setup(
+        await setup_service.activate_setup(
             user_id=str(current_user.id),
             setup_data=setup_data
         )
@@ -84,7 +124,7 @@ async def activate_setup(
 @router.get("/active", response_model=SetupResponse)
 async def get_active_setup(
     current_user: User = Depends(get_current_user)
-) -> SetupResponse:
+) -> Response:
     """
     Get current active setup.
     
@@ -94,7 +134,7 @@ async def get_active_setup(
     Returns:
         Active setup (defaults to Calm if none activated)
     """
-    setup = setup_service.get_active_setup(
+    setup = await setup_service.get_active_setup(
         user_id=str(current_user.id)
     )
     
@@ -104,10 +144,4 @@ async def get_active_setup(
             detail="No active setup found."
         )
     
-    return SetupResponse(
-        id=setup.id,
-        name=setup.name,
-        description=setup.description,
-        default_session_duration=setup.default_session_duration,
-        emphasis=setup.emphasis
-    )
+    return model_response(to_response(SetupResponse, setup))
@@ -0,0 +1,58 @@
+"""
+Offline sync API endpoints.
+
+Handles batched replay of actions the app queued while offline.
+"""
+import logging
+from fastapi import APIRouter, HTTPException, status, Depends, Response
+from config import settings
+from models.user import User
+from models.sync import SyncRequest, SyncResponse
+from services.sync_service import sync_service
+from dependencies.auth import get_current_user
+from api.responses import model_response
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.post("", response_model=SyncResponse)
+async def sync(
+    batch: SyncRequest,
+    current_user: User = Depends(get_current_user)
+) -> Response:
+    """
+    Apply queued offline actions in one request.
+
+    Operations are applied in order. Each gets its own result: applied,
+    rejected (with the reason, e.g. the session is no longer active) or
+    duplicate (its idempotency key was already applied; the original result
+    is returned). A rejected operation does not stop the ones after it.
+
+    Args:
+        batch: Ordered operations with client idempotency keys
+        current_user: Authenticated user
+
+    Returns:
+        Per-operation results in request order
+
+    Raises:
+        HTTPException: 422 if the batch is too large, 503 if it cannot be applied
+    """
+    if len(batch.operations) > settings.sync_max_operations:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Send at most {settings.sync_max_operations} operations per batch."
+        )
+
+    try:
+        results = await sync_service.apply_batch(str(current_user.id), batch.operations)
+        return model_response(SyncResponse(results=results))
+
+    except Exception as e:
+        logger.error(f"Failed to sync: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Unable to sync right now. Your changes are safe to send again."
+        )
@@ -4,12 +4,15 @@ Weekly Check API endpoints.
 Handles weekly reflection creation and history retrieval.
 """
 import logging
-from typing import List
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from models.user import User
 from models.weekly_check import WeeklyCheckCreate, WeeklyCheckResponse
 from services.weekly_check_service import weekly_check_service
+from services.pagination import NEXT_CURSOR_HEADER, next_cursor
 from dependencies.auth import get_current_user
+from models.conversion import to_response, to_responses
+from api.responses import model_response
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +23,7 @@ router = APIRouter(prefix="/weekly-check", tags=["weekly-check"])
 async def create_weekly_check(
     check_data: WeeklyCheckCreate,
     current_user: User = Depends(get_current_user)
-) -> WeeklyCheckResponse:
+) -> Response:
     """
     Create weekly review.
     
@@ -32,21 +35,16 @@ async def create_weekly_check(
         Created weekly check with insight and recommendation
     """
     try:
-        check = weekly_check_service.create_weekly_check(
+        check = await weekly_check_service.create_weekly_check(
             user_id=str(current_user.id),
             check_data=check_data
         )
         
         logger.info(f"Weekly check created for user: {current_user.id}")
         
-        return WeeklyCheckResponse(
-            id=check.id,
-            week_start_date=check.week_start_date,
-            week_end_date=check.week_end_date,
-            responses=check.responses,
-            insight=check.insight,
-            scope_recommendation=check.scope_recommendation,
-            completed_at=check.completed_at
+        return model_response(
+            to_response(WeeklyCheckResponse, check),
+            status_code=status.HTTP_201_CREATED
         )
         
     except Exception as e:
@@ -60,7 +58,7 @@ async def create_weekly_check(
 @router.get("/latest", response_model=WeeklyCheckResponse)
 async def get_latest_check(
     current_user: User = Depends(get_current_user)
-) -> WeeklyCheckResponse:
+) -> Response:
     """
     Get most recent weekly check.
     
@@ -73,7 +71,7 @@ async def get_latest_check(
     Raises:
         HTTPException: 404 if no checks exist
     """
-    check = weekly_check_service.get_latest_check(
+    check = await weekly_check_service.get_latest_check(
         user_id=str(current_user.id)
     )
     
@@ -83,49 +81,45 @@ async def get_latest_check(
             detail="No weekly checks found."
         )
     
-    return WeeklyCheckResponse(
-        id=check.id,
-        week_start_date=check.week_start_date,
-        week_end_date=check.week_end_date,
-        responses=check.responses,
-        insight=check.insight,
-        scope_recommendation=check.scope_recommendation,
-        completed_at=check.completed_at
-    )
+    return model_response(to_response(WeeklyCheckResponse, check))
 
 
 @router.get("/history", response_model=List[WeeklyCheckResponse])
 async def get_check_history(
     limit: int = Query(12, ge=1, le=52),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     current_user: User = Depends(get_current_user)
-) -> List[WeeklyCheckResponse]:
+) -> Response:
     """
     Get past weekly checks with pagination.
     
     Args:
         limit: Maximum number of checks to return (1-52)
-        offset: Number of checks to skip
+        offset: Number of checks to skip (ignored with a cursor)
+        cursor: X-Next-Cursor value from the previous page
         current_user: Authenticated user
         
     Returns:
         List of weekly checks in reverse chronological order
     """
-    checks = weekly_check_service.get_check_history(
-        user_id=str(current_user.id),
-        limit=limit,
-        offset=offset
-    )
-    
-    return [
-        WeeklyCheckResponse(
-            id=check.id,
-            week_start_date=check.week_start_date,
-            week_end_date=check.week_end_date,
-            responses=check.responses,
-            insight=check.insight,
-            scope_recommendation=check.scope_recommendation,
-            completed_at=check.completed_at
+    try:
+        checks = await weekly_check_service.get_check_history(
+            user_id=str(current_user.id),
+            limit=limit,
+            offset=offset,
+            cursor=cursor
         )
-        for check in checks
-    ]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    next_page = next_cursor(checks, limit, lambda check: check.week_start_date)
+    headers = {NEXT_CURSOR_HEADER: next_page} if next_page else None
+    
+    return model_response(
+        to_responses(WeeklyCheckResponse, checks),
+        headers=headers
+    )
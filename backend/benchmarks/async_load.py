@@ -0,0 +1,108 @@
+"""
+Single-worker load benchmark.
+
+Drives GET /api/v1/sessions/active at increasing concurrency against the
+local PostgREST stand-in and reports throughput. With a non-blocking data
+layer, throughput grows with concurrency instead of staying flat at
+1 / latency.
+
+Usage:
+    python -m benchmarks.async_load --latency-ms 20 --requests 200
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import List, Tuple
+import httpx
+from jose import jwt
+from benchmarks.fake_postgrest import BENCH_USER_ID, FakePostgrest
+
+CONCURRENCY_LEVELS = [1, 2, 4, 8, 16, 32, 64]
+
+
+def _bench_token(secret: str) -> str:
+    """Mint a bearer token the API will accept."""
+    payload = {
+        "sub": BENCH_USER_ID,
+        "email": "bench@example.com",
+        "aud": "authenticated",
+        "role": "authenticated",
+        "exp": datetime.utcnow() + timedelta(hours=1),
+    }
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+async def _run_level(
+    client: httpx.AsyncClient,
+    concurrency: int,
+    total_requests: int
+) -> Tuple[float, List[float]]:
+    """
+    Issue total_requests calls with at most `concurrency` in flight.
+
+    Returns:
+        Tuple of (elapsed seconds, per-request latencies in milliseconds)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get("/api/v1/sessions/active")
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total_requests)))
+    return time.perf_counter() - started, latencies
+
+
+async def _main(latency_ms: float, total_requests: int) -> None:
+    with FakePostgrest(latency_ms=latency_ms) as fake:
+        os.environ["SUPABASE_URL"] = fake.url
+        # Answer every request from the stand-in, not the user state cache
+        os.environ["USER_STATE_CACHE_MAX_USERS"] = "0"
+
+        # Import after the environment points at the stand-in
+        from config import settings
+        from main import app
+        from services.supabase_client import get_supabase_client
+
+        # Keep per-request INFO lines out of the measurement
+        logging.getLogger().setLevel(logging.WARNING)
+
+        headers = {"Authorization": f"Bearer {_bench_token(settings.supabase_jwt_secret)}"}
+        transport = httpx.ASGITransport(app=app)
+
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://bench",
+            headers=headers
+        ) as client:
+            # Warm up connections to the stand-in
+            await _run_level(client, 4, 20)
+
+            print(f"Upstream latency: {latency_ms:.0f} ms, {total_requests} requests per level")
+            print(f"{'concurrency':>12} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+            for concurrency in CONCURRENCY_LEVELS:
+                elapsed, latencies = await _run_level(client, concurrency, total_requests)
+                quantiles = statistics.quantiles(latencies, n=100)
+                print(
+                    f"{concurrency:>12} {total_requests / elapsed:>10.1f} "
+                    f"{quantiles[49]:>10.1f} {quantiles[98]:>10.1f}"
+                )
+
+            print(f"Pool: {get_supabase_client().pool_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(_main(args.latency_ms, args.requests))
@@ -0,0 +1,633 @@
+"""
+Local Supabase stand-in for benchmarks.
+
+Serves the subset of the PostgREST and GoTrue APIs the services use from an
+in-memory database, after a configurable delay, so the API can be
+load-tested end to end without a real Supabase project.
+"""
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+import uvicorn
+from jose import jwt
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+BENCH_USER_ID = "550e8400-e29b-41d4-a716-446655440000"
+CALM_SETUP_ID = "660e8400-e29b-41d4-a716-446655440001"
+REDUCED_SETUP_ID = "660e8400-e29b-41d4-a716-446655440002"
+VITALITY_SETUP_ID = "660e8400-e29b-41d4-a716-446655440003"
+
+# Column defaults applied on insert, per table
+_DEFAULTS: Dict[str, Dict[str, Callable[[], Any]]] = {
+    "sessions": {
+        "start_time": lambda: _now(),
+        "end_time": lambda: None,
+        "duration_minutes": lambda: None,
+        "next_step": lambda: None,
+        "reduced_mode_active": lambda: False,
+    },
+    "daily_checks": {"completed_at": lambda: _now()},
+    "weekly_checks": {
+        "insight": lambda: None,
+        "scope_recommendation": lambda: None,
+        "completed_at": lambda: _now(),
+    },
+    "user_setups": {"activated_at": lambda: _now()},
+    "reduced_mode_states": {
+        "is_active": lambda: False,
+        "activated_at": lambda: None,
+        "deactivated_at": lambda: None,
+    },
+}
+
+# Foreign keys followed by embedded selects: (table, embedded table) -> column
+_FOREIGN_KEYS: Dict[Tuple[str, str], str] = {
+    ("sessions", "setups"): "setup_id",
+    ("user_setups", "setups"): "setup_id",
+}
+
+# Unique constraints besides the primary key on id, checked on insert:
+# (table, columns, partial predicate or None)
+_UNIQUE: List[Tuple[str, Tuple[str, ...], Optional[Callable[[Dict[str, Any]], bool]]]] = [
+    ("daily_checks", ("user_id", "check_date"), None),
+    ("sessions", ("user_id",), lambda row: row["status"] == "active"),
+    ("reduced_mode_states", ("user_id",), None),
+]
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + "+00:00"
+
+
+def _parse(value: str) -> datetime:
+    """Parse a timestamptz, normalised to UTC."""
+    return datetime.fromisoformat(value).astimezone(timezone.utc)
+
+
+class PostgrestError(Exception):
+    """Error rendered in PostgREST's JSON error format."""
+
+    def __init__(self, status: int, code: str, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+def _unique_violation(table: str) -> PostgrestError:
+    return PostgrestError(409, "23505", f"duplicate key value violates unique constraint on {table}")
+
+
+def _seed() -> Dict[str, List[Dict[str, Any]]]:
+    """Build the initial tables: preset setups and one active bench session."""
+    now = _now()
+    setups = [
+        (CALM_SETUP_ID, "Calm", "Default 25 minutes, emphasis on rest. For balanced practice.", 25, "rest"),
+        (REDUCED_SETUP_ID, "Reduced", "Default 15 minutes, emphasis on continuity. For low capacity days.", 15, "continuity"),
+        (VITALITY_SETUP_ID, "Vitality", "Default 30 minutes, emphasis on health. For higher capacity days.", 30, "health"),
+    ]
+    return {
+        "setups": [
+            {
+                "id": setup_id,
+                "name": name,
+                "description": description,
+                "default_session_duration": duration,
+                "emphasis": emphasis,
+                "is_preset": True,
+                "created_at": now,
+            }
+            for setup_id, name, description, duration, emphasis in setups
+        ],
+        "sessions": [{
+            "id": "770e8400-e29b-41d4-a716-446655440000",
+            "user_id": BENCH_USER_ID,
+            "setup_id": CALM_SETUP_ID,
+            "start_time": now,
+            "end_time": None,
+            "duration_minutes": 25,
+            "next_step": None,
+            "status": "active",
+            "reduced_mode_active": False,
+            "created_at": now,
+            "updated_at": now,
+        }],
+    }
+
+
+def _as_text(value: Any) -> str:
+    """Render a stored value the way it appears in a query string."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _split_select(select: str) -> List[str]:
+    """Split a select list on the commas outside embedded resources."""
+    fields, depth, start = [], 0, 0
+    for i, char in enumerate(select):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            fields.append(select[start:i])
+            start = i + 1
+    fields.append(select[start:])
+    return fields
+
+
+def _matches(row: Dict[str, Any], column: str, expression: str) -> bool:
+    """Evaluate one PostgREST filter (e.g. `eq.active`) against a row."""
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+
+    operator, _, operand = expression.partition(".")
+    value = row.get(column)
+
+    if operator == "is":
+        result = value is None if operand == "null" else _as_text(value) == operand
+    elif operator == "in":
+        result = _as_text(value) in operand.strip("()").split(",")
+    elif value is None:
+        result = False
+    elif operator == "eq":
+        result = _as_text(value) == operand
+    elif operator == "neq":
+        result = _as_text(value) != operand
+    elif operator in ("gt", "gte", "lt", "lte"):
+        # ISO dates and timestamps compare correctly as text
+        text = _as_text(value)
+        result = {
+            "gt": text > operand,
+            "gte": text >= operand,
+            "lt": text < operand,
+            "lte": text <= operand,
+        }[operator]
+    else:
+        raise PostgrestError(400, "PGRST100", f"Unsupported operator: {operator}")
+
+    return not result if negate else result
+
+
+class FakeDatabase:
+    """In-memory tables with the PostgREST behaviour the services rely on."""
+
+    def __init__(self) -> None:
+        self.tables = _seed()
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        return self.tables.setdefault(table, [])
+
+    def query(self, table: str, params: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Filter, order and page a table by query string parameters."""
+        reserved = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+        rows = [
+            row for row in self.rows(table)
+            if all(_matches(row, key, value) for key, value in params if key not in reserved)
+        ]
+
+        options = dict(params)
+        for term in reversed(options.get("order", "").split(",")):
+            if term:
+                column, *flags = term.split(".")
+                rows.sort(
+                    key=lambda row: (row.get(column) is None, _as_text(row.get(column))),
+                    reverse="desc" in flags,
+                )
+
+        offset = int(options.get("offset", 0))
+        limit = options.get("limit")
+        return rows[offset:offset + int(limit) if limit is not None else None]
+
+    def insert(
+        self,
+        table: str,
+        records: List[Dict[str, Any]],
+        ignore_duplicates: bool = False,
+        on_conflict: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Insert rows, applying defaults and unique constraints."""
+        target = tuple(on_conflict.split(",")) if on_conflict else None
+        if target is not None and not any(
+            columns == target and applies is None
+            for columns, applies in self._constraints(table)
+        ):
+            raise PostgrestError(
+                400, "42P10",
+                "there is no unique or exclusion constraint matching the ON CONFLICT specification"
+            )
+
+        inserted = []
+        for record in records:
+            row = {"id": str(uuid4()), "created_at": _now(), "updated_at": _now()}
+            row.update({column: make() for column, make in _DEFAULTS.get(table, {}).items()})
+            row.update(record)
+            violated = self._violated(table, row)
+            if violated is not None:
+                # ON CONFLICT DO NOTHING: the row is skipped and not returned,
+                # but only conflicts on the target are ignored
+                if ignore_duplicates and target in (None, violated):
+                    continue
+                raise _unique_violation(table)
+            self.rows(table).append(row)
+            inserted.append(row)
+        return inserted
+
+    def update(
+        self,
+        table: str,
+        params: List[Tuple[str, str]],
+        changes: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Apply changes to every row matching the filters."""
+        updated = []
+        for row in self.query(table, params):
+            candidate = {**row, **changes}
+            self._check_unique(table, candidate, ignore=row)
+            row.update(changes)
+            updated.append(row)
+        return updated
+
+    def project(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        select: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Keep only the selected columns, embedding many-to-one resources."""
+        if not select or select == "*":
+            return rows
+
+        projected = []
+        for row in rows:
+            out: Dict[str, Any] = {}
+            for field in _split_select(select):
+                if "(" not in field:
+                    out[field] = row.get(field)
+                    continue
+
+                # alias:table(columns)
+                head, _, inner = field[:-1].partition("(")
+                alias, _, embedded = head.rpartition(":")
+                foreign_key = _FOREIGN_KEYS.get((table, embedded))
+                if foreign_key is None:
+                    raise PostgrestError(
+                        400, "PGRST200",
+                        f"Could not find a relationship between '{table}' and '{embedded}'"
+                    )
+                target = next((r for r in self.rows(embedded) if r["id"] == row.get(foreign_key)), None)
+                out[alias or embedded] = self.project(embedded, [target], inner)[0] if target else None
+            projected.append(out)
+        return projected
+
+    @staticmethod
+    def _constraints(table: str) -> List[Tuple[Tuple[str, ...], Optional[Callable[[Dict[str, Any]], bool]]]]:
+        return [(("id",), None)] + [
+            (columns, applies) for constrained, columns, applies in _UNIQUE if constrained == table
+        ]
+
+    def _violated(
+        self,
+        table: str,
+        row: Dict[str, Any],
+        ignore: Optional[Dict[str, Any]] = None
+    ) -> Optional[Tuple[str, ...]]:
+        """Return the columns of the first unique constraint row violates."""
+        for columns, applies in self._constraints(table):
+            if applies is not None and not applies(row):
+                continue
+            for other in self.rows(table):
+                if other is not ignore and (applies is None or applies(other)) and all(
+                    _as_text(other.get(c)) == _as_text(row.get(c)) for c in columns
+                ):
+                    return columns
+        return None
+
+    def _check_unique(
+        self,
+        table: str,
+        row: Dict[str, Any],
+        ignore: Optional[Dict[str, Any]] = None
+    ) -> None:
+        if self._violated(table, row, ignore) is not None:
+            raise _unique_violation(table)
+
+    def start_session(
+        self,
+        p_user_id: str,
+        p_setup_id: str,
+        p_session_id: Optional[str] = None,
+        p_start_time: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Mirror of the start_session() SQL function."""
+        setup = next((s for s in self.rows("setups") if s["id"] == p_setup_id), None)
+        if setup is None:
+            raise PostgrestError(400, "P0002", "Setup not found.")
+
+        state = next((s for s in self.rows("reduced_mode_states") if s["user_id"] == p_user_id), None)
+        reduced = bool(state and state["is_active"])
+        duration = setup["default_session_duration"]
+
+        now = _now()
+        try:
+            return self.insert("sessions", [{
+                "id": p_session_id or str(uuid4()),
+                "user_id": p_user_id,
+                "setup_id": p_setup_id,
+                "start_time": min(_parse(p_start_time or now), _parse(now)).isoformat(),
+                "status": "active",
+                "reduced_mode_active": reduced,
+                "duration_minutes": (duration * 6) // 10 if reduced else duration,
+            }])
+        except PostgrestError as e:
+            raise PostgrestError(e.status, e.code, "Unable to start right now. Try again in a moment.")
+
+    def end_session(
+        self,
+        p_user_id: str,
+        p_session_id: str,
+        p_next_step: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Mirror of the end_session() SQL function."""
+        return [self._complete(self._active_session(p_user_id, p_session_id), _now(), p_next_step)]
+
+    def abandon_session(self, p_user_id: str, p_session_id: str) -> List[Dict[str, Any]]:
+        """Mirror of the abandon_session() SQL function."""
+        session = self._active_session(p_user_id, p_session_id)
+        session.update({"status": "abandoned", "updated_at": _now()})
+        return [session]
+
+    def apply_sync_batch(self, p_user_id: str, p_operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Mirror of the apply_sync_batch() SQL function."""
+        claimed = self.rows("sync_operations")
+        results = []
+
+        for op in p_operations:
+            key = op["idempotency_key"]
+            stored = next(
+                (s for s in claimed if s["user_id"] == p_user_id and s["idempotency_key"] == key),
+                None
+            )
+            if stored is not None:
+                results.append({**stored["result"], "status": "duplicate"})
+                continue
+
+            now = _now()
+            at = min(_parse(op.get("occurred_at") or now), _parse(now)).isoformat()
+            result: Dict[str, Any] = {"idempotency_key": key, "type": op["type"], "status": "applied"}
+
+            # Each branch fails before it writes, like the SQL subtransaction
+            try:
+                if op["type"] == "start_session":
+                    session = self.start_session(p_user_id, op["setup_id"], op.get("session_id"), at)[0]
+                    result["session"] = dict(session)
+                elif op["type"] == "end_session":
+                    session = self._active_session(p_user_id, op["session_id"])
+                    result["session"] = dict(self._complete(session, at, op.get("next_step")))
+                elif op["type"] == "abandon_session":
+                    result["session"] = dict(self.abandon_session(p_user_id, op["session_id"])[0])
+                elif op["type"] == "daily_check":
+                    check = self.insert("daily_checks", [{
+                        "user_id": p_user_id,
+                        "check_date": at[:10],
+                        "responses": op["responses"],
+                        "completed_at": at,
+                    }])[0]
+                    result["daily_check"] = dict(check)
+                else:
+                    raise PostgrestError(400, "22023", "Unknown operation.")
+            except PostgrestError as e:
+                if e.code not in ("23505", "P0002", "22023"):
+                    raise
+                daily_duplicate = e.code == "23505" and op["type"] == "daily_check"
+                result.update({
+                    "status": "rejected",
+                    "error": "Already completed today." if daily_duplicate else e.message,
+                })
+
+            claimed.append({"user_id": p_user_id, "idempotency_key": key, "result": result, "created_at": now})
+            results.append(result)
+
+        return results
+
+    def _complete(self, session: Dict[str, Any], at: str, next_step: Optional[str]) -> Dict[str, Any]:
+        """End a session at the given time; an empty next step keeps the stored one."""
+        start = _parse(session["start_time"])
+        end = max(_parse(at), start)
+        session.update({
+            "end_time": end.isoformat(),
+            "duration_minutes": int((end - start).total_seconds() // 60),
+            "next_step": next_step or session["next_step"],
+            "status": "completed",
+            "updated_at": _now(),
+        })
+        return session
+
+    def _active_session(self, user_id: str, session_id: str) -> Dict[str, Any]:
+        """Find a session to end or abandon, failing as sync_session_missing() does."""
+        session = next(
+            (s for s in self.rows("sessions") if s["id"] == session_id and s["user_id"] == user_id),
+            None
+        )
+        if session is None:
+            raise PostgrestError(400, "P0002", "Session not found.")
+        if session["status"] != "active":
+            raise PostgrestError(400, "22023", "Session is not active.")
+        return session
+
+    def set_reduced_mode(self, p_user_id: str, p_is_active: bool) -> List[Dict[str, Any]]:
+        """Mirror of the set_reduced_mode() SQL function."""
+        stamp = "activated_at" if p_is_active else "deactivated_at"
+        state = next((s for s in self.rows("reduced_mode_states") if s["user_id"] == p_user_id), None)
+
+        if state is None:
+            [state] = self.insert("reduced_mode_states", [{
+                "user_id": p_user_id,
+                "is_active": p_is_active,
+                stamp: _now(),
+            }])
+            return [{"state": state, "changed": True}]
+
+        changed = state["is_active"] != p_is_active
+        if changed:
+            state.update({"is_active": p_is_active, stamp: _now(), "updated_at": _now()})
+        return [{"state": state, "changed": changed}]
+
+    def week_stats(self, p_user_id: str, p_week_start: str, p_week_end: str) -> List[Dict[str, Any]]:
+        """Mirror of the week_stats() SQL function."""
+        week_end = (date.fromisoformat(p_week_end) + timedelta(days=1)).isoformat()
+        sessions = [
+            s for s in self.rows("sessions")
+            if s["user_id"] == p_user_id and p_week_start <= s["created_at"] < week_end
+        ]
+        checks = [
+            c for c in self.rows("daily_checks")
+            if c["user_id"] == p_user_id and p_week_start <= c["check_date"] <= p_week_end
+        ]
+        return [{
+            "sessions_completed": sum(1 for s in sessions if s["status"] == "completed"),
+            "sessions_abandoned": sum(1 for s in sessions if s["status"] == "abandoned"),
+            "sessions_with_next_step": sum(
+                1 for s in sessions if s["status"] == "completed" and s.get("next_step")
+            ),
+            "daily_checks_completed": len(checks),
+        }]
+
+
+def _auth_user(user_id: str, email: str) -> Dict[str, Any]:
+    return {
+        "id": user_id,
+        "aud": "authenticated",
+        "role": "authenticated",
+        "email": email,
+        "app_metadata": {},
+        "user_metadata": {},
+        "created_at": _now(),
+    }
+
+
+def create_app(latency_ms: float = 20.0, jwt_secret: str = "bench-secret") -> Starlette:
+    """
+    Create the stand-in ASGI app.
+
+    Args:
+        latency_ms: Delay added to every response, in milliseconds
+        jwt_secret: Secret used to sign access tokens issued by the fake auth
+
+    Returns:
+        Starlette application answering /rest/v1 and /auth/v1
+    """
+    db = FakeDatabase()
+    users: Dict[str, str] = {}
+
+    def error(e: PostgrestError) -> JSONResponse:
+        return JSONResponse(
+            {"code": e.code, "message": e.message, "details": None, "hint": None},
+            status_code=e.status,
+        )
+
+    async def table(request: Request) -> Response:
+        await asyncio.sleep(latency_ms / 1000)
+        name = request.path_params["table"]
+        params = list(request.query_params.multi_items())
+
+        try:
+            if request.method in ("GET", "HEAD"):
+                rows = db.query(name, params)
+                status_code = 200
+            elif request.method == "POST":
+                body = json.loads(await request.body())
+                rows = db.insert(
+                    name,
+                    body if isinstance(body, list) else [body],
+                    ignore_duplicates="resolution=ignore-duplicates" in request.headers.get("prefer", ""),
+                    on_conflict=request.query_params.get("on_conflict"),
+                )
+                status_code = 201
+            else:
+                rows = db.update(name, params, json.loads(await request.body()))
+                status_code = 200
+            content = db.project(name, rows, request.query_params.get("select"))
+        except PostgrestError as e:
+            return error(e)
+
+        headers = {}
+        if "count=" in request.headers.get("prefer", ""):
+            headers["Content-Range"] = f"0-{max(len(rows) - 1, 0)}/{len(rows)}"
+
+        return JSONResponse(
+            content,
+            status_code=status_code,
+            headers=headers,
+        )
+
+    async def rpc(request: Request) -> Response:
+        await asyncio.sleep(latency_ms / 1000)
+        function = getattr(db, request.path_params["function"], None)
+        if function is None:
+            return error(PostgrestError(404, "PGRST202", "Function not found"))
+
+        try:
+            return JSONResponse(function(**json.loads(await request.body())))
+        except PostgrestError as e:
+            return error(e)
+
+    async def token(request: Request) -> Response:
+        await asyncio.sleep(latency_ms / 1000)
+        body = json.loads(await request.body())
+        email = body["email"]
+        # Any password is accepted; the first sign-in creates the account
+        user_id = users.setdefault(email, str(uuid4()))
+        expires_in = 3600
+        access_token = jwt.encode(
+            {
+                "sub": user_id,
+                "email": email,
+                "aud": "authenticated",
+                "role": "authenticated",
+                "exp": int(time.time()) + expires_in,
+            },
+            jwt_secret,
+            algorithm="HS256",
+        )
+
+        return JSONResponse({
+            "access_token": access_token,
+            "refresh_token": str(uuid4()),
+            "expires_in": expires_in,
+            "token_type": "bearer",
+            "user": _auth_user(user_id, email),
+        })
+
+    return Starlette(routes=[
+        Route("/auth/v1/token", token, methods=["POST"]),
+        Route("/auth/v1/signup", token, methods=["POST"]),
+        Route("/rest/v1/rpc/{function}", rpc, methods=["POST"]),
+        Route("/rest/v1/{table}", table, methods=["GET", "POST", "PATCH", "HEAD"]),
+    ])
+
+
+def _serve(port: int, latency_ms: float, jwt_secret: str) -> None:
+    """Process entry point: run the stand-in until terminated."""
+    uvicorn.run(create_app(latency_ms, jwt_secret), host="127.0.0.1", port=port, log_level="warning")
+
+
+class FakePostgrest:
+    """Run the stand-in on a free local port in a separate process."""
+
+    def __init__(self, latency_ms: float = 20.0, jwt_secret: str = "bench-secret") -> None:
+        """Prepare the server without starting it."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+
+        self.url = f"http://127.0.0.1:{self.port}"
+        # A separate process keeps the stand-in off the API's GIL
+        self._process = multiprocessing.Process(
+            target=_serve,
+            args=(self.port, latency_ms, jwt_secret),
+            daemon=True,
+        )
+
+    def __enter__(self) -> "FakePostgrest":
+        self._process.start()
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=0.1).close()
+                return self
+            except OSError:
+                time.sleep(0.05)
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._process.terminate()
+        self._process.join()
@@ -0,0 +1,243 @@
+"""
+User journey load benchmark.
+
+Runs the API in-process against the local Supabase stand-in and drives
+complete user journeys (sign in, dashboard, daily check, Ignition, Braking,
+weekly check) at a fixed concurrency. Reports throughput and latency
+percentiles per endpoint, writes them as a JSON baseline, and compares a
+run against a previous baseline.
+
+Usage:
+    python -m benchmarks.journeys --latency-ms 20 --users 200 --concurrency 32 \\
+        --output benchmarks/baselines/latest.json
+    python -m benchmarks.journeys --compare benchmarks/baselines/default.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import httpx
+from benchmarks.fake_postgrest import CALM_SETUP_ID, FakePostgrest
+
+# Regressions beyond this fraction of the baseline fail --compare
+DEFAULT_TOLERANCE = 0.25
+
+
+class Recorder:
+    """Collects latencies and errors per endpoint."""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def call(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        method: str,
+        url: str,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """Send one request, timing it under the endpoint's label."""
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.latencies[endpoint].append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 400:
+            self.errors[endpoint] += 1
+        return response
+
+
+async def journey(client: httpx.AsyncClient, recorder: Recorder, index: int) -> None:
+    """One user's day: sign in, look at the dashboard, check in and practice."""
+    response = await recorder.call(
+        client, "POST /api/v1/auth/signin", "POST", "/api/v1/auth/signin",
+        json={"email": f"bench{index}@example.com", "password": "bench-password"},
+    )
+    if response.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    await recorder.call(
+        client, "GET /api/v1/me/dashboard", "GET", "/api/v1/me/dashboard",
+        headers=headers,
+    )
+    await recorder.call(
+        client, "POST /api/v1/daily-check", "POST", "/api/v1/daily-check",
+        headers=headers, json={"responses": {"energy": "medium", "intention": "Focus"}},
+    )
+
+    response = await recorder.call(
+        client, "POST /api/v1/sessions", "POST", "/api/v1/sessions",
+        headers=headers, json={"setup_id": CALM_SETUP_ID},
+    )
+    if response.status_code == 201:
+        await recorder.call(
+            client, "PATCH /api/v1/sessions/{id}/end", "PATCH",
+            f"/api/v1/sessions/{response.json()['id']}/end",
+            headers=headers, json={"next_step": "Review notes"},
+        )
+
+    await recorder.call(
+        client, "POST /api/v1/weekly-check", "POST", "/api/v1/weekly-check",
+        headers=headers, json={"responses": {"capacity": "good"}},
+    )
+
+
+def summarize(recorder: Recorder, elapsed: float) -> Dict[str, Dict[str, float]]:
+    """Throughput and latency percentiles per endpoint."""
+    summary = {}
+    for endpoint, latencies in sorted(recorder.latencies.items()):
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        summary[endpoint] = {
+            "requests": len(latencies),
+            "errors": recorder.errors.get(endpoint, 0),
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "mean_ms": round(statistics.fmean(latencies), 2),
+            "p50_ms": round(quantiles[49], 2),
+            "p90_ms": round(quantiles[89], 2),
+            "p99_ms": round(quantiles[98], 2),
+        }
+    return summary
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    List endpoints whose latency or throughput regressed past tolerance.
+
+    Args:
+        result: Current run
+        baseline: Previous run to compare against
+        tolerance: Allowed fractional slowdown (0.25 = 25%)
+
+    Returns:
+        Human-readable regression descriptions (empty when none)
+    """
+    regressions = []
+    for endpoint, current in result["endpoints"].items():
+        previous = baseline["endpoints"].get(endpoint)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            if current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{endpoint} {metric}: {previous[metric]} -> {current[metric]}"
+                )
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{endpoint} throughput_rps: {previous['throughput_rps']} -> {current['throughput_rps']}"
+            )
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{endpoint} errors: {previous['errors']} -> {current['errors']}")
+    return regressions
+
+
+def print_report(result: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    meta = result["meta"]
+    print(
+        f"{meta['users']} journeys at concurrency {meta['concurrency']}, "
+        f"upstream latency {meta['latency_ms']:.0f} ms: "
+        f"{result['journeys_per_second']:.1f} journeys/s"
+    )
+    print(f"{'endpoint':<34} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'errors':>7}  vs baseline p50")
+    for endpoint, stats in result["endpoints"].items():
+        delta = ""
+        previous = (baseline or {}).get("endpoints", {}).get(endpoint)
+        if previous and previous["p50_ms"]:
+            delta = f"{(stats['p50_ms'] / previous['p50_ms'] - 1) * 100:+.0f}%"
+        print(
+            f"{endpoint:<34} {stats['throughput_rps']:>8.1f} {stats['p50_ms']:>8.1f} "
+            f"{stats['p90_ms']:>8.1f} {stats['p99_ms']:>8.1f} {stats['errors']:>7}  {delta}"
+        )
+
+
+async def run(latency_ms: float, users: int, concurrency: int) -> Dict[str, Any]:
+    """Run the journeys and return the result document."""
+    # Import after .env is loaded so the stand-in can share the JWT secret
+    from config import settings
+
+    with FakePostgrest(latency_ms=latency_ms, jwt_secret=settings.supabase_jwt_secret) as fake:
+        settings.supabase_url = fake.url
+        os.environ["SUPABASE_URL"] = fake.url
+
+        # Import after SUPABASE_URL points at the stand-in
+        from main import app
+
+        # Keep per-request INFO lines out of the measurement
+        logging.getLogger().setLevel(logging.WARNING)
+
+        recorder = Recorder()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(index: int) -> None:
+            async with semaphore:
+                await journey(client, recorder, index)
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                # Warm up connections and the setups catalogue
+                await client.get("/api/v1/setups")
+
+                started = time.perf_counter()
+                await asyncio.gather(*(one(i) for i in range(users)))
+                elapsed = time.perf_counter() - started
+
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "latency_ms": latency_ms,
+            "users": users,
+            "concurrency": concurrency,
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+        },
+        "elapsed_s": round(elapsed, 3),
+        "journeys_per_second": round(users / elapsed, 2),
+        "endpoints": summarize(recorder, elapsed),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--output", type=Path, help="Write the result as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="Baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    if baseline:
+        # Compare like with like unless overridden on the command line
+        for option in ("latency_ms", "users", "concurrency"):
+            if f"--{option.replace('_', '-')}" not in sys.argv:
+                setattr(args, option, baseline["meta"][option])
+
+    result = asyncio.run(run(args.latency_ms, args.users, args.concurrency))
+    print_report(result, baseline)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"Baseline written to {args.output}")
+
+    if baseline:
+        regressions = compare(result, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
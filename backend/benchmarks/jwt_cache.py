@@ -0,0 +1,74 @@
+"""
+JWT verification microbenchmark.
+
+Compares AuthService.verify_token throughput with the verified-token cache
+disabled and enabled, for a pool of distinct bearer tokens reused across
+requests.
+
+Usage:
+    python -m benchmarks.jwt_cache --iterations 20000 --tokens 100
+"""
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import List
+from uuid import uuid4
+from jose import jwt
+from services.auth_service import AuthService
+from services.cache import TTLCache
+
+
+def _tokens(secret: str, count: int) -> List[str]:
+    """Mint `count` tokens for distinct users."""
+    exp = datetime.utcnow() + timedelta(hours=1)
+    return [
+        jwt.encode(
+            {
+                "sub": str(uuid4()),
+                "email": f"user{i}@example.com",
+                "aud": "authenticated",
+                "role": "authenticated",
+                "exp": exp,
+            },
+            secret,
+            algorithm="HS256",
+        )
+        for i in range(count)
+    ]
+
+
+def _measure(service: AuthService, tokens: List[str], iterations: int) -> float:
+    """Return verifications per second."""
+    started = time.perf_counter()
+    for i in range(iterations):
+        service.verify_token(tokens[i % len(tokens)])
+    return iterations / (time.perf_counter() - started)
+
+
+def main(iterations: int, token_count: int) -> None:
+    # Keep the per-verification INFO line out of the measurement
+    logging.disable(logging.INFO)
+
+    service = AuthService()
+    tokens = _tokens(service.jwt_secret, token_count)
+
+    service.token_cache = TTLCache(maxsize=0, clock=time.time)
+    uncached = _measure(service, tokens, iterations)
+
+    service.token_cache = TTLCache(maxsize=token_count, clock=time.time)
+    cached = _measure(service, tokens, iterations)
+
+    stats = service.token_cache.stats()
+    print(f"{iterations} verifications over {token_count} tokens")
+    print(f"uncached: {uncached:>12.0f} verifications/s")
+    print(f"cached:   {cached:>12.0f} verifications/s ({cached / uncached:.1f}x)")
+    print(f"cache hits={stats['hits']} misses={stats['misses']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--tokens", type=int, default=100)
+    args = parser.parse_args()
+    main(args.iterations, args.tokens)
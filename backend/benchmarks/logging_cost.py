@@ -0,0 +1,136 @@
+"""
+Logging cost microbenchmark.
+
+Measures the time a request spends logging: one "Token verified" line and
+one request summary with structured fields, inside a request scope. Compares
+the synchronous pipeline (StreamHandler with stdlib json on the request
+thread) against the queued pipeline from setup_logging (sampling, then
+enqueue; orjson encoding and I/O on the listener thread).
+
+A sink delay simulates a slow stdout consumer such as a log shipper under
+backpressure.
+
+Usage:
+    python -m benchmarks.logging_cost --requests 20000 --sink-delay-us 20
+"""
+import argparse
+import json
+import logging
+import time
+from typing import Callable, Dict
+from config.logging import JSONFormatter, RequestContextFilter, create_queue_pipeline
+from services.request_context import current_request_id, request_scope
+
+SAMPLE_RATES = {"bench.tokens": 0.01}
+
+
+class SlowSink:
+    """Writable stream that discards output after blocking for a fixed delay."""
+
+    def __init__(self, delay_us: float) -> None:
+        self.delay = delay_us / 1_000_000
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        if self.delay:
+            # Sleep rather than spin: a blocked write releases the GIL
+            time.sleep(self.delay)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def _request(tokens: logging.Logger, access: logging.Logger, index: int) -> None:
+    """Log what an authenticated request logs."""
+    with request_scope(f"req-{index}"):
+        tokens.info(f"Token verified for user: user-{index}")
+        access.info(
+            "GET /api/v1/sessions 200 12.3ms (2 Supabase calls, 8.1ms)",
+            extra={
+                "method": "GET",
+                "path": "/api/v1/sessions",
+                "route": "/api/v1/sessions",
+                "status": 200,
+                "duration_ms": 12.3,
+                "supabase_calls": 2,
+                "supabase_ms": 8.1,
+            }
+        )
+
+
+def _measure(handler: logging.Handler, requests: int) -> float:
+    """Return microseconds per request spent on the calling thread."""
+    tokens = logging.getLogger("bench.tokens")
+    access = logging.getLogger("bench.access")
+    for logger in (tokens, access):
+        logger.handlers = [handler]
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+
+    started = time.perf_counter()
+    for index in range(requests):
+        _request(tokens, access, index)
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+def synchronous(sink: SlowSink, requests: int) -> float:
+    """The pipeline before queueing: format and write on the request thread."""
+    handler = logging.StreamHandler(sink)
+    handler.addFilter(RequestContextFilter(current_request_id))
+    handler.setFormatter(JSONFormatter(dumps=json.dumps))
+    return _measure(handler, requests)
+
+
+def queued(sink: SlowSink, requests: int, queue_size: int) -> Dict[str, float]:
+    """The setup_logging pipeline; also times draining the queue."""
+    output = logging.StreamHandler(sink)
+    output.setFormatter(JSONFormatter())
+    handler, listener = create_queue_pipeline(output, SAMPLE_RATES, queue_size, current_request_id)
+
+    # As set by setup_logging
+    logging.logMultiprocessing = False
+    logging.logProcesses = False
+
+    listener.start()
+    per_request = _measure(handler, requests)
+    started = time.perf_counter()
+    listener.stop()
+
+    logging.logMultiprocessing = True
+    logging.logProcesses = True
+
+    return {
+        "per_request_us": per_request,
+        "drain_ms": (time.perf_counter() - started) * 1000,
+        "dropped": handler.dropped,
+    }
+
+
+def main(requests: int, sink_delay_us: float, queue_size: int) -> None:
+    def run(label: str, measure: Callable[[SlowSink], float], sink: SlowSink) -> float:
+        per_request = measure(sink)
+        print(f"{label:<12} {per_request:>8.1f} us/request on the request thread ({sink.writes} lines written)")
+        return per_request
+
+    print(f"{requests} requests, 2 log lines each, sink delay {sink_delay_us:.0f} us/line")
+    before = run("synchronous", lambda sink: synchronous(sink, requests), SlowSink(sink_delay_us))
+
+    sink = SlowSink(sink_delay_us)
+    result = queued(sink, requests, queue_size)
+    print(
+        f"{'queued':<12} {result['per_request_us']:>8.1f} us/request on the request thread "
+        f"({sink.writes} lines written, {result['dropped']:.0f} dropped, "
+        f"{result['drain_ms']:.0f} ms to drain)"
+    )
+    print(f"speedup      {before / result['per_request_us']:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--sink-delay-us", type=float, default=20.0)
+    parser.add_argument("--queue-size", type=int, default=100000)
+    args = parser.parse_args()
+    main(args.requests, args.sink_delay_us, args.queue_size)
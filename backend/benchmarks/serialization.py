@@ -0,0 +1,216 @@
+"""
+Response serialization benchmark.
+
+Compares the cost of turning 100 session rows into response models (one
+validation per row and response vs. one list validation per page), and
+of turning 100 SessionResponse models into a JSON body:
+FastAPI's default path (validate against response_model, convert to dicts,
+encode with stdlib json), the same with orjson encoding, and model_response
+(pydantic-core straight to bytes). Then times GET /sessions/recent?limit=100
+end to end against the local Supabase stand-in, with FAST_JSON_RESPONSES
+on and off.
+
+Usage:
+    python -m benchmarks.serialization --iterations 2000 --requests 300
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, List
+from uuid import uuid4
+import httpx
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from jose import jwt
+from benchmarks.fake_postgrest import BENCH_USER_ID, CALM_SETUP_ID, FakePostgrest
+from models.session import SessionResponse
+
+PAGE_SIZE = 100
+
+
+def _sessions(count: int) -> List[SessionResponse]:
+    """Completed sessions like the ones /sessions/recent returns."""
+    started = datetime.now(timezone.utc)
+    return [
+        SessionResponse(
+            id=uuid4(),
+            setup_id=CALM_SETUP_ID,
+            start_time=started - timedelta(days=i),
+            end_time=started - timedelta(days=i) + timedelta(minutes=25),
+            duration_minutes=25,
+            next_step="Review notes",
+            status="completed",
+            reduced_mode_active=False
+        )
+        for i in range(count)
+    ]
+
+
+async def _time(render: Callable[[], Awaitable[bytes]], iterations: int) -> float:
+    """Return microseconds per call."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await render()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def _sync_time(convert: Callable[[], object], iterations: int) -> float:
+    """Return microseconds per call."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        convert()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def conversion(iterations: int) -> None:
+    from models.conversion import to_responses
+    from models.session import Session
+    from services.session_service import SESSION_LIST
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": str(uuid4()),
+            "user_id": BENCH_USER_ID,
+            "setup_id": CALM_SETUP_ID,
+            "start_time": now.isoformat(),
+            "end_time": now.isoformat(),
+            "duration_minutes": 25,
+            "next_step": "Review notes",
+            "status": "completed",
+            "reduced_mode_active": False,
+            "created_at": now.isoformat(),
+            "updated_at": now.isoformat(),
+        }
+        for _ in range(PAGE_SIZE)
+    ]
+    fields = list(SessionResponse.model_fields)
+
+    def per_row() -> object:
+        sessions = [Session(**row) for row in rows]
+        return [SessionResponse(**{name: getattr(s, name) for name in fields}) for s in sessions]
+
+    def adapters() -> object:
+        return to_responses(SessionResponse, SESSION_LIST.validate_python(rows))
+
+    print(f"Converting {PAGE_SIZE} session rows to response models")
+    baseline = None
+    for label, convert in (
+        ("validate rows, then responses", per_row),
+        ("list adapters", adapters),
+    ):
+        per_call = _sync_time(convert, iterations)
+        baseline = baseline or per_call
+        print(f"  {label:<32} {per_call:>9.1f} us/page ({baseline / per_call:.1f}x)")
+
+
+async def micro(iterations: int) -> None:
+    from api.responses import ModelJSONResponse
+
+    sessions = _sessions(PAGE_SIZE)
+    field = create_response_field(name="Response_get_recent_sessions", type_=List[SessionResponse])
+
+    async def fastapi_default(response_class=JSONResponse) -> bytes:
+        content = await serialize_response(field=field, response_content=sessions, is_coroutine=True)
+        return response_class(content).body
+
+    async def fastapi_orjson() -> bytes:
+        return await fastapi_default(ORJSONResponse)
+
+    async def model_response() -> bytes:
+        return ModelJSONResponse(sessions).body
+
+    reference = json.loads(await fastapi_default())
+    print(f"Serializing {PAGE_SIZE} sessions ({len(await fastapi_default())} bytes)")
+    baseline = None
+    for label, render in (
+        ("FastAPI default (stdlib json)", fastapi_default),
+        ("FastAPI default + orjson", fastapi_orjson),
+        ("model_response", model_response),
+    ):
+        assert json.loads(await render()) == reference, f"{label} body differs"
+        per_call = await _time(render, iterations)
+        baseline = baseline or per_call
+        print(f"  {label:<32} {per_call:>9.1f} us/response ({baseline / per_call:.1f}x)")
+
+
+async def end_to_end(requests: int) -> None:
+    # Import after .env is loaded so the stand-in can share the JWT secret
+    from config import settings
+
+    with FakePostgrest(latency_ms=0, jwt_secret=settings.supabase_jwt_secret) as fake:
+        settings.supabase_url = fake.url
+        os.environ["SUPABASE_URL"] = fake.url
+
+        # Import after SUPABASE_URL points at the stand-in
+        from main import app
+        from services.supabase_client import get_supabase_client
+
+        # Keep per-request INFO lines out of the measurement
+        logging.getLogger().setLevel(logging.WARNING)
+
+        started = datetime.now(timezone.utc)
+        await get_supabase_client().table("sessions").insert([
+            {
+                "id": str(uuid4()),
+                "user_id": BENCH_USER_ID,
+                "setup_id": CALM_SETUP_ID,
+                "start_time": (started - timedelta(days=i)).isoformat(),
+                "end_time": (started - timedelta(days=i, minutes=-25)).isoformat(),
+                "duration_minutes": 25,
+                "status": "completed",
+                "created_at": (started - timedelta(days=i)).isoformat(),
+                "updated_at": (started - timedelta(days=i)).isoformat(),
+            }
+            for i in range(1, PAGE_SIZE + 1)
+        ]).execute()
+
+        token = jwt.encode(
+            {
+                "sub": BENCH_USER_ID,
+                "email": "bench@example.com",
+                "aud": "authenticated",
+                "exp": datetime.now(timezone.utc) + timedelta(hours=1),
+            },
+            settings.supabase_jwt_secret,
+            algorithm="HS256",
+        )
+        headers = {"Authorization": f"Bearer {token}"}
+
+        print(f"GET /api/v1/sessions/recent?limit={PAGE_SIZE}, {requests} sequential requests")
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for fast in (False, True):
+                settings.fast_json_responses = fast
+                latencies = []
+                for _ in range(requests):
+                    request_started = time.perf_counter()
+                    response = await client.get(f"/api/v1/sessions/recent?limit={PAGE_SIZE}", headers=headers)
+                    latencies.append((time.perf_counter() - request_started) * 1000)
+                    assert response.status_code == 200 and len(response.json()) == PAGE_SIZE
+                print(
+                    f"  FAST_JSON_RESPONSES={str(fast).lower():<5}  "
+                    f"p50 {statistics.median(latencies):6.2f} ms  "
+                    f"mean {statistics.fmean(latencies):6.2f} ms"
+                )
+
+
+def main(iterations: int, requests: int) -> None:
+    asyncio.run(micro(iterations))
+    asyncio.run(end_to_end(requests))
+    # Last: importing services before end_to_end would bind the real Supabase URL
+    conversion(iterations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+    main(args.iterations, args.requests)
@@ -2,47 +2,247 @@
 Structured logging configuration.
 
 Provides JSON-formatted logging for production and readable logs for development.
+Request threads only enqueue records; a background listener thread formats
+and writes them, so stdout never blocks the event loop.
 """
+import atexit
+import copy
 import logging
+import logging.handlers
+import queue
 import sys
-import json
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional, Tuple
+import orjson
 from .settings import settings
 
+# Structured fields copied from log records when present
+EXTRA_FIELDS = (
+    "user_id",
+    "request_id",
+    "method",
+    "path",
+    "route",
+    "status",
+    "duration_ms",
+    "supabase_calls",
+    "supabase_ms",
+    "sample_rate",
+)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def fast_dumps(log_data: Dict[str, Any]) -> str:
+    """Encode a log entry with orjson, stringifying unknown types."""
+    return orjson.dumps(log_data, default=str).decode()
+
 
 class JSONFormatter(logging.Formatter):
     """Format log records as JSON for structured logging."""
     
+    def __init__(self, dumps: Callable[[Dict[str, Any]], str] = fast_dumps) -> None:
+        super().__init__()
+        self.dumps = dumps
+    
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON string."""
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat(),
+            # Time the record was logged, not when the listener got to it
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
         
-        # Add exception info if present
+        # Add exception info if present (pre-rendered when queued)
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_data["exception"] = record.exc_text
         
         # Add extra fields
-        if hasattr(record, "user_id"):
-            log_data["user_id"] = record.user_id
-        if hasattr(record, "request_id"):
-            log_data["request_id"] = record.request_id
+        for name in EXTRA_FIELDS:
+            if hasattr(record, name):
+                log_data[name] = getattr(record, name)
+            
+        return self.dumps(log_data)
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the ID of the request being handled."""
+    
+    def __init__(self, request_id: Callable[[], Optional[str]]) -> None:
+        """
+        Initialize request context filter.
+        
+        Args:
+            request_id: Returns the current request's ID, or None outside a request
+        """
+        super().__init__()
+        self.request_id = request_id
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Add request_id to records logged during a request."""
+        request_id = self.request_id()
+        if request_id is not None and not hasattr(record, "request_id"):
+            record.request_id = request_id
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a fixed fraction of INFO and lower records per logger.
+    
+    Rates apply to the named logger and its children. Kept records carry
+    `sample_rate` so counts can be scaled back up downstream.
+    """
+    
+    def __init__(self, rates: Dict[str, float]) -> None:
+        """
+        Initialize sampling filter.
+        
+        Args:
+            rates: Fraction of records to keep (0-1) by logger name
             
-        return json.dumps(log_data)
+        Examples:
+            >>> sampler = SamplingFilter({"services.auth_service.tokens": 0.01})
+        """
+        super().__init__()
+        self.rates = rates
+        self._seen: Dict[str, int] = {}
+    
+    def _rate(self, name: str) -> Optional[float]:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return None
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Drop all but every Nth low-severity record of a sampled logger."""
+        if record.levelno > logging.INFO:
+            return True
+        
+        rate = self._rate(record.name)
+        if rate is None or rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        
+        # Deterministic 1-in-N keeps the output rate steady
+        seen = self._seen.get(record.name, 0)
+        self._seen[record.name] = seen + 1
+        if seen % round(1 / rate):
+            return False
+        
+        record.sample_rate = rate
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full."""
+    
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.log_queue = log_queue  # QueueHandler.queue is typed as any queue-like object
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Make a record safe to format on another thread.
+        
+        Merges message arguments and renders tracebacks now (both may
+        reference objects that change later) but leaves JSON encoding and
+        I/O to the listener.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.log_queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse_sample_rates(value: str) -> Dict[str, float]:
+    """Parse "logger=rate,logger=rate" into a dictionary."""
+    rates = {}
+    for item in value.split(","):
+        name, _, rate = item.partition("=")
+        if name.strip() and rate.strip():
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+def create_queue_pipeline(
+    handler: logging.Handler,
+    sample_rates: Dict[str, float],
+    queue_size: int,
+    request_id: Optional[Callable[[], Optional[str]]] = None
+) -> Tuple[NonBlockingQueueHandler, logging.handlers.QueueListener]:
+    """
+    Put a queue between loggers and an output handler.
+    
+    Args:
+        handler: Handler that formats and writes records (listener thread)
+        sample_rates: Fraction of INFO records kept per logger
+        queue_size: Records buffered before new ones are dropped
+        request_id: Returns the current request's ID, stamped on records
+        
+    Returns:
+        Tuple of the handler to attach to loggers and its (unstarted) listener
+    """
+    # Request threads only filter and enqueue; context is read here, on
+    # the thread that logged
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+    queue_handler.addFilter(SamplingFilter(sample_rates))
+    if request_id is not None:
+        queue_handler.addFilter(RequestContextFilter(request_id))
+    
+    listener = logging.handlers.QueueListener(queue_handler.log_queue, handler)
+    return queue_handler, listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
 
 
-def setup_logging() -> None:
-    """Configure application logging based on environment."""
+def setup_logging(request_id: Optional[Callable[[], Optional[str]]] = None) -> NonBlockingQueueHandler:
+    """
+    Configure application logging based on environment.
+    
+    Args:
+        request_id: Returns the current request's ID, stamped on records
+        
+    Returns:
+        The queue handler attached to the root logger
+    """
+    global _listener
+    shutdown_logging()
+    
+    # Records are never formatted with process names, so skip collecting them
+    logging.logMultiprocessing = False
+    logging.logProcesses = False
     
     # Get log level from settings
     log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
     
-    # Create handler
+    # Create output handler (runs on the listener thread)
     handler = logging.StreamHandler(sys.stdout)
     
     # Use JSON formatter in production, simple formatter in development
@@ -55,11 +255,23 @@ def setup_logging() -> None:
             )
         )
     
+    queue_handler, _listener = create_queue_pipeline(
+        handler,
+        _parse_sample_rates(settings.log_sample_rates),
+        settings.log_queue_size,
+        request_id
+    )
+    _listener.start()
+    
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
-    root_logger.addHandler(handler)
+    for existing in [h for h in root_logger.handlers if isinstance(h, NonBlockingQueueHandler)]:
+        root_logger.removeHandler(existing)
+    root_logger.addHandler(queue_handler)
     
     # Reduce noise from third-party libraries
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("httpx").setLevel(logging.WARNING)
+    
+    return queue_handler
@@ -5,7 +5,7 @@ Loads environment variables and provides typed configuration objects.
 """
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
-from typing import List, Union
+from typing import List, Optional, Union
 
 
 class Settings(BaseSettings):
@@ -16,9 +16,69 @@ class Settings(BaseSettings):
     supabase_key: str
     supabase_jwt_secret: str
     
+    # Supabase HTTP Connection Pool
+    supabase_max_connections: int = 100
+    supabase_max_keepalive_connections: int = 20
+    supabase_keepalive_expiry: float = 30.0  # seconds
+    supabase_http2: bool = True
+    supabase_connect_timeout: float = 5.0  # seconds
+    supabase_read_timeout: float = 10.0  # seconds
+    supabase_pool_timeout: float = 5.0  # seconds waiting for a free connection
+    
+    # Verified JWT cache (0 disables)
+    jwt_cache_max_size: int = 10000
+    
+    # Setups catalogue cache
+    setup_catalogue_ttl: float = 300.0  # seconds
+    
+    # Per-user hot state (active session, today's check, reduced mode, active setup)
+    user_state_cache_max_users: int = 10000  # 0 disables
+    user_state_cache_ttl: float = 10.0  # seconds; bounds staleness from writes on other workers
+    
+    # Dashboard fan-out
+    dashboard_section_timeout: float = 3.0  # seconds per section
+    
+    # Emit Server-Timing headers with per-request Supabase call timings
+    server_timing: bool = True
+    
+    # Readiness probe (/health/ready)
+    readiness_cache_ttl: float = 5.0  # seconds a result is reused
+    readiness_timeout: float = 2.0  # seconds before Supabase counts as down
+    
+    # History export/import (/me/export, /me/import)
+    history_batch_size: int = 500  # rows per export page and import write
+    
+    # Offline sync (/sync)
+    sync_max_operations: int = 100  # operations accepted per batch
+    
+    # Idempotency-Key replay for mutating requests
+    idempotency_store: str = "memory"  # memory (per worker), redis (shared) or off
+    idempotency_ttl: float = 86400.0  # seconds a response is replayed
+    idempotency_claim_ttl: float = 60.0  # seconds a key stays locked by an unfinished request
+    idempotency_max_entries: int = 10000  # memory store only
+    idempotency_max_body_bytes: int = 65536  # larger requests are never cached
+    redis_url: Optional[str] = None  # required by the redis store and events backend
+    
+    # Live state events (/me/events)
+    events_backend: str = "memory"  # memory (single worker) or redis (relays between workers)
+    events_queue_size: int = 32  # events buffered per open stream
+    events_heartbeat: float = 15.0  # seconds between keep-alive comments
+    
+    # Serialize responses with pydantic-core/orjson instead of stdlib json
+    fast_json_responses: bool = True
+    
+    # Expose Prometheus metrics at /metrics
+    metrics_enabled: bool = True
+    
+    # Admin API key for operational endpoints (unset disables them)
+    admin_api_key: Optional[str] = None
+    
     # Application Configuration
     app_env: str = "development"
     log_level: str = "INFO"
+    log_queue_size: int = 10000  # records buffered before new ones are dropped
+    # Fraction of INFO records kept per logger, e.g. "services.auth_service.tokens=0.01"
+    log_sample_rates: str = "services.auth_service.tokens=0.01"
     
     # API Configuration
     api_v1_prefix: str = "/api/v1"
@@ -1,4 +1,5 @@
 """Dependencies package."""
-from dependencies.auth import get_current_user
+from dependencies.auth import get_current_user, require_admin
+from dependencies.database import get_supabase
 
-__all__ = ["get_current_user"]
+__all__ = ["get_current_user", "require_admin", "get_supabase"]
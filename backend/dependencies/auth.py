@@ -3,11 +3,13 @@ Authentication dependencies.
 
 FastAPI dependencies for JWT token validation and user extraction.
 """
+import hmac
 import logging
-from typing import Annotated
-from fastapi import Depends, HTTPException, status
+from typing import Annotated, Optional
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError
+from config import settings
 from models.user import User
 from services.auth_service import auth_service
 
@@ -49,3 +51,24 @@ async def get_current_user(
             detail="Unable to verify credentials. Please sign in again.",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+async def require_admin(
+    x_admin_key: Annotated[Optional[str], Header()] = None
+) -> None:
+    """
+    Dependency guarding operational endpoints with the admin API key.
+    
+    Args:
+        x_admin_key: Value of the X-Admin-Key header
+        
+    Raises:
+        HTTPException: 403 if no admin key is configured or it does not match
+    """
+    expected = settings.admin_api_key
+    
+    if not expected or not x_admin_key or not hmac.compare_digest(x_admin_key, expected):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed.",
+        )
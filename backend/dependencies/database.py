@@ -0,0 +1,21 @@
+"""
+Database dependencies.
+
+FastAPI dependencies for the shared Supabase client.
+"""
+from services.supabase_client import SupabaseClient, get_supabase_client
+
+
+def get_supabase() -> SupabaseClient:
+    """
+    Dependency providing the process-wide pooled Supabase client.
+    
+    Returns:
+        Shared SupabaseClient
+        
+    Examples:
+        >>> @app.get("/pool")
+        >>> async def pool(supabase: SupabaseClient = Depends(get_supabase)):
+        >>>     return supabase.pool_stats()
+    """
+    return get_supabase_client()
@@ -4,16 +4,71 @@ Makana Backend API - Main Application Entry Point
 A practice medium for developing intentional strength through starting, stopping, and alignment.
 """
 import logging
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from fastapi import Depends, FastAPI, HTTPException, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from config import settings
 from config.logging import setup_logging
+from services import metrics
+from services.request_context import current_request_id
+from services.supabase_client import SupabaseClient, get_supabase_client
+from services.setup_service import setup_service
+from services.health_service import health_service
+from services.events import event_bus
+from services.pagination import NEXT_CURSOR_HEADER
+from dependencies.auth import require_admin
+from dependencies.database import get_supabase
+from services.idempotency import create_idempotency_store
+from middleware import IdempotencyMiddleware, RequestTimingMiddleware
+from middleware.idempotency import REPLAYED_HEADER
+from middleware.request_timing import REQUEST_ID_HEADER
+from api.responses import ModelJSONResponse
 from api.v1 import auth
 
-# Setup logging
-setup_logging()
+# Setup logging; records logged while handling a request carry its ID
+log_handler = setup_logging(request_id=current_request_id)
 logger = logging.getLogger(__name__)
 
+metrics.registry.register(metrics.CallbackGauge(
+    "makana_log_records_dropped",
+    "Log records dropped because the log queue was full.",
+    lambda: [({}, float(log_handler.dropped))],
+    kind="counter",
+))
+metrics.registry.register(metrics.CallbackGauge(
+    "makana_log_queue_depth",
+    "Log records waiting to be written.",
+    lambda: [({}, float(log_handler.log_queue.qsize()))],
+))
+
+# Responses kept for Idempotency-Key retries (None when IDEMPOTENCY_STORE=off)
+idempotency_store = create_idempotency_store()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Manage shared resources for the lifetime of the application."""
+    # Warm the setups catalogue; requests retry the load if this fails
+    try:
+        await setup_service.refresh_catalogue()
+    except Exception as e:
+        logger.warning(f"Setup catalogue not loaded at startup: {str(e)}")
+    
+    # Relay live events between workers (no-op with the memory backend)
+    await event_bus.start()
+    
+    yield
+    
+    await event_bus.aclose()
+    
+    # Close pooled Supabase connections on shutdown
+    await get_supabase_client().aclose()
+    if idempotency_store is not None:
+        await idempotency_store.aclose()
+
+
 # Create FastAPI application
 app = FastAPI(
     title="Makana API",
@@ -21,8 +76,16 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs" if settings.app_env == "development" else None,
     redoc_url="/redoc" if settings.app_env == "development" else None,
+    lifespan=lifespan,
+    # orjson for routes returning plain dicts; model routes use model_response
+    default_response_class=ModelJSONResponse if settings.fast_json_responses else JSONResponse,
 )
 
+# Replay stored responses for retried Idempotency-Keys (innermost, so
+# replays still get CORS headers, a request ID and timing)
+if idempotency_store is not None:
+    app.add_middleware(IdempotencyMiddleware, store=idempotency_store)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -30,8 +93,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", NEXT_CURSOR_HEADER, REQUEST_ID_HEADER, REPLAYED_HEADER, "Server-Timing"],
 )
 
+# Request IDs, latency and Supabase call timings (outermost, so it times CORS too)
+app.add_middleware(RequestTimingMiddleware)
+
 # Include API routers
 app.include_router(auth.router, prefix="/api/v1")
 
@@ -55,16 +122,48 @@ app.include_router(weekly_check.router, prefix="/api/v1")
 from api.v1 import setups
 app.include_router(setups.router, prefix="/api/v1")
 
+# Import current user router
+from api.v1 import me
+app.include_router(me.router, prefix="/api/v1")
+
+# Import offline sync router
+from api.v1 import sync
+app.include_router(sync.router, prefix="/api/v1")
+
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint for monitoring."""
+    """Liveness check: the process is up (no dependency calls)."""
     return {
         "status": "healthy",
         "environment": settings.app_env,
     }
 
 
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness check: Supabase is reachable (result cached briefly)."""
+    readiness, cached = await health_service.get_readiness()
+    return JSONResponse(
+        status_code=200 if readiness.ready else 503,
+        content=readiness.as_dict(cached)
+    )
+
+
+@app.get("/health/pool", dependencies=[Depends(require_admin)])
+async def pool_stats(supabase: SupabaseClient = Depends(get_supabase)):
+    """Supabase connection pool statistics for sizing workers (admin key required)."""
+    return supabase.pool_stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus metrics for this worker process."""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(content=metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -0,0 +1,5 @@
+"""Middleware package."""
+from middleware.idempotency import IdempotencyMiddleware
+from middleware.request_timing import RequestTimingMiddleware
+
+__all__ = ["IdempotencyMiddleware", "RequestTimingMiddleware"]
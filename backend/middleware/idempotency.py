@@ -0,0 +1,171 @@
+"""
+Idempotency-Key middleware.
+
+Answers a retried mutating request (POST, PUT, PATCH, DELETE) with the
+successful response stored for its Idempotency-Key, so the retry never
+reaches the route or the database. Keys are scoped to the signed-in user
+and bound to the request they were first used with.
+"""
+import logging
+from typing import List, Optional
+from jose import JWTError
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from config import settings
+from services import metrics as prometheus
+from services.auth_service import auth_service
+from services.idempotency import IdempotencyStore, StoredResponse, request_fingerprint
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+idempotency_requests = prometheus.registry.register(prometheus.Counter(
+    "makana_idempotency_requests",
+    "Requests carrying an Idempotency-Key, by outcome.",
+    ("outcome",)
+))
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware that replays stored responses for repeated Idempotency-Keys."""
+
+    def __init__(self, app: ASGIApp, store: IdempotencyStore) -> None:
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        idempotency_key = headers.get(IDEMPOTENCY_KEY_HEADER.lower().encode(), b"").decode("latin-1")
+        user_id = self._user_id(headers.get(b"authorization", b""))
+        content_length = headers.get(b"content-length", b"")
+
+        # Anonymous requests and large or streamed bodies (history import, or
+        # any body without a Content-Length) run as usual
+        if (
+            not idempotency_key
+            or len(idempotency_key) > 255
+            or user_id is None
+            or not content_length.isdigit()
+            or int(content_length) > settings.idempotency_max_body_bytes
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body = await self._read_body(receive)
+        fingerprint = request_fingerprint(scope["method"], scope["path"], scope["query_string"], body)
+        key = f"{user_id}:{idempotency_key}"
+
+        stored = await self.store.get(key)
+        if stored is None and not await self.store.claim(key):
+            # Lost a race to another request with the same key: it may have just finished
+            stored = await self.store.get(key)
+            if stored is None:
+                idempotency_requests.inc("in_progress")
+                await self._error(scope, send, 409, "A request with this Idempotency-Key is still in progress.")
+                return
+
+        if stored is not None:
+            if stored.fingerprint != fingerprint:
+                idempotency_requests.inc("mismatch")
+                await self._error(scope, send, 422, "This Idempotency-Key was already used for a different request.")
+                return
+
+            idempotency_requests.inc("replayed")
+            await self._replay(stored, send)
+            return
+
+        await self._run_and_store(scope, body, send, key, fingerprint)
+
+    async def _run_and_store(self, scope: Scope, body: bytes, send: Send, key: str, fingerprint: str) -> None:
+        """Run the request and store its response if it succeeded."""
+        status_code = 500
+        response_headers: List = []
+        chunks: List[bytes] = []
+        body_sent = False
+
+        async def receive_body() -> Message:
+            nonlocal body_sent
+            if body_sent:
+                return {"type": "http.disconnect"}
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def capture(message: Message) -> None:
+            nonlocal status_code, response_headers
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, capture)
+        except Exception:
+            await self.store.release(key)
+            raise
+
+        # Routes report transient failures as 4xx too, so only successes are
+        # replayed; anything else may not have happened and can be retried
+        if not 200 <= status_code < 300:
+            await self.store.release(key)
+            return
+
+        idempotency_requests.inc("stored")
+        await self.store.save(key, StoredResponse(
+            fingerprint=fingerprint,
+            status_code=status_code,
+            headers=response_headers,
+            body=b"".join(chunks)
+        ))
+
+    @staticmethod
+    def _user_id(authorization: bytes) -> Optional[str]:
+        """User the bearer token belongs to, or None if it is missing or invalid."""
+        scheme, _, token = authorization.decode("latin-1").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+
+        try:
+            return str(auth_service.verify_token(token).id)
+        except JWTError:
+            return None
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        """Read the whole request body."""
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    @staticmethod
+    async def _replay(stored: StoredResponse, send: Send) -> None:
+        """Send a stored response."""
+        await send({
+            "type": "http.response.start",
+            "status": stored.status_code,
+            "headers": stored.headers + [(REPLAYED_HEADER.lower().encode(), b"true")],
+        })
+        await send({"type": "http.response.body", "body": stored.body})
+
+    @staticmethod
+    async def _error(scope: Scope, send: Send, status_code: int, detail: str) -> None:
+        """Send an error in the API's usual {"detail": ...} shape."""
+        async def no_body() -> Message:
+            return {"type": "http.disconnect"}
+
+        await JSONResponse({"detail": detail}, status_code=status_code)(scope, no_body, send)
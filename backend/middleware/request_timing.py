@@ -0,0 +1,102 @@
+"""
+Request timing middleware.
+
+Assigns each request an ID, times it, and reports the Supabase calls made
+while handling it as structured log fields and Server-Timing headers. Also
+feeds the per-route Prometheus latency histogram.
+"""
+import logging
+import re
+import time
+from uuid import uuid4
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from config import settings
+from services import metrics as prometheus
+from services.request_context import RequestMetrics, request_scope
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Client-supplied request IDs are reused only if they look like IDs
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._-]{1,128}")
+
+
+def server_timing(metrics: RequestMetrics, total_ms: float) -> str:
+    """
+    Build a Server-Timing header value.
+    
+    Args:
+        metrics: Downstream calls recorded for the request
+        total_ms: Time spent handling the request
+        
+    Returns:
+        Header value with one entry per call kind plus the total
+        
+    Examples:
+        >>> metrics = RequestMetrics(request_id="abc")
+        >>> metrics.record("db", 4.2)
+        >>> server_timing(metrics, 9.0)
+        'db;dur=4.2;desc="1 call", app;dur=9.0'
+    """
+    entries = [
+        f'{kind};dur={stats.duration_ms:.1f};desc="{stats.count} call{"" if stats.count == 1 else "s"}"'
+        for kind, stats in sorted(metrics.calls.items())
+    ]
+    entries.append(f"app;dur={total_ms:.1f}")
+    return ", ".join(entries)
+
+
+class RequestTimingMiddleware:
+    """ASGI middleware that records per-request latency and downstream calls."""
+    
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        incoming = dict(scope["headers"]).get(REQUEST_ID_HEADER.lower().encode(), b"").decode("latin-1")
+        request_id = incoming if _VALID_REQUEST_ID.fullmatch(incoming) else uuid4().hex
+        started = time.perf_counter()
+        status_code = 500
+        prometheus.http_requests_in_flight.inc()
+        
+        with request_scope(request_id) as metrics:
+            async def send_with_headers(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers[REQUEST_ID_HEADER] = request_id
+                    if settings.server_timing:
+                        total_ms = (time.perf_counter() - started) * 1000
+                        headers.append("Server-Timing", server_timing(metrics, total_ms))
+                await send(message)
+            
+            try:
+                await self.app(scope, receive, send_with_headers)
+            finally:
+                duration_ms = (time.perf_counter() - started) * 1000
+                route = getattr(scope.get("route"), "path", None)
+                prometheus.http_requests_in_flight.dec()
+                # Label by route template so IDs in paths don't multiply series
+                prometheus.http_request_duration.observe(
+                    duration_ms / 1000, scope["method"], route or "unmatched", str(status_code)
+                )
+                logger.info(
+                    f"{scope['method']} {scope['path']} {status_code} {duration_ms:.1f}ms "
+                    f"({metrics.call_count} Supabase calls, {metrics.call_duration_ms:.1f}ms)",
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "route": route,
+                        "status": status_code,
+                        "duration_ms": round(duration_ms, 2),
+                        "supabase_calls": metrics.call_count,
+                        "supabase_ms": round(metrics.call_duration_ms, 2),
+                    }
+                )
@@ -0,0 +1,93 @@
+-- Makana - Atomic session start
+-- Adds a one-active-session-per-user index and a start_session() function so
+-- Ignition is a single round trip with no check-then-insert race.
+
+-- ============================================================================
+-- UP
+-- ============================================================================
+
+-- Resolve any existing duplicates so the unique index can be built:
+-- keep each user's newest active session, abandon the rest.
+UPDATE sessions s
+SET status = 'abandoned'
+WHERE s.status = 'active'
+  AND EXISTS (
+      SELECT 1 FROM sessions newer
+      WHERE newer.user_id = s.user_id
+        AND newer.status = 'active'
+        AND newer.created_at > s.created_at
+  );
+
+-- At most one active session per user
+CREATE UNIQUE INDEX IF NOT EXISTS idx_sessions_one_active_per_user
+    ON sessions(user_id)
+    WHERE status = 'active';
+
+-- Start a session (Ignition).
+-- Duration follows rules_engine.calculate_session_duration: the setup's
+-- default, or 60% of it (truncated) while reduced mode is active.
+-- Errors:
+--   23505 (unique_violation) - user already has an active session
+--   P0002 (no_data_found)    - setup does not exist
+CREATE OR REPLACE FUNCTION start_session(p_user_id UUID, p_setup_id UUID)
+RETURNS SETOF sessions AS $$
+DECLARE
+    v_default_duration INTEGER;
+    v_reduced_mode BOOLEAN;
+BEGIN
+    SELECT default_session_duration INTO v_default_duration
+    FROM setups
+    WHERE id = p_setup_id;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Setup not found.' USING ERRCODE = 'no_data_found';
+    END IF;
+
+    v_reduced_mode := COALESCE(
+        (SELECT is_active FROM reduced_mode_states WHERE user_id = p_user_id),
+        false
+    );
+
+    -- The partial unique index is the active-session check: a second insert
+    -- fails with unique_violation, including under concurrent Ignitions.
+    RETURN QUERY
+    INSERT INTO sessions (user_id, setup_id, status, reduced_mode_active, duration_minutes)
+    VALUES (
+        p_user_id,
+        p_setup_id,
+        'active',
+        v_reduced_mode,
+        CASE WHEN v_reduced_mode THEN (v_default_duration * 6) / 10 ELSE v_default_duration END
+    )
+    RETURNING *;
+EXCEPTION
+    WHEN unique_violation THEN
+        RAISE EXCEPTION 'Unable to start right now. Try again in a moment.'
+            USING ERRCODE = 'unique_violation';
+END;
+$$ LANGUAGE plpgsql;
+
+GRANT EXECUTE ON FUNCTION start_session(UUID, UUID) TO authenticated, service_role;
+
+
+-- ============================================================================
+-- VERIFICATION
+-- ============================================================================
+DO $$
+BEGIN
+    ASSERT (SELECT COUNT(*) FROM pg_indexes
+            WHERE indexname = 'idx_sessions_one_active_per_user') = 1,
+           'Active session index not created';
+
+    ASSERT (SELECT COUNT(*) FROM pg_proc WHERE proname = 'start_session') = 1,
+           'start_session function not created';
+
+    RAISE NOTICE 'Migration 002_start_session_rpc.sql completed successfully';
+END $$;
+
+
+-- ============================================================================
+-- DOWN (rollback)
+-- ============================================================================
+-- DROP FUNCTION IF EXISTS start_session(UUID, UUID);
+-- DROP INDEX IF EXISTS idx_sessions_one_active_per_user;
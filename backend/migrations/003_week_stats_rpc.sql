@@ -0,0 +1,59 @@
+-- Makana - Weekly aggregates
+-- Adds a week_stats() function so the Weekly Check counts sessions and daily
+-- checks in the database and returns one row instead of every record.
+
+-- ============================================================================
+-- UP
+-- ============================================================================
+
+-- Counters for one user's week (Monday to Sunday, inclusive).
+-- Sessions are bucketed by created_at, daily checks by check_date; both scans
+-- are range reads on idx_sessions_user_created / idx_daily_checks_user_date.
+CREATE OR REPLACE FUNCTION week_stats(p_user_id UUID, p_week_start DATE, p_week_end DATE)
+RETURNS TABLE (
+    sessions_completed INTEGER,
+    sessions_abandoned INTEGER,
+    sessions_with_next_step INTEGER,
+    daily_checks_completed INTEGER
+) AS $$
+    SELECT
+        s.completed,
+        s.abandoned,
+        s.with_next_step,
+        (SELECT COUNT(*)::INTEGER
+         FROM daily_checks
+         WHERE user_id = p_user_id
+           AND check_date BETWEEN p_week_start AND p_week_end)
+    FROM (
+        SELECT
+            COUNT(*) FILTER (WHERE status = 'completed')::INTEGER AS completed,
+            COUNT(*) FILTER (WHERE status = 'abandoned')::INTEGER AS abandoned,
+            COUNT(*) FILTER (
+                WHERE status = 'completed' AND COALESCE(next_step, '') <> ''
+            )::INTEGER AS with_next_step
+        FROM sessions
+        WHERE user_id = p_user_id
+          AND created_at >= p_week_start
+          AND created_at < p_week_end + 1
+    ) s;
+$$ LANGUAGE sql STABLE;
+
+GRANT EXECUTE ON FUNCTION week_stats(UUID, DATE, DATE) TO authenticated, service_role;
+
+
+-- ============================================================================
+-- VERIFICATION
+-- ============================================================================
+DO $$
+BEGIN
+    ASSERT (SELECT COUNT(*) FROM pg_proc WHERE proname = 'week_stats') = 1,
+           'week_stats function not created';
+
+    RAISE NOTICE 'Migration 003_week_stats_rpc.sql completed successfully';
+END $$;
+
+
+-- ============================================================================
+-- DOWN (rollback)
+-- ============================================================================
+-- DROP FUNCTION IF EXISTS week_stats(UUID, DATE, DATE);
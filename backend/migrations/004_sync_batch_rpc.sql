@@ -0,0 +1,265 @@
+-- Makana - Offline sync batches
+-- Adds an apply_sync_batch() function so the mobile app can replay a queue of
+-- offline actions (Ignition, Braking, abandon, daily check) in one round trip,
+-- and a sync_operations table that makes each replayed action idempotent.
+
+-- ============================================================================
+-- UP
+-- ============================================================================
+
+-- Outcome of every applied operation, keyed by the client's idempotency key.
+-- A replayed key returns the stored outcome instead of applying again.
+CREATE TABLE IF NOT EXISTS sync_operations (
+    user_id UUID NOT NULL REFERENCES user_profiles(id) ON DELETE CASCADE,
+    idempotency_key TEXT NOT NULL,
+    result JSONB,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (user_id, idempotency_key)
+);
+
+-- Index for pruning old keys
+CREATE INDEX IF NOT EXISTS idx_sync_operations_created ON sync_operations(created_at);
+
+-- RLS Policies for sync_operations
+ALTER TABLE sync_operations ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view their own sync operations"
+    ON sync_operations FOR SELECT
+    USING (auth.uid() = user_id);
+
+CREATE POLICY "Users can insert their own sync operations"
+    ON sync_operations FOR INSERT
+    WITH CHECK (auth.uid() = user_id);
+
+CREATE POLICY "Users can update their own sync operations"
+    ON sync_operations FOR UPDATE
+    USING (auth.uid() = user_id);
+
+-- start_session() gains an optional client-generated id and start time, so a
+-- session started offline keeps the id the app already uses for it and the
+-- time it actually started. Existing two-argument calls are unchanged.
+DROP FUNCTION IF EXISTS start_session(UUID, UUID);
+
+CREATE OR REPLACE FUNCTION start_session(
+    p_user_id UUID,
+    p_setup_id UUID,
+    p_session_id UUID DEFAULT NULL,
+    p_start_time TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS SETOF sessions AS $$
+DECLARE
+    v_default_duration INTEGER;
+    v_reduced_mode BOOLEAN;
+BEGIN
+    SELECT default_session_duration INTO v_default_duration
+    FROM setups
+    WHERE id = p_setup_id;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Setup not found.' USING ERRCODE = 'no_data_found';
+    END IF;
+
+    v_reduced_mode := COALESCE(
+        (SELECT is_active FROM reduced_mode_states WHERE user_id = p_user_id),
+        false
+    );
+
+    -- The partial unique index is the active-session check: a second insert
+    -- fails with unique_violation, including under concurrent Ignitions.
+    RETURN QUERY
+    INSERT INTO sessions (id, user_id, setup_id, start_time, status, reduced_mode_active, duration_minutes)
+    VALUES (
+        COALESCE(p_session_id, uuid_generate_v4()),
+        p_user_id,
+        p_setup_id,
+        LEAST(COALESCE(p_start_time, NOW()), NOW()),
+        'active',
+        v_reduced_mode,
+        CASE WHEN v_reduced_mode THEN (v_default_duration * 6) / 10 ELSE v_default_duration END
+    )
+    RETURNING *;
+EXCEPTION
+    WHEN unique_violation THEN
+        RAISE EXCEPTION 'Unable to start right now. Try again in a moment.'
+            USING ERRCODE = 'unique_violation';
+END;
+$$ LANGUAGE plpgsql;
+
+GRANT EXECUTE ON FUNCTION start_session(UUID, UUID, UUID, TIMESTAMPTZ) TO authenticated, service_role;
+
+-- Apply an ordered batch of operations for one user.
+-- p_operations is a JSON array of objects with:
+--   idempotency_key  client-generated, unique per user
+--   type             start_session | end_session | abandon_session | daily_check
+--   occurred_at      when the action happened on the device (optional)
+--   setup_id         start_session
+--   session_id       start_session (optional client id), end_session, abandon_session
+--   next_step        end_session (optional)
+--   responses        daily_check
+-- Returns a JSON array with one result per operation, in order:
+--   {idempotency_key, type, status, error, session, daily_check}
+-- status is 'applied', 'rejected' (an invariant failed; error says which) or
+-- 'duplicate' (the key was seen before; the stored result is returned).
+-- Each operation runs in its own subtransaction, so a rejected one does not
+-- undo the others. Unexpected errors abort the whole batch.
+CREATE OR REPLACE FUNCTION apply_sync_batch(p_user_id UUID, p_operations JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    v_op JSONB;
+    v_key TEXT;
+    v_at TIMESTAMPTZ;
+    v_session sessions;
+    v_check daily_checks;
+    v_result JSONB;
+    v_results JSONB := '[]'::JSONB;
+BEGIN
+    FOR v_op IN SELECT * FROM jsonb_array_elements(p_operations)
+    LOOP
+        v_key := v_op->>'idempotency_key';
+        v_at := LEAST(COALESCE((v_op->>'occurred_at')::TIMESTAMPTZ, NOW()), NOW());
+
+        -- Claim the key; a concurrent batch with the same key waits here
+        -- until this one commits, then reads the stored result.
+        INSERT INTO sync_operations (user_id, idempotency_key)
+        VALUES (p_user_id, v_key)
+        ON CONFLICT DO NOTHING;
+
+        IF NOT FOUND THEN
+            SELECT result || jsonb_build_object('status', 'duplicate') INTO v_result
+            FROM sync_operations
+            WHERE user_id = p_user_id AND idempotency_key = v_key;
+
+            v_results := v_results || jsonb_build_array(v_result);
+            CONTINUE;
+        END IF;
+
+        v_result := jsonb_build_object(
+            'idempotency_key', v_key,
+            'type', v_op->>'type',
+            'status', 'applied'
+        );
+
+        BEGIN
+            CASE v_op->>'type'
+            WHEN 'start_session' THEN
+                SELECT * INTO v_session
+                FROM start_session(
+                    p_user_id,
+                    (v_op->>'setup_id')::UUID,
+                    (v_op->>'session_id')::UUID,
+                    v_at
+                );
+                v_result := v_result || jsonb_build_object('session', to_jsonb(v_session));
+
+            WHEN 'end_session' THEN
+                -- Same rules as SessionService.end_session, ending when the
+                -- user braked rather than when the app reconnected
+                UPDATE sessions
+                SET end_time = GREATEST(v_at, start_time),
+                    duration_minutes = FLOOR(EXTRACT(EPOCH FROM GREATEST(v_at, start_time) - start_time) / 60)::INTEGER,
+                    next_step = COALESCE(NULLIF(v_op->>'next_step', ''), next_step),
+                    status = 'completed',
+                    updated_at = NOW()
+                WHERE id = (v_op->>'session_id')::UUID
+                  AND user_id = p_user_id
+                  AND status = 'active'
+                RETURNING * INTO v_session;
+
+                IF NOT FOUND THEN
+                    PERFORM sync_session_missing(p_user_id, (v_op->>'session_id')::UUID);
+                END IF;
+                v_result := v_result || jsonb_build_object('session', to_jsonb(v_session));
+
+            WHEN 'abandon_session' THEN
+                UPDATE sessions
+                SET status = 'abandoned',
+                    updated_at = NOW()
+                WHERE id = (v_op->>'session_id')::UUID
+                  AND user_id = p_user_id
+                  AND status = 'active'
+                RETURNING * INTO v_session;
+
+                IF NOT FOUND THEN
+                    PERFORM sync_session_missing(p_user_id, (v_op->>'session_id')::UUID);
+                END IF;
+                v_result := v_result || jsonb_build_object('session', to_jsonb(v_session));
+
+            WHEN 'daily_check' THEN
+                -- The unique (user_id, check_date) constraint is the
+                -- once-per-day check
+                INSERT INTO daily_checks (user_id, check_date, responses, completed_at)
+                VALUES (p_user_id, v_at::DATE, v_op->'responses', v_at)
+                RETURNING * INTO v_check;
+                v_result := v_result || jsonb_build_object('daily_check', to_jsonb(v_check));
+
+            ELSE
+                RAISE EXCEPTION 'Unknown operation.' USING ERRCODE = 'invalid_parameter_value';
+            END CASE;
+        EXCEPTION
+            WHEN unique_violation THEN
+                v_result := v_result || jsonb_build_object(
+                    'status', 'rejected',
+                    'error', CASE WHEN v_op->>'type' = 'daily_check'
+                                  THEN 'Already completed today.'
+                                  ELSE SQLERRM END
+                );
+            WHEN no_data_found OR invalid_parameter_value THEN
+                v_result := v_result || jsonb_build_object('status', 'rejected', 'error', SQLERRM);
+        END;
+
+        UPDATE sync_operations
+        SET result = v_result
+        WHERE user_id = p_user_id AND idempotency_key = v_key;
+
+        v_results := v_results || jsonb_build_array(v_result);
+    END LOOP;
+
+    RETURN v_results;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Raise the error SessionService reports for a session that cannot be ended
+-- or abandoned: missing (or someone else's) versus no longer active.
+CREATE OR REPLACE FUNCTION sync_session_missing(p_user_id UUID, p_session_id UUID)
+RETURNS VOID AS $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM sessions WHERE id = p_session_id AND user_id = p_user_id) THEN
+        RAISE EXCEPTION 'Session is not active.' USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    RAISE EXCEPTION 'Session not found.' USING ERRCODE = 'no_data_found';
+END;
+$$ LANGUAGE plpgsql;
+
+GRANT EXECUTE ON FUNCTION apply_sync_batch(UUID, JSONB) TO authenticated, service_role;
+GRANT EXECUTE ON FUNCTION sync_session_missing(UUID, UUID) TO authenticated, service_role;
+
+
+-- ============================================================================
+-- VERIFICATION
+-- ============================================================================
+DO $$
+BEGIN
+    ASSERT (SELECT COUNT(*) FROM information_schema.tables
+            WHERE table_name = 'sync_operations') = 1,
+           'sync_operations table not created';
+
+    ASSERT (SELECT COUNT(*) FROM pg_proc WHERE proname = 'start_session') = 1,
+           'start_session function not replaced';
+
+    ASSERT (SELECT COUNT(*) FROM pg_proc WHERE proname = 'apply_sync_batch') = 1,
+           'apply_sync_batch function not created';
+
+    RAISE NOTICE 'Migration 004_sync_batch_rpc.sql completed successfully';
+END $$;
+
+
+-- ============================================================================
+-- DOWN (rollback)
+-- ============================================================================
+-- DROP FUNCTION IF EXISTS apply_sync_batch(UUID, JSONB);
+-- DROP FUNCTION IF EXISTS sync_session_missing(UUID, UUID);
+-- DROP FUNCTION IF EXISTS start_session(UUID, UUID, UUID, TIMESTAMPTZ);
+-- DROP TABLE IF EXISTS sync_operations;
+-- Then re-run 002_start_session_rpc.sql to restore the two-argument start_session().
@@ -0,0 +1,92 @@
+-- Makana - Atomic session transitions
+-- Adds end_session() and abandon_session() so Braking and abandon are each a
+-- single conditional UPDATE: one round trip, and a session can only leave
+-- 'active' once even when both transitions race.
+
+-- ============================================================================
+-- UP
+-- ============================================================================
+
+-- End a session (Braking).
+-- Duration is the whole minutes between start and end, as in
+-- SessionService; an empty next step keeps the stored one.
+-- Errors (raised by sync_session_missing(), see 004_sync_batch_rpc.sql):
+--   P0002 (no_data_found)           - no such session for this user
+--   22023 (invalid_parameter_value) - session is no longer active
+CREATE OR REPLACE FUNCTION end_session(
+    p_user_id UUID,
+    p_session_id UUID,
+    p_next_step TEXT DEFAULT NULL
+)
+RETURNS SETOF sessions AS $$
+DECLARE
+    v_session sessions;
+BEGIN
+    -- The status filter is the active check; row locking makes a racing
+    -- transition see the committed status and match nothing
+    UPDATE sessions
+    SET end_time = NOW(),
+        duration_minutes = FLOOR(EXTRACT(EPOCH FROM NOW() - start_time) / 60)::INTEGER,
+        next_step = COALESCE(NULLIF(p_next_step, ''), next_step),
+        status = 'completed',
+        updated_at = NOW()
+    WHERE id = p_session_id
+      AND user_id = p_user_id
+      AND status = 'active'
+    RETURNING * INTO v_session;
+
+    IF NOT FOUND THEN
+        PERFORM sync_session_missing(p_user_id, p_session_id);
+    END IF;
+
+    RETURN NEXT v_session;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Abandon a session without penalty.
+-- Errors: as end_session().
+CREATE OR REPLACE FUNCTION abandon_session(p_user_id UUID, p_session_id UUID)
+RETURNS SETOF sessions AS $$
+DECLARE
+    v_session sessions;
+BEGIN
+    UPDATE sessions
+    SET status = 'abandoned',
+        updated_at = NOW()
+    WHERE id = p_session_id
+      AND user_id = p_user_id
+      AND status = 'active'
+    RETURNING * INTO v_session;
+
+    IF NOT FOUND THEN
+        PERFORM sync_session_missing(p_user_id, p_session_id);
+    END IF;
+
+    RETURN NEXT v_session;
+END;
+$$ LANGUAGE plpgsql;
+
+GRANT EXECUTE ON FUNCTION end_session(UUID, UUID, TEXT) TO authenticated, service_role;
+GRANT EXECUTE ON FUNCTION abandon_session(UUID, UUID) TO authenticated, service_role;
+
+
+-- ============================================================================
+-- VERIFICATION
+-- ============================================================================
+DO $$
+BEGIN
+    ASSERT (SELECT COUNT(*) FROM pg_proc WHERE proname = 'end_session') = 1,
+           'end_session function not created';
+
+    ASSERT (SELECT COUNT(*) FROM pg_proc WHERE proname = 'abandon_session') = 1,
+           'abandon_session function not created';
+
+    RAISE NOTICE 'Migration 005_session_transitions_rpc.sql completed successfully';
+END $$;
+
+
+-- ============================================================================
+-- DOWN (rollback)
+-- ============================================================================
+-- DROP FUNCTION IF EXISTS abandon_session(UUID, UUID);
+-- DROP FUNCTION IF EXISTS end_session(UUID, UUID, TEXT);
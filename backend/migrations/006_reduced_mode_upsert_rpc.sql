@@ -0,0 +1,90 @@
+-- Makana - Reduced mode upsert
+-- Adds set_reduced_mode() so activating or deactivating reduced mode is a
+-- single INSERT ... ON CONFLICT (user_id): one round trip, and concurrent
+-- first-time toggles cannot both insert.
+
+-- ============================================================================
+-- UP
+-- ============================================================================
+
+-- The upsert needs a unique constraint on user_id to conflict on.
+-- 001_initial_schema.sql declares one; add it where it is missing.
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_constraint c
+        JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ALL (c.conkey)
+        WHERE c.conrelid = 'reduced_mode_states'::regclass
+          AND c.contype IN ('u', 'p')
+          AND array_length(c.conkey, 1) = 1
+          AND a.attname = 'user_id'
+    ) THEN
+        ALTER TABLE reduced_mode_states
+            ADD CONSTRAINT reduced_mode_states_user_id_key UNIQUE (user_id);
+    END IF;
+END $$;
+
+-- The unique index serves user lookups
+DROP INDEX IF EXISTS idx_reduced_mode_user;
+
+-- Set reduced mode on or off.
+-- Idempotent: a toggle to the current state changes nothing (timestamps
+-- included) and returns the stored row. Turning on keeps deactivated_at and
+-- turning off keeps activated_at, as in ReducedModeService.
+-- changed tells the caller whether the row was written, so it only notifies
+-- the user's other devices of real changes.
+-- An earlier draft returned SETOF reduced_mode_states; the return type
+-- cannot be changed in place.
+DROP FUNCTION IF EXISTS set_reduced_mode(UUID, BOOLEAN);
+CREATE FUNCTION set_reduced_mode(p_user_id UUID, p_is_active BOOLEAN)
+RETURNS TABLE (state reduced_mode_states, changed BOOLEAN) AS $$
+BEGIN
+    RETURN QUERY
+    INSERT INTO reduced_mode_states AS s (user_id, is_active, activated_at, deactivated_at)
+    VALUES (
+        p_user_id,
+        p_is_active,
+        CASE WHEN p_is_active THEN NOW() END,
+        CASE WHEN NOT p_is_active THEN NOW() END
+    )
+    ON CONFLICT (user_id) DO UPDATE
+    SET is_active = EXCLUDED.is_active,
+        activated_at = COALESCE(EXCLUDED.activated_at, s.activated_at),
+        deactivated_at = COALESCE(EXCLUDED.deactivated_at, s.deactivated_at),
+        updated_at = NOW()
+    WHERE s.is_active IS DISTINCT FROM EXCLUDED.is_active
+    RETURNING s, TRUE;
+
+    -- Already in the requested state: the conflicting row was not updated
+    IF NOT FOUND THEN
+        RETURN QUERY
+        SELECT r, FALSE FROM reduced_mode_states r WHERE r.user_id = p_user_id;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+GRANT EXECUTE ON FUNCTION set_reduced_mode(UUID, BOOLEAN) TO authenticated, service_role;
+
+
+-- ============================================================================
+-- VERIFICATION
+-- ============================================================================
+DO $$
+BEGIN
+    ASSERT (SELECT COUNT(*) FROM pg_proc WHERE proname = 'set_reduced_mode') = 1,
+           'set_reduced_mode function not created';
+
+    ASSERT (SELECT COUNT(*) FROM pg_indexes WHERE indexname = 'idx_reduced_mode_user') = 0,
+           'idx_reduced_mode_user index not dropped';
+
+    RAISE NOTICE 'Migration 006_reduced_mode_upsert_rpc.sql completed successfully';
+END $$;
+
+
+-- ============================================================================
+-- DOWN (rollback)
+-- ============================================================================
+-- DROP FUNCTION IF EXISTS set_reduced_mode(UUID, BOOLEAN);
+-- CREATE INDEX idx_reduced_mode_user ON reduced_mode_states(user_id);
+-- The unique constraint on user_id predates this migration and is kept.
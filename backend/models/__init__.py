@@ -1,10 +1,15 @@
 """Data models for Makana backend."""
 from models.user import User, UserProfile, UserCreate, UserLogin, TokenResponse
-from models.session import Session, SessionCreate, SessionEnd, SessionResponse
+from models.session import (
+    Session, SessionCreate, SessionEnd, SessionResponse, SessionWithSetup, SessionWithSetupResponse
+)
 from models.daily_check import DailyCheck, DailyCheckCreate, DailyCheckResponse
 from models.weekly_check import WeeklyCheck, WeeklyCheckCreate, WeeklyCheckResponse
-from models.setup import Setup, UserSetup, SetupActivate, SetupResponse
+from models.setup import Setup, UserSetup, SetupActivate, SetupResponse, SetupSummary
 from models.reduced_mode import ReducedModeState, ReducedModeResponse
+from models.dashboard import DashboardResponse
+from models.history import HistoryImportResponse
+from models.sync import SyncOperation, SyncRequest, SyncOperationResult, SyncResponse
 
 __all__ = [
     "User",
@@ -16,6 +21,8 @@ __all__ = [
     "SessionCreate",
     "SessionEnd",
     "SessionResponse",
+    "SessionWithSetup",
+    "SessionWithSetupResponse",
     "DailyCheck",
     "DailyCheckCreate",
     "DailyCheckResponse",
@@ -26,6 +33,13 @@ __all__ = [
     "UserSetup",
     "SetupActivate",
     "SetupResponse",
+    "SetupSummary",
     "ReducedModeState",
     "ReducedModeResponse",
+    "DashboardResponse",
+    "HistoryImportResponse",
+    "SyncOperation",
+    "SyncRequest",
+    "SyncOperationResult",
+    "SyncResponse",
 ]
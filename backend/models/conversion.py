@@ -0,0 +1,51 @@
+"""
+Model conversion.
+
+Builds API response models from service models. A page of results is
+validated with one TypeAdapter call rather than one model per row.
+"""
+from functools import lru_cache
+from typing import Any, List, Sequence, Type, TypeVar, cast
+from pydantic import BaseModel, TypeAdapter
+
+R = TypeVar("R", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Validating TypeAdapter for a list of one model (built once per model)."""
+    return TypeAdapter(List[model])  # type: ignore[valid-type]
+
+
+def to_response(model: Type[R], source: Any) -> R:
+    """
+    Build a response model from a service model (or mapping).
+
+    Args:
+        model: Response model class
+        source: Service model (or mapping) to convert
+
+    Returns:
+        Response model instance
+
+    Examples:
+        >>> session = Session(**row)
+        >>> response = to_response(SessionResponse, session)
+    """
+    return model.model_validate(source)
+
+
+def to_responses(model: Type[R], sources: Sequence[Any]) -> List[R]:
+    """
+    Build response models for a list of service models.
+
+    The whole list is validated with one TypeAdapter call.
+
+    Args:
+        model: Response model class
+        sources: Service models to convert
+
+    Returns:
+        List of response model instances
+    """
+    return cast(List[R], _list_adapter(model).validate_python(sources, from_attributes=True))
@@ -0,0 +1,44 @@
+"""
+Dashboard data models.
+
+Defines the aggregated home screen payload.
+"""
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from models.session import SessionResponse
+from models.daily_check import DailyCheckResponse
+from models.weekly_check import WeeklyCheckResponse
+from models.setup import SetupResponse
+from models.reduced_mode import ReducedModeResponse
+
+
+class DashboardResponse(BaseModel):
+    """Response containing everything the home screen shows."""
+    
+    active_session: Optional[SessionResponse] = None
+    today_check: Optional[DailyCheckResponse] = None
+    reduced_mode: Optional[ReducedModeResponse] = None
+    active_setup: Optional[SetupResponse] = None
+    latest_weekly_check: Optional[WeeklyCheckResponse] = None
+    unavailable: List[str] = Field(
+        default_factory=list,
+        description="Optional sections that could not be loaded this time"
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "active_session": None,
+                "today_check": None,
+                "reduced_mode": {"is_active": False},
+                "active_setup": {
+                    "id": "00000000-0000-0000-0000-000000000001",
+                    "name": "Calm",
+                    "description": "Default 25 minutes, emphasis on rest.",
+                    "default_session_duration": 25,
+                    "emphasis": "rest"
+                },
+                "latest_weekly_check": None,
+                "unavailable": []
+            }
+        }
@@ -0,0 +1,30 @@
+"""
+Practice history data models.
+
+Defines the result of a bulk history import.
+"""
+from typing import Dict, List
+from pydantic import BaseModel, Field
+
+
+class HistoryImportResponse(BaseModel):
+    """Response summarizing a bulk history import."""
+
+    imported: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Rows written per table (rows already present are not counted)"
+    )
+    skipped: int = Field(0, description="Lines that could not be imported")
+    errors: List[str] = Field(
+        default_factory=list,
+        description="Why lines were skipped (first few only)"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "imported": {"sessions": 412, "daily_checks": 180, "weekly_checks": 26, "user_setups": 3},
+                "skipped": 1,
+                "errors": ["Line 57: unknown table 'notes'"]
+            }
+        }
@@ -6,6 +6,7 @@ Defines session-related models for Ignition and Braking.
 from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, UUID4, Field
+from models.setup import SetupSummary
 
 
 class Session(BaseModel):
@@ -27,6 +28,12 @@ class Session(BaseModel):
         from_attributes = True
 
 
+class SessionWithSetup(Session):
+    """Session row with its setup embedded (sessions listings)."""
+    
+    setup: Optional[SetupSummary] = None
+
+
 class SessionCreate(BaseModel):
     """Schema for starting a session (Ignition)."""
     
@@ -67,3 +74,9 @@ class SessionResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class SessionWithSetupResponse(SessionResponse):
+    """Response containing session data and its setup."""
+    
+    setup: Optional[SetupSummary] = None
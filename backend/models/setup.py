@@ -20,6 +20,7 @@ class Setup(BaseModel):
     
     class Config:
         from_attributes = True
+        frozen = True
 
 
 class UserSetup(BaseModel):
@@ -48,6 +49,18 @@ class SetupActivate(BaseModel):
         }
 
 
+class SetupSummary(BaseModel):
+    """Setup fields embedded in rows that reference a setup."""
+    
+    id: UUID4
+    name: str
+    emphasis: str
+    
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
 class SetupResponse(BaseModel):
     """Response containing setup data."""
     
@@ -0,0 +1,95 @@
+"""
+Offline sync data models.
+
+Defines batches of actions queued by the app while offline and their
+per-operation results.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, UUID4, Field, model_validator
+from models.daily_check import DailyCheckResponse
+from models.session import SessionResponse
+
+# Fields each operation type needs
+REQUIRED_FIELDS = {
+    "start_session": ("setup_id",),
+    "end_session": ("session_id",),
+    "abandon_session": ("session_id",),
+    "daily_check": ("responses",),
+}
+
+
+class SyncOperation(BaseModel):
+    """One queued action."""
+
+    idempotency_key: str = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="Client-generated key; replaying it returns the first result"
+    )
+    type: Literal["start_session", "end_session", "abandon_session", "daily_check"]
+    occurred_at: Optional[datetime] = Field(
+        None,
+        description="When the action happened on the device (defaults to now)"
+    )
+    setup_id: Optional[UUID4] = None
+    session_id: Optional[UUID4] = Field(
+        None,
+        description="Session to end or abandon, or a client id for a started session"
+    )
+    next_step: Optional[str] = Field(None, max_length=500)
+    responses: Optional[Dict[str, Any]] = None
+
+    @model_validator(mode="after")
+    def check_required_fields(self) -> "SyncOperation":
+        """Require the fields the operation type acts on."""
+        missing = [name for name in REQUIRED_FIELDS[self.type] if getattr(self, name) is None]
+        if missing:
+            raise ValueError(f"{self.type} requires {', '.join(missing)}")
+        return self
+
+
+class SyncRequest(BaseModel):
+    """Ordered batch of queued actions."""
+
+    operations: List[SyncOperation] = Field(..., min_length=1)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "operations": [
+                    {
+                        "idempotency_key": "1718000000000-k3j2h1g0f",
+                        "type": "start_session",
+                        "occurred_at": "2024-01-15T09:00:00Z",
+                        "setup_id": "00000000-0000-0000-0000-000000000001",
+                        "session_id": "880e8400-e29b-41d4-a716-446655440000"
+                    },
+                    {
+                        "idempotency_key": "1718000900000-a8s7d6f5g",
+                        "type": "end_session",
+                        "occurred_at": "2024-01-15T09:25:00Z",
+                        "session_id": "880e8400-e29b-41d4-a716-446655440000",
+                        "next_step": "Review design document"
+                    }
+                ]
+            }
+        }
+
+
+class SyncOperationResult(BaseModel):
+    """Outcome of one queued action."""
+
+    idempotency_key: str
+    type: str
+    status: Literal["applied", "rejected", "duplicate"]
+    error: Optional[str] = None
+    session: Optional[SessionResponse] = None
+    daily_check: Optional[DailyCheckResponse] = None
+
+
+class SyncResponse(BaseModel):
+    """Results of a sync batch, in request order."""
+
+    results: List[SyncOperationResult]
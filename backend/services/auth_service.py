@@ -3,32 +3,46 @@ Authentication service.
 
 Handles JWT token verification and user profile management.
 """
+import hashlib
 import logging
+import time
 from typing import Optional
 from datetime import datetime
 from jose import jwt, JWTError
-from supabase import create_client, Client
 from config import settings
+from services import metrics
+from services.cache import TTLCache
+from services.supabase_client import SupabaseClient, columns, get_supabase_client
 from models.user import User, UserProfile
 
 logger = logging.getLogger(__name__)
+# Per-request verification lines, sampled via LOG_SAMPLE_RATES
+token_logger = logging.getLogger(f"{__name__}.tokens")
+
+PROFILE_COLUMNS = columns(UserProfile)
 
 
 class AuthService:
     """Service for authentication and user management."""
     
-    def __init__(self) -> None:
-        """Initialize auth service with Supabase client."""
-        self.supabase: Client = create_client(
-            settings.supabase_url,
-            settings.supabase_key
-        )
+    def __init__(self, supabase: Optional[SupabaseClient] = None) -> None:
+        """Initialize auth service with the shared Supabase client."""
+        self.supabase = supabase or get_supabase_client()
         self.jwt_secret = settings.supabase_jwt_secret
+        
+        # Verified users keyed by token digest, expiring at the token's exp claim
+        self.token_cache: TTLCache[bytes, User] = TTLCache(
+            maxsize=settings.jwt_cache_max_size,
+            clock=time.time
+        )
     
     def verify_token(self, token: str) -> User:
         """
         Verify JWT token and return user.
         
+        Verified tokens are cached until their exp claim, so repeat requests
+        with the same bearer token skip decoding.
+        
         Args:
             token: JWT access token
             
@@ -43,6 +57,11 @@ class AuthService:
             >>> user = service.verify_token("valid.jwt.token")
             >>> assert user.email == "user@example.com"
         """
+        digest = hashlib.sha256(token.encode()).digest()
+        cached_user = self.token_cache.get(digest)
+        if cached_user is not None:
+            return cached_user
+        
         try:
             # Decode JWT token
             payload = jwt.decode(
@@ -59,20 +78,27 @@ class AuthService:
             if not user_id or not email:
                 raise JWTError("Invalid token payload")
             
-            logger.info(f"Token verified for user: {user_id}")
+            token_logger.info(f"Token verified for user: {user_id}")
             
-            return User(
+            user = User(
                 id=user_id,
                 email=email,
                 aud=payload.get("aud", "authenticated"),
                 role=payload.get("role", "authenticated")
             )
             
+            # Tokens without exp are never cached
+            exp = payload.get("exp")
+            if exp is not None:
+                self.token_cache.set(digest, user, expires_at=float(exp))
+            
+            return user
+            
         except JWTError as e:
             logger.warning(f"Token verification failed: {str(e)}")
             raise
     
-    def create_user_profile(self, user_id: str, email: str) -> UserProfile:
+    async def create_user_profile(self, user_id: str, email: str) -> UserProfile:
         """
         Create user profile in database.
         
@@ -85,7 +111,7 @@ class AuthService:
             
         Examples:
             >>> service = AuthService()
-            >>> profile = service.create_user_profile(
+            >>> profile = await service.create_user_profile(
             ...     "550e8400-e29b-41d4-a716-446655440000",
             ...     "user@example.com"
             ... )
@@ -93,7 +119,7 @@ class AuthService:
         """
         try:
             # Check if profile already exists
-            existing = self.supabase.table("user_profiles").select("*").eq(
+            existing = await self.supabase.table("user_profiles").select(PROFILE_COLUMNS).eq(
                 "id", user_id
             ).execute()
             
@@ -110,7 +136,7 @@ class AuthService:
                 "updated_at": now.isoformat()
             }
             
-            result = self.supabase.table("user_profiles").insert(
+            result = await self.supabase.table("user_profiles").insert(
                 profile_data
             ).execute()
             
@@ -122,7 +148,7 @@ class AuthService:
             logger.error(f"Failed to create user profile: {str(e)}")
             raise
     
-    def get_user_profile(self, user_id: str) -> Optional[UserProfile]:
+    async def get_user_profile(self, user_id: str) -> Optional[UserProfile]:
         """
         Get user profile by ID.
         
@@ -133,7 +159,7 @@ class AuthService:
             UserProfile if found, None otherwise
         """
         try:
-            result = self.supabase.table("user_profiles").select("*").eq(
+            result = await self.supabase.table("user_profiles").select(PROFILE_COLUMNS).eq(
                 "id", user_id
             ).execute()
             
@@ -149,3 +175,16 @@ class AuthService:
 
 # Global auth service instance
 auth_service = AuthService()
+
+# Cache counters are read at scrape time, keeping verify_token unchanged
+for _stat, _kind, _help in (
+    ("hits", "counter", "Verified-token cache hits."),
+    ("misses", "counter", "Verified-token cache misses."),
+    ("size", "gauge", "Tokens in the verified-token cache."),
+):
+    metrics.registry.register(metrics.CallbackGauge(
+        f"makana_jwt_cache_{_stat}",
+        _help,
+        lambda _stat=_stat: [({}, float(auth_service.token_cache.stats()[_stat]))],
+        kind=_kind,
+    ))
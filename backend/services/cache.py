@@ -0,0 +1,112 @@
+"""
+In-process cache.
+
+Bounded LRU cache with per-entry expiry and hit/miss counters.
+"""
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU cache whose entries expire at a deadline."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            maxsize: Maximum number of entries (0 disables caching)
+            ttl: Default lifetime in seconds for entries set without a deadline
+            clock: Time source that deadlines are measured against
+
+        Examples:
+            >>> cache = TTLCache(maxsize=2, ttl=60)
+            >>> cache.set("a", 1)
+            >>> cache.get("a")
+            1
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[K, Tuple[V, Optional[float]]]" = OrderedDict()
+
+    def get(self, key: K) -> Optional[V]:
+        """
+        Get a live entry and mark it recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or self.clock() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+            del self._entries[key]
+
+        self.misses += 1
+        return None
+
+    def set(self, key: K, value: V, expires_at: Optional[float] = None) -> None:
+        """
+        Store an entry, evicting the least recently used one when full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            expires_at: Deadline on the cache clock (defaults to now + ttl)
+        """
+        if self.maxsize <= 0:
+            return
+
+        if expires_at is None and self.ttl is not None:
+            expires_at = self.clock() + self.ttl
+
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        """Remove an entry if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with size, maxsize, hits and misses
+        """
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -6,24 +6,34 @@ Handles daily check-in records with one-per-day constraint.
 import logging
 from typing import Optional, List
 from datetime import date, datetime
-from supabase import create_client, Client
-from config import settings
+from services.supabase_client import SupabaseClient, columns, get_supabase_client
+from services.pagination import decode_cursor, seek_after
+from services.user_state import UserStateCache, user_state, TODAY_CHECK
+from pydantic import TypeAdapter
 from models.daily_check import DailyCheck, DailyCheckCreate
 
 logger = logging.getLogger(__name__)
 
+DAILY_CHECK_COLUMNS = columns(DailyCheck)
+# Columns of the one-per-day unique constraint
+DAILY_CHECK_CONFLICT_TARGET = "user_id,check_date"
+# Validates a list of rows in one pydantic-core call
+DAILY_CHECK_LIST = TypeAdapter(List[DailyCheck])
+
 
 class DailyCheckService:
     """Service for daily check management."""
     
-    def __init__(self) -> None:
-        """Initialize daily check service with Supabase client."""
-        self.supabase: Client = create_client(
-            settings.supabase_url,
-            settings.supabase_key
-        )
+    def __init__(
+        self,
+        supabase: Optional[SupabaseClient] = None,
+        state: Optional[UserStateCache] = None
+    ) -> None:
+        """Initialize daily check service with the shared Supabase client and state cache."""
+        self.supabase = supabase or get_supabase_client()
+        self.state = state or user_state
     
-    def create_daily_check(
+    async def create_daily_check(
         self,
         user_id: str,
         check_data: DailyCheckCreate
@@ -43,7 +53,7 @@ class DailyCheckService:
             
         Examples:
             >>> service = DailyCheckService()
-            >>> check = service.create_daily_check(
+            >>> check = await service.create_daily_check(
             ...     "550e8400-e29b-41d4-a716-446655440000",
             ...     DailyCheckCreate(responses={"energy": "medium"})
             ... )
@@ -51,14 +61,6 @@ class DailyCheckService:
         """
         try:
             today = date.today()
-            
-            # Check if already completed today
-            existing = self.get_today_check(user_id, today)
-            if existing:
-                logger.warning(f"Daily check already exists for user {user_id} on {today}")
-                raise Exception("Already completed today.")
-            
-            # Create new check
             now = datetime.utcnow()
             check_record = {
                 "user_id": user_id,
@@ -68,19 +70,30 @@ class DailyCheckService:
                 "created_at": now.isoformat()
             }
             
-            result = self.supabase.table("daily_checks").insert(
-                check_record
+            # ON CONFLICT DO NOTHING against the one-per-day unique constraint:
+            # a duplicate, even a concurrent one, inserts and returns no row
+            result = await self.supabase.table("daily_checks").upsert(
+                check_record,
+                ignore_duplicates=True,
+                on_conflict=DAILY_CHECK_CONFLICT_TARGET
             ).execute()
             
+            if not result.data:
+                logger.warning(f"Daily check already exists for user {user_id} on {today}")
+                self.state.invalidate(user_id, TODAY_CHECK)
+                raise Exception("Already completed today.")
+            
             logger.info(f"Daily check created for user: {user_id}")
             
-            return DailyCheck(**result.data[0])
+            check = DailyCheck(**result.data[0])
+            self.state.set(user_id, TODAY_CHECK, check, scope=today)
+            return check
             
         except Exception as e:
             logger.error(f"Failed to create daily check: {str(e)}")
             raise
     
-    def get_today_check(
+    async def get_today_check(
         self,
         user_id: str,
         check_date: date
@@ -88,6 +101,9 @@ class DailyCheckService:
         """
         Get today's check if exists.
         
+        Read through the user state cache, keyed by the date so a cached
+        answer never outlives its day.
+        
         Args:
             user_id: User UUID
             check_date: Date to check
@@ -96,62 +112,103 @@ class DailyCheckService:
             DailyCheck if found, None otherwise
         """
         try:
-            result = self.supabase.table("daily_checks").select("*").eq(
-                "user_id", user_id
-            ).eq(
-                "check_date", check_date.isoformat()
-            ).execute()
-            
-            if result.data:
-                return DailyCheck(**result.data[0])
-            
-            return None
+            return await self.fetch_today_check(user_id, check_date)
             
         except Exception as e:
             logger.error(f"Failed to get today's check: {str(e)}")
             return None
     
-    def has_completed_today(self, user_id: str) -> bool:
+    async def fetch_today_check(self, user_id: str, check_date: date) -> Optional[DailyCheck]:
+        """
+        Get one day's check, raising if it cannot be read.
+        
+        Same read as get_today_check, for callers that must tell "none"
+        from "could not load" (the dashboard's failure policy).
+        
+        Raises:
+            Exception: If the database read fails
+        """
+        return await self.state.get_or_load(
+            user_id,
+            TODAY_CHECK,
+            lambda: self._load_check(user_id, check_date),
+            scope=check_date
+        )
+    
+    async def _load_check(self, user_id: str, check_date: date) -> Optional[DailyCheck]:
+        """Query one day's check (errors propagate, so they are not cached)."""
+        result = await self.supabase.table("daily_checks").select(DAILY_CHECK_COLUMNS).eq(
+            "user_id", user_id
+        ).eq(
+            "check_date", check_date.isoformat()
+        ).execute()
+        
+        if result.data:
+            return DailyCheck(**result.data[0])
+        
+        return None
+    
+    async def has_completed_today(self, user_id: str) -> bool:
         """
         Fast boolean check if today's check exists.
         
+        Answered from the user state cache when today's check is known, so
+        it usually costs no query.
+        
         Args:
             user_id: User UUID
             
         Returns:
             True if check exists for today, False otherwise
         """
-        today = date.today()
-        check = self.get_today_check(user_id, today)
-        return check is not None
+        return await self.get_today_check(user_id, date.today()) is not None
     
-    def get_check_history(
+    async def get_check_history(
         self,
         user_id: str,
         limit: int = 30,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> List[DailyCheck]:
         """
         Get past checks with pagination.
         
+        Pages either by offset or, when a cursor is given, by seeking past
+        the last (check_date, id) seen so each page is an index range read.
+        
         Args:
             user_id: User UUID
             limit: Maximum number of checks to return
-            offset: Number of checks to skip
+            offset: Number of checks to skip (ignored with a cursor)
+            cursor: Opaque cursor from the previous page
             
         Returns:
             List of DailyCheck in reverse chronological order
+            
+        Raises:
+            ValueError: If the cursor is malformed
         """
+        # Decoded up front so a bad cursor is reported, not read as no rows
+        if cursor is not None:
+            decode_cursor(cursor)
+        
         try:
-            result = self.supabase.table("daily_checks").select("*").eq(
+            query = self.supabase.table("daily_checks").select(DAILY_CHECK_COLUMNS).eq(
                 "user_id", user_id
             ).order(
                 "check_date", desc=True
-            ).range(
-                offset, offset + limit - 1
-            ).execute()
+            ).order(
+                "id", desc=True
+            )
+            
+            if cursor is not None:
+                query = seek_after(query, "check_date", cursor).limit(limit)
+            else:
+                query = query.range(offset, offset + limit - 1)
+            
+            result = await query.execute()
             
-            return [DailyCheck(**check) for check in result.data]
+            return DAILY_CHECK_LIST.validate_python(result.data)
             
         except Exception as e:
             logger.error(f"Failed to get check history: {str(e)}")
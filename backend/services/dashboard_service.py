@@ -0,0 +1,145 @@
+"""
+Dashboard service.
+
+Loads the home screen sections concurrently in one call, applying a
+per-section failure policy.
+"""
+import asyncio
+import logging
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, Optional, Type, TypeVar
+from pydantic import BaseModel
+from config import settings
+from models.conversion import to_response
+from models.dashboard import DashboardResponse
+from models.daily_check import DailyCheckResponse
+from models.reduced_mode import ReducedModeResponse
+from models.session import SessionResponse
+from models.setup import SetupResponse
+from models.weekly_check import WeeklyCheckResponse
+from services.daily_check_service import daily_check_service
+from services.reduced_mode_service import reduced_mode_service
+from services.session_service import session_service
+from services.setup_service import setup_service
+from services.weekly_check_service import weekly_check_service
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+# Failure policies: a required section failing fails the whole dashboard,
+# an optional one is left empty and listed in `unavailable`
+REQUIRED = "required"
+OPTIONAL = "optional"
+
+DEFAULT_POLICIES: Dict[str, str] = {
+    "active_session": REQUIRED,
+    "today_check": OPTIONAL,
+    "reduced_mode": OPTIONAL,
+    "active_setup": OPTIONAL,
+    "latest_weekly_check": OPTIONAL,
+}
+
+
+class DashboardService:
+    """Service for the aggregated home screen."""
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, str]] = None,
+        section_timeout: Optional[float] = None
+    ) -> None:
+        """
+        Initialize dashboard service.
+
+        Args:
+            policies: Failure policy per section (defaults to DEFAULT_POLICIES)
+            section_timeout: Seconds each section may take before it fails
+        """
+        self.policies = policies or DEFAULT_POLICIES
+        self.section_timeout = (
+            section_timeout if section_timeout is not None
+            else settings.dashboard_section_timeout
+        )
+
+    def _readers(self, user_id: str) -> Dict[str, Callable[[], Awaitable[Any]]]:
+        """
+        Map each section to the service read that loads it.
+
+        These are the fetch_* reads, which raise on database errors where
+        the get_* ones return None: the failure policy needs the error.
+        """
+        return {
+            "active_session": lambda: session_service.fetch_active_session(user_id),
+            "today_check": lambda: daily_check_service.fetch_today_check(user_id, date.today()),
+            "reduced_mode": lambda: reduced_mode_service.fetch_reduced_mode_state(user_id),
+            "active_setup": lambda: setup_service.fetch_active_setup(user_id),
+            "latest_weekly_check": lambda: weekly_check_service.fetch_latest_check(user_id),
+        }
+
+    async def get_dashboard(self, user_id: str) -> DashboardResponse:
+        """
+        Load all dashboard sections concurrently.
+
+        Args:
+            user_id: User UUID
+
+        Returns:
+            DashboardResponse with every section that loaded
+
+        Raises:
+            Exception: If a required section fails or times out
+
+        Examples:
+            >>> service = DashboardService()
+            >>> dashboard = await service.get_dashboard(
+            ...     "550e8400-e29b-41d4-a716-446655440000"
+            ... )
+            >>> assert dashboard.unavailable == []
+        """
+        readers = self._readers(user_id)
+        names = list(readers)
+
+        results = await asyncio.gather(
+            *(asyncio.wait_for(readers[name](), self.section_timeout) for name in names),
+            return_exceptions=True
+        )
+
+        sections: Dict[str, Any] = {}
+        unavailable = []
+
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                reason = "timed out" if isinstance(result, asyncio.TimeoutError) else str(result)
+                logger.error(f"Dashboard section {name} failed for user {user_id}: {reason}")
+
+                if self.policies.get(name, OPTIONAL) == REQUIRED:
+                    raise Exception("Unable to load dashboard. Try again in a moment.")
+
+                unavailable.append(name)
+                continue
+
+            sections[name] = result
+
+        reduced_mode = sections.get("reduced_mode")
+        if reduced_mode is None and "reduced_mode" not in unavailable:
+            # No stored state means inactive, as in GET /reduced-mode/status
+            reduced_mode = ReducedModeResponse(is_active=False)
+
+        return DashboardResponse(
+            active_session=_response(SessionResponse, sections.get("active_session")),
+            today_check=_response(DailyCheckResponse, sections.get("today_check")),
+            reduced_mode=_response(ReducedModeResponse, reduced_mode),
+            active_setup=_response(SetupResponse, sections.get("active_setup")),
+            latest_weekly_check=_response(WeeklyCheckResponse, sections.get("latest_weekly_check")),
+            unavailable=unavailable
+        )
+
+
+def _response(model: Type[M], value: Any) -> Optional[M]:
+    """Convert a stored record to its response model, keeping None."""
+    return to_response(model, value) if value is not None else None
+
+
+# Global dashboard service instance
+dashboard_service = DashboardService()
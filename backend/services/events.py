@@ -0,0 +1,255 @@
+"""
+Event bus.
+
+Per-user publish/subscribe for state changes other devices should see
+(Ignition, Braking, abandon, reduced mode). Subscribers in this worker get
+events directly; a Redis-compatible backend relays them between workers.
+"""
+import asyncio
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+import orjson
+from pydantic import BaseModel
+from config import settings
+from services import metrics
+
+logger = logging.getLogger(__name__)
+
+# Event types
+SNAPSHOT = "snapshot"
+SESSION_STARTED = "session.started"
+SESSION_ENDED = "session.ended"
+SESSION_ABANDONED = "session.abandoned"
+REDUCED_MODE_CHANGED = "reduced_mode.changed"
+
+# Channel every worker publishes to and listens on
+REDIS_CHANNEL = "makana:events"
+
+
+@dataclass
+class Event:
+    """A state change for one user."""
+
+    type: str
+    data: Dict[str, Any]
+
+    def sse(self) -> bytes:
+        """Encode as a Server-Sent Events frame."""
+        return b"event: " + self.type.encode() + b"\ndata: " + orjson.dumps(self.data) + b"\n\n"
+
+
+class EventBackend(ABC):
+    """Interface for relaying events between workers."""
+
+    @abstractmethod
+    async def start(self, deliver: Callable[[str, Event], None]) -> None:
+        """Start passing events published by other workers to deliver."""
+
+    @abstractmethod
+    async def publish(self, user_id: str, event: Event) -> None:
+        """Send an event to the other workers."""
+
+    @abstractmethod
+    async def aclose(self) -> None:
+        """Stop relaying and release connections."""
+
+
+class RedisEventBackend(EventBackend):
+    """Relays events through pub/sub on a Redis-compatible server."""
+
+    def __init__(self, url: Optional[str] = None, client: Optional[Any] = None) -> None:
+        """
+        Initialize Redis backend.
+
+        All workers share one channel, so each sees every user's events and
+        drops those without local subscribers.
+
+        Args:
+            url: Server URL, e.g. redis://redis:6379/0 (ignored with client)
+            client: Async client with publish and pubsub
+
+        Raises:
+            RuntimeError: If no client is given and the redis package is missing
+        """
+        if client is None:
+            try:
+                from redis import asyncio as aioredis
+            except ImportError as e:
+                raise RuntimeError("EVENTS_BACKEND=redis requires the redis package.") from e
+            client = aioredis.from_url(url)
+
+        self.client = client
+        # Lets a worker skip its own events, which it already delivered
+        self.origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: Callable[[str, Event], None]) -> None:
+        self._listener = asyncio.create_task(self._listen(deliver))
+
+    async def publish(self, user_id: str, event: Event) -> None:
+        await self.client.publish(REDIS_CHANNEL, orjson.dumps({
+            "origin": self.origin,
+            "user_id": user_id,
+            "type": event.type,
+            "data": event.data,
+        }))
+
+    async def _listen(self, deliver: Callable[[str, Event], None]) -> None:
+        """Deliver events from other workers, resubscribing after connection errors."""
+        while True:
+            try:
+                pubsub = self.client.pubsub()
+                await pubsub.subscribe(REDIS_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    payload = orjson.loads(message["data"])
+                    if payload["origin"] != self.origin:
+                        deliver(payload["user_id"], Event(type=payload["type"], data=payload["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Event relay disconnected: {str(e)}")
+                await asyncio.sleep(1.0)
+
+    async def aclose(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+        await self.client.aclose()
+
+
+class EventBus:
+    """Fans out per-user events to the streams subscribed in this worker."""
+
+    def __init__(self, queue_size: int, backend: Optional[EventBackend] = None) -> None:
+        """
+        Initialize event bus.
+
+        Args:
+            queue_size: Events buffered per subscriber; a slow subscriber
+                loses its oldest events rather than blocking publishers
+            backend: Relay to other workers (None for a single worker)
+        """
+        self.queue_size = queue_size
+        self.backend = backend
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._pending: Set[asyncio.Task] = set()
+        self._relay_listeners: List[Callable[[str, Event], None]] = []
+
+    @contextmanager
+    def subscribe(self, user_id: str) -> Iterator[asyncio.Queue]:
+        """
+        Receive a user's events for the duration of the block.
+
+        Args:
+            user_id: User UUID
+
+        Yields:
+            Queue the user's events are put on
+
+        Examples:
+            >>> with event_bus.subscribe(user_id) as events:
+            ...     event = await events.get()
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    def publish(self, user_id: str, event_type: str, data: BaseModel) -> None:
+        """
+        Publish a state change without waiting on subscribers or the relay.
+
+        Args:
+            user_id: User UUID the change belongs to
+            event_type: One of the event type constants
+            data: Response model describing the new state
+        """
+        event = Event(type=event_type, data=data.model_dump(mode="json"))
+        self.deliver(user_id, event)
+
+        if self.backend is not None:
+            task = asyncio.create_task(self._relay(self.backend, user_id, event))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    def deliver(self, user_id: str, event: Event) -> None:
+        """Put an event on every local subscriber's queue."""
+        for queue in self._subscribers.get(user_id, ()):
+            if queue.full():
+                queue.get_nowait()
+                events_dropped.inc()
+            queue.put_nowait(event)
+
+    def add_relay_listener(self, listener: Callable[[str, Event], None]) -> None:
+        """Call listener with every event relayed from another worker."""
+        self._relay_listeners.append(listener)
+
+    def subscriber_count(self) -> int:
+        """Number of open streams in this worker."""
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def start(self) -> None:
+        """Start receiving events relayed from other workers."""
+        if self.backend is not None:
+            await self.backend.start(self._relayed)
+
+    async def aclose(self) -> None:
+        """Stop the relay."""
+        if self.backend is not None:
+            await self.backend.aclose()
+
+    def _relayed(self, user_id: str, event: Event) -> None:
+        for listener in self._relay_listeners:
+            listener(user_id, event)
+        self.deliver(user_id, event)
+
+    async def _relay(self, backend: EventBackend, user_id: str, event: Event) -> None:
+        try:
+            await backend.publish(user_id, event)
+        except Exception as e:
+            logger.warning(f"Failed to relay {event.type} event: {str(e)}")
+
+
+def create_event_backend() -> Optional[EventBackend]:
+    """
+    Build the relay selected by EVENTS_BACKEND.
+
+    Returns:
+        Redis backend, or None for memory (single worker)
+
+    Raises:
+        ValueError: If EVENTS_BACKEND is not memory or redis
+    """
+    kind = settings.events_backend.lower()
+
+    if kind == "memory":
+        return None
+    if kind == "redis":
+        return RedisEventBackend(url=settings.redis_url)
+
+    raise ValueError(f"Unknown EVENTS_BACKEND {settings.events_backend!r}")
+
+
+# Global event bus instance
+event_bus = EventBus(queue_size=settings.events_queue_size, backend=create_event_backend())
+
+events_dropped = metrics.registry.register(metrics.Counter(
+    "makana_events_dropped",
+    "Events discarded because a subscriber fell behind."
+))
+metrics.registry.register(metrics.CallbackGauge(
+    "makana_event_streams",
+    "Open event streams in this worker.",
+    lambda: [({}, float(event_bus.subscriber_count()))]
+))
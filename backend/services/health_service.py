@@ -0,0 +1,154 @@
+"""
+Health service.
+
+Readiness checks against the services each request depends on, cached
+for a short TTL so frequent probes don't add database load.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from config import settings
+from services.supabase_client import SupabaseClient, get_supabase_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DependencyCheck:
+    """Outcome of probing one dependency."""
+
+    name: str
+    healthy: bool
+    latency_ms: float
+    error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        check: Dict[str, Any] = {
+            "status": "ok" if self.healthy else "error",
+            "latency_ms": round(self.latency_ms, 1),
+        }
+        if self.error:
+            check["error"] = self.error
+        return check
+
+
+@dataclass(frozen=True)
+class Readiness:
+    """Result of a full readiness check."""
+
+    checks: Tuple[DependencyCheck, ...]
+    checked_at: datetime
+    expires_at: float
+
+    @property
+    def ready(self) -> bool:
+        return all(check.healthy for check in self.checks)
+
+    def is_expired(self) -> bool:
+        """Check whether the result is past its TTL."""
+        return time.monotonic() >= self.expires_at
+
+    def as_dict(self, cached: bool) -> Dict[str, Any]:
+        """
+        Build the /health/ready response body.
+
+        Args:
+            cached: Whether the result was served from cache
+
+        Returns:
+            Dictionary with overall status and per-dependency checks
+        """
+        return {
+            "status": "ready" if self.ready else "unavailable",
+            "checked_at": self.checked_at.isoformat(timespec="seconds"),
+            "cached": cached,
+            "checks": {check.name: check.as_dict() for check in self.checks},
+        }
+
+
+class HealthService:
+    """Service for dependency readiness checks."""
+
+    def __init__(
+        self,
+        supabase: Optional[SupabaseClient] = None,
+        cache_ttl: Optional[float] = None,
+        timeout: Optional[float] = None
+    ) -> None:
+        """
+        Initialize health service.
+
+        Args:
+            supabase: Supabase client (defaults to the shared client)
+            cache_ttl: Seconds a readiness result is reused
+            timeout: Seconds a dependency may take before it counts as down
+        """
+        self.supabase = supabase or get_supabase_client()
+        self.cache_ttl = cache_ttl if cache_ttl is not None else settings.readiness_cache_ttl
+        self.timeout = timeout if timeout is not None else settings.readiness_timeout
+        self._readiness: Optional[Readiness] = None
+        self._lock = asyncio.Lock()
+
+    async def get_readiness(self) -> Tuple[Readiness, bool]:
+        """
+        Return the latest readiness result, re-checking after the TTL.
+
+        Concurrent probes arriving while a check runs wait for it instead
+        of starting their own.
+
+        Returns:
+            Tuple of Readiness and whether it was served from cache
+
+        Examples:
+            >>> service = HealthService()
+            >>> readiness, cached = await service.get_readiness()
+            >>> assert readiness.ready
+        """
+        readiness = self._readiness
+        if readiness is not None and not readiness.is_expired():
+            return readiness, True
+
+        async with self._lock:
+            # Another probe may have checked while we waited
+            readiness = self._readiness
+            if readiness is not None and not readiness.is_expired():
+                return readiness, True
+
+            checks = (await self._check_supabase(),)
+            self._readiness = Readiness(
+                checks=checks,
+                checked_at=datetime.now(timezone.utc),
+                expires_at=time.monotonic() + self.cache_ttl
+            )
+            return self._readiness, False
+
+    async def _check_supabase(self) -> DependencyCheck:
+        """Run a one-row read through PostgREST and time it."""
+        started = time.perf_counter()
+        error = None
+
+        try:
+            await asyncio.wait_for(
+                self.supabase.table("setups").select("id").limit(1).execute(),
+                self.timeout
+            )
+        except asyncio.TimeoutError:
+            error = "timed out"
+            logger.error(f"Supabase readiness check timed out after {self.timeout}s")
+        except Exception as e:
+            error = type(e).__name__
+            logger.error(f"Supabase readiness check failed: {str(e)}")
+
+        return DependencyCheck(
+            name="supabase",
+            healthy=error is None,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            error=error
+        )
+
+
+# Global health service instance
+health_service = HealthService()
@@ -0,0 +1,235 @@
+"""
+History service.
+
+Moves a user's full practice history in and out as NDJSON: one
+{"table": ..., "row": ...} object per line. Export walks each table with
+keyset paging and streams rows as pages arrive; import writes rows in
+batched upserts. Memory stays bounded by the batch size either way.
+"""
+import logging
+from typing import AsyncIterable, AsyncIterator, Dict, List, Optional, Type
+import orjson
+from pydantic import BaseModel, ValidationError
+from config import settings
+from models.daily_check import DailyCheck
+from models.history import HistoryImportResponse
+from models.session import Session
+from models.setup import UserSetup
+from models.weekly_check import WeeklyCheck
+from services.pagination import encode_cursor, seek_after
+from services.supabase_client import SupabaseClient, columns, get_supabase_client
+from services.user_state import user_state
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Exported tables in import order (setup activations before sessions)
+HISTORY_TABLES: Dict[str, Type[BaseModel]] = {
+    "user_setups": UserSetup,
+    "sessions": Session,
+    "daily_checks": DailyCheck,
+    "weekly_checks": WeeklyCheck,
+}
+
+# Unique key an imported row may collide with; such rows are kept as they are.
+# Setup activations are a history (no unique user_id), so they conflict on id.
+CONFLICT_TARGETS: Dict[str, str] = {
+    "user_setups": "id",
+    "sessions": "id",
+    "daily_checks": "user_id,check_date",
+    "weekly_checks": "id",
+}
+
+# Skipped-line reasons kept in the import response
+MAX_REPORTED_ERRORS = 20
+
+
+class HistoryService:
+    """Service for bulk history export and import."""
+
+    def __init__(
+        self,
+        supabase: Optional[SupabaseClient] = None,
+        batch_size: Optional[int] = None
+    ) -> None:
+        """
+        Initialize history service.
+
+        Args:
+            supabase: Supabase client (defaults to the shared client)
+            batch_size: Rows per export page and per import upsert
+        """
+        self.supabase = supabase or get_supabase_client()
+        self.batch_size = batch_size or settings.history_batch_size
+
+    async def export_history(self, user_id: str) -> AsyncIterator[bytes]:
+        """
+        Stream every history row of a user as NDJSON lines.
+
+        Each table is read newest first in pages of batch_size, seeking past
+        the last (created_at, id) of the previous page.
+
+        Args:
+            user_id: User UUID
+
+        Yields:
+            One chunk of NDJSON lines per page
+
+        Raises:
+            Exception: If a page cannot be read (the stream is cut short)
+
+        Examples:
+            >>> service = HistoryService()
+            >>> async for chunk in service.export_history(
+            ...     "550e8400-e29b-41d4-a716-446655440000"
+            ... ):
+            ...     print(chunk.decode(), end="")
+        """
+        for table, model in HISTORY_TABLES.items():
+            cursor = None
+            exported = 0
+
+            while True:
+                query = self.supabase.table(table).select(columns(model)).eq(
+                    "user_id", user_id
+                ).order(
+                    "created_at", desc=True
+                ).order(
+                    "id", desc=True
+                )
+                if cursor is not None:
+                    query = seek_after(query, "created_at", cursor)
+
+                try:
+                    result = await query.limit(self.batch_size).execute()
+                except Exception as e:
+                    logger.error(f"History export failed on {table} for user {user_id}: {str(e)}")
+                    raise
+
+                rows = result.data
+                if not rows:
+                    break
+
+                yield b"".join(
+                    orjson.dumps({"table": table, "row": row}) + b"\n" for row in rows
+                )
+                exported += len(rows)
+
+                if len(rows) < self.batch_size:
+                    break
+                cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+
+            logger.info(f"Exported {exported} {table} rows for user {user_id}")
+
+    async def import_history(
+        self,
+        user_id: str,
+        chunks: AsyncIterable[bytes]
+    ) -> HistoryImportResponse:
+        """
+        Import NDJSON history lines into a user's account.
+
+        Rows are validated against their table's model and re-owned by the
+        importing user. Rows that collide with existing ones (same id or same
+        check date) are left as they are, so an interrupted import can simply
+        be sent again. Active sessions and invalid lines are skipped and
+        reported.
+
+        Args:
+            user_id: User UUID the rows are imported for
+            chunks: Request body chunks (lines may span chunks)
+
+        Returns:
+            HistoryImportResponse with counts per table and skipped lines
+
+        Raises:
+            Exception: If a batch cannot be written
+        """
+        try:
+            summary = HistoryImportResponse(imported={table: 0 for table in HISTORY_TABLES})
+            batches: Dict[str, List[dict]] = {table: [] for table in HISTORY_TABLES}
+            line_number = 0
+            pending = b""
+
+            async for chunk in chunks:
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+
+                for line in lines:
+                    line_number += 1
+                    table = self._parse_line(user_id, line, line_number, batches, summary)
+                    if table and len(batches[table]) >= self.batch_size:
+                        await self._write_batch(table, batches, summary)
+
+            if pending:
+                self._parse_line(user_id, pending, line_number + 1, batches, summary)
+
+            for table in HISTORY_TABLES:
+                if batches[table]:
+                    await self._write_batch(table, batches, summary)
+
+            logger.info(
+                f"Imported history for user {user_id}: {summary.imported}, {summary.skipped} skipped"
+            )
+
+            return summary
+        finally:
+            # Imported setups, sessions and checks may change the hot state
+            user_state.invalidate(user_id)
+
+    def _parse_line(
+        self,
+        user_id: str,
+        line: bytes,
+        line_number: int,
+        batches: Dict[str, List[dict]],
+        summary: HistoryImportResponse
+    ) -> Optional[str]:
+        """Validate one line and queue its row; returns the table it went to."""
+        if not line.strip():
+            return None
+
+        try:
+            record = orjson.loads(line)
+            table = record["table"]
+            model = HISTORY_TABLES.get(table)
+            if model is None:
+                raise ValueError(f"unknown table {table!r}")
+            row = model.model_validate({**record["row"], "user_id": user_id})
+            if table == "sessions" and row.status == "active":
+                raise ValueError("active sessions are not imported")
+        except (orjson.JSONDecodeError, KeyError, TypeError, ValueError, ValidationError) as e:
+            summary.skipped += 1
+            if len(summary.errors) < MAX_REPORTED_ERRORS:
+                reason = "invalid row" if isinstance(e, ValidationError) else str(e)
+                summary.errors.append(f"Line {line_number}: {reason}")
+            return None
+
+        batches[table].append(row.model_dump(mode="json"))
+        return table
+
+    async def _write_batch(
+        self,
+        table: str,
+        batches: Dict[str, List[dict]],
+        summary: HistoryImportResponse
+    ) -> None:
+        """Insert queued rows, ignoring those that collide with existing ones."""
+        rows, batches[table] = batches[table], []
+
+        try:
+            result = await self.supabase.table(table).upsert(
+                rows,
+                ignore_duplicates=True,
+                on_conflict=CONFLICT_TARGETS[table]
+            ).execute()
+        except Exception as e:
+            logger.error(f"History import failed on {table}: {str(e)}")
+            raise
+
+        summary.imported[table] += len(result.data)
+
+
+# Global history service instance
+history_service = HistoryService()
@@ -0,0 +1,216 @@
+"""
+Idempotency stores.
+
+Keep the responses of mutating requests sent with an Idempotency-Key so a
+retry gets the original response back instead of running again. Stores are
+either in-process (per worker) or any Redis-compatible server (shared).
+"""
+import base64
+import hashlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+import orjson
+from config import settings
+from services.cache import TTLCache
+
+# Prefix for keys in a shared Redis
+REDIS_KEY_PREFIX = "makana:idempotency:"
+
+# Marker stored while the first request with a key is still running
+_IN_FLIGHT = b"in-flight"
+
+
+@dataclass
+class StoredResponse:
+    """A completed response and the request it answered."""
+
+    fingerprint: str
+    status_code: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+    def dumps(self) -> bytes:
+        """Serialize for an external store."""
+        return orjson.dumps({
+            "fingerprint": self.fingerprint,
+            "status_code": self.status_code,
+            "headers": [[name.decode("latin-1"), value.decode("latin-1")] for name, value in self.headers],
+            "body": base64.b64encode(self.body).decode(),
+        })
+
+    @classmethod
+    def loads(cls, data: bytes) -> "StoredResponse":
+        """Deserialize a value written by dumps."""
+        fields = orjson.loads(data)
+        return cls(
+            fingerprint=fields["fingerprint"],
+            status_code=fields["status_code"],
+            headers=[(name.encode("latin-1"), value.encode("latin-1")) for name, value in fields["headers"]],
+            body=base64.b64decode(fields["body"]),
+        )
+
+
+def request_fingerprint(method: str, path: str, query: bytes, body: bytes) -> str:
+    """
+    Identify a request so a key reused for a different one can be refused.
+
+    Args:
+        method: HTTP method
+        path: Request path
+        query: Raw query string
+        body: Request body
+
+    Returns:
+        Hex SHA-256 digest of the request
+    """
+    digest = hashlib.sha256()
+    for part in (method.encode(), path.encode(), query, body):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class IdempotencyStore(ABC):
+    """Interface shared by the idempotency stores."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        """Get the stored response for a key, or None if there is none yet."""
+
+    @abstractmethod
+    async def claim(self, key: str) -> bool:
+        """
+        Reserve a key for a request about to run.
+
+        Returns:
+            True if the caller now owns the key, False if another request
+            holds it or already stored a response
+        """
+
+    @abstractmethod
+    async def save(self, key: str, response: StoredResponse) -> None:
+        """Store the response for a claimed key."""
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """Give up a claim without storing a response, so the key can be retried."""
+
+    async def aclose(self) -> None:
+        """Release connections held by the store."""
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """Idempotency store kept in the worker process."""
+
+    def __init__(self, maxsize: int, ttl: float, claim_ttl: float) -> None:
+        """
+        Initialize memory store.
+
+        Args:
+            maxsize: Maximum number of stored responses
+            ttl: Seconds a response is kept
+            claim_ttl: Seconds a claim is held if its request never finishes
+        """
+        self.responses: TTLCache[str, StoredResponse] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.claims: TTLCache[str, bool] = TTLCache(maxsize=maxsize, ttl=claim_ttl)
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        return self.responses.get(key)
+
+    async def claim(self, key: str) -> bool:
+        # No await between check and set, so this is atomic within the worker
+        if self.claims.get(key) or self.responses.get(key) is not None:
+            return False
+
+        self.claims.set(key, True)
+        return True
+
+    async def save(self, key: str, response: StoredResponse) -> None:
+        self.responses.set(key, response)
+        self.claims.pop(key)
+
+    async def release(self, key: str) -> None:
+        self.claims.pop(key)
+
+
+class RedisIdempotencyStore(IdempotencyStore):
+    """Idempotency store in a Redis-compatible server, shared by all workers."""
+
+    def __init__(
+        self,
+        ttl: float,
+        claim_ttl: float,
+        url: Optional[str] = None,
+        client: Optional[Any] = None
+    ) -> None:
+        """
+        Initialize Redis store.
+
+        Args:
+            ttl: Seconds a response is kept
+            claim_ttl: Seconds a claim is held if its request never finishes
+            url: Server URL, e.g. redis://redis:6379/0 (ignored with client)
+            client: Async client with get, set(nx=, px=) and delete
+
+        Raises:
+            RuntimeError: If no client is given and the redis package is missing
+        """
+        if client is None:
+            try:
+                from redis import asyncio as aioredis
+            except ImportError as e:
+                raise RuntimeError("IDEMPOTENCY_STORE=redis requires the redis package.") from e
+            client = aioredis.from_url(url)
+
+        self.client = client
+        self.ttl_ms = int(ttl * 1000)
+        self.claim_ttl_ms = int(claim_ttl * 1000)
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        value = await self.client.get(REDIS_KEY_PREFIX + key)
+        if value is None or value == _IN_FLIGHT:
+            return None
+        return StoredResponse.loads(value)
+
+    async def claim(self, key: str) -> bool:
+        return bool(await self.client.set(REDIS_KEY_PREFIX + key, _IN_FLIGHT, nx=True, px=self.claim_ttl_ms))
+
+    async def save(self, key: str, response: StoredResponse) -> None:
+        await self.client.set(REDIS_KEY_PREFIX + key, response.dumps(), px=self.ttl_ms)
+
+    async def release(self, key: str) -> None:
+        await self.client.delete(REDIS_KEY_PREFIX + key)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def create_idempotency_store() -> Optional[IdempotencyStore]:
+    """
+    Build the store selected by IDEMPOTENCY_STORE.
+
+    Returns:
+        Memory or Redis store, or None when idempotency keys are disabled
+
+    Raises:
+        ValueError: If IDEMPOTENCY_STORE is not memory, redis or off
+    """
+    kind = settings.idempotency_store.lower()
+
+    if kind == "off":
+        return None
+    if kind == "memory":
+        return MemoryIdempotencyStore(
+            maxsize=settings.idempotency_max_entries,
+            ttl=settings.idempotency_ttl,
+            claim_ttl=settings.idempotency_claim_ttl
+        )
+    if kind == "redis":
+        return RedisIdempotencyStore(
+            ttl=settings.idempotency_ttl,
+            claim_ttl=settings.idempotency_claim_ttl,
+            url=settings.redis_url
+        )
+
+    raise ValueError(f"Unknown IDEMPOTENCY_STORE {settings.idempotency_store!r}")
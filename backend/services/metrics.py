@@ -0,0 +1,306 @@
+"""
+Prometheus metrics.
+
+Minimal counters, gauges and histograms rendered in the Prometheus text
+exposition format. Updates happen on the event loop thread and are plain
+dict/list operations, so the hot path takes no locks; values are
+per worker process.
+"""
+import os
+import resource
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+# Request latencies from 5 ms to 10 s
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """Base class for a named metric family."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    @property
+    def family(self) -> str:
+        """Exposed family name (counters carry the _total suffix)."""
+        return f"{self.name}_total" if self.kind == "counter" else self.name
+
+    def _labels(self, labelvalues: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, labelvalues))
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render the family in the text exposition format."""
+        lines = [f"# HELP {self.family} {self.documentation}", f"# TYPE {self.family} {self.kind}"]
+        lines.extend(
+            f"{name}{_format_labels(labels)} {_format_value(value)}"
+            for name, labels, value in self.samples()
+        )
+        return "\n".join(lines)
+
+
+M = TypeVar("M", bound=Metric)
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        """Increase the counter for a label set."""
+        self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def samples(self) -> Iterable[Sample]:
+        for labelvalues, value in sorted(self._values.items()):
+            yield self.family, self._labels(labelvalues), value
+
+
+class Gauge(Metric):
+    """Value that can go up and down per label set."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def dec(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        self._values[labelvalues] = value
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def samples(self) -> Iterable[Sample]:
+        for labelvalues, value in sorted(self._values.items()):
+            yield self.name, self._labels(labelvalues), value
+
+
+class Histogram(Metric):
+    """Distribution of observations in fixed buckets per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (last is +Inf)..., sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """Record one observation for a label set."""
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = [0.0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, *labelvalues: str) -> int:
+        series = self._series.get(labelvalues)
+        return int(sum(series[:-1])) if series else 0
+
+    def samples(self) -> Iterable[Sample]:
+        for labelvalues, series in sorted(self._series.items()):
+            labels = self._labels(labelvalues)
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, series[-1]
+            yield f"{self.name}_count", labels, cumulative
+
+
+class CallbackGauge(Metric):
+    """Gauge (or counter) whose samples are read at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        read: Callable[[], Iterable[Tuple[Dict[str, str], float]]],
+        kind: str = "gauge"
+    ) -> None:
+        super().__init__(name, documentation)
+        self.kind = kind
+        self._read = read
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in self._read():
+            yield self.family, labels, value
+
+
+class Registry:
+    """Collection of metric families exposed together."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: M) -> M:
+        """Add a metric family (replacing one with the same name)."""
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render every family in the text exposition format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "makana_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+))
+http_requests_in_flight = registry.register(Gauge(
+    "makana_http_requests_in_flight",
+    "HTTP requests currently being handled.",
+))
+http_requests_in_flight.set(0)
+supabase_call_duration = registry.register(Histogram(
+    "makana_supabase_call_duration_seconds",
+    "Supabase call latency by table and operation.",
+    ("table", "operation"),
+))
+supabase_call_errors = registry.register(Counter(
+    "makana_supabase_call_errors",
+    "Supabase calls that failed or returned an error status.",
+    ("table", "operation"),
+))
+
+_STARTED = time.time()
+
+
+def _cpu_seconds() -> Iterable[Tuple[Dict[str, str], float]]:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    yield {}, usage.ru_utime + usage.ru_stime
+
+
+def _resident_memory() -> Iterable[Tuple[Dict[str, str], float]]:
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        yield {}, float(pages * os.sysconf("SC_PAGE_SIZE"))
+    except (OSError, ValueError):
+        # ru_maxrss is the peak (KiB on Linux), the closest portable figure
+        yield {}, float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+
+
+def _open_fds() -> Iterable[Tuple[Dict[str, str], float]]:
+    try:
+        yield {}, float(len(os.listdir("/proc/self/fd")))
+    except OSError:
+        return
+
+
+registry.register(CallbackGauge(
+    "process_cpu_seconds",
+    "Total user and system CPU time spent in seconds.",
+    _cpu_seconds,
+    kind="counter",
+))
+registry.register(CallbackGauge(
+    "process_resident_memory_bytes",
+    "Resident memory size in bytes.",
+    _resident_memory,
+))
+registry.register(CallbackGauge(
+    "process_open_fds",
+    "Number of open file descriptors.",
+    _open_fds,
+))
+registry.register(CallbackGauge(
+    "process_start_time_seconds",
+    "Start time of the process since the epoch in seconds.",
+    lambda: [({}, _STARTED)],
+))
+registry.register(CallbackGauge(
+    "makana_worker_info",
+    "Worker process identity.",
+    lambda: [({"pid": str(os.getpid())}, 1.0)],
+))
+
+
+def supabase_call_labels(method: str, path: str, prefer: str = "") -> Tuple[str, str]:
+    """
+    Derive (table, operation) labels for a Supabase request.
+
+    Args:
+        method: HTTP method
+        path: Request URL path
+        prefer: Prefer header (distinguishes upserts from inserts)
+
+    Returns:
+        Tuple of table (or RPC function / auth endpoint) and operation
+
+    Examples:
+        >>> supabase_call_labels("GET", "/rest/v1/sessions")
+        ('sessions', 'select')
+        >>> supabase_call_labels("POST", "/rest/v1/rpc/start_session")
+        ('start_session', 'rpc')
+    """
+    _, _, tail = path.partition("/rest/v1/")
+    if tail.startswith("rpc/"):
+        return tail[4:], "rpc"
+    if tail:
+        operation = {
+            "GET": "select",
+            "HEAD": "select",
+            "POST": "upsert" if "resolution=" in prefer else "insert",
+            "PATCH": "update",
+            "DELETE": "delete",
+        }.get(method, method.lower())
+        return tail, operation
+
+    _, _, endpoint = path.partition("/auth/v1/")
+    return "auth", endpoint or "other"
@@ -0,0 +1,138 @@
+"""
+Keyset pagination.
+
+Opaque cursors that seek past the last row of a page on (sort key, id), so
+each page is an index range read instead of an OFFSET scan.
+"""
+import base64
+import binascii
+import json
+import re
+from datetime import date
+from typing import Any, Callable, Optional, Protocol, Sequence, Tuple, TypeVar, Union
+from uuid import UUID
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class _Filterable(Protocol):
+    """The PostgREST filter builder methods seek_after uses."""
+
+    def lte(self: "Q", column: str, value: Any) -> "Q": ...
+
+    def or_(self: "Q", filters: str) -> "Q": ...
+
+
+class _Identified(Protocol):
+    """A row with an id, the cursor tie-breaker."""
+
+    @property
+    def id(self) -> Any: ...
+
+
+T = TypeVar("T", bound=_Identified)
+Q = TypeVar("Q", bound=_Filterable)
+
+# ISO date or timestamp, the only sort values cursors carry
+_SORT_VALUE = re.compile(r"[0-9][0-9T:.+\- ]*Z?")
+
+
+def encode_cursor(sort_value: Union[date, str], row_id: Union[UUID, str]) -> str:
+    """
+    Encode the position after a row.
+
+    Args:
+        sort_value: Row's sort column value (timestamp or date)
+        row_id: Row UUID used as tie-breaker
+
+    Returns:
+        URL-safe opaque cursor
+
+    Examples:
+        >>> encode_cursor("2024-01-15", "550e8400-e29b-41d4-a716-446655440000")
+        'WyIyMDI0LTAxLTE1IiwgIjU1MGU4NDAwLWUyOWItNDFkNC1hNzE2LTQ0NjY1NTQ0MDAwMCJd'
+    """
+    if isinstance(sort_value, date):
+        sort_value = sort_value.isoformat()
+
+    payload = json.dumps([sort_value, str(row_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor from a previous page
+
+    Returns:
+        Tuple of (sort value, row id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        row_id = str(UUID(str(row_id)))
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor.") from e
+
+    if not isinstance(sort_value, str) or not _SORT_VALUE.fullmatch(sort_value):
+        raise ValueError("Invalid cursor.")
+
+    return sort_value, row_id
+
+
+def seek_after(query: Q, sort_column: str, cursor: str) -> Q:
+    """
+    Restrict a descending (sort_column, id) query to rows after a cursor.
+
+    Args:
+        query: PostgREST select builder ordered by sort_column desc, id desc
+        sort_column: Column the query is sorted by
+        cursor: Opaque cursor from a previous page
+
+    Returns:
+        The query with the keyset filter applied
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    sort_value, row_id = decode_cursor(cursor)
+
+    # The OR alone cannot bound an index scan; the redundant upper bound on
+    # the sort column lets Postgres start the range read at the cursor.
+    # Quoted so timestamp punctuation is not read as PostgREST syntax.
+    return query.lte(sort_column, sort_value).or_(
+        f'{sort_column}.lt."{sort_value}",'
+        f'and({sort_column}.eq."{sort_value}",id.lt.{row_id})'
+    )
+
+
+def next_cursor(
+    rows: Sequence[T],
+    limit: int,
+    sort_key: Callable[[T], Any]
+) -> Optional[str]:
+    """
+    Cursor for the page after rows, or None when it was the last page.
+
+    A full page is assumed to have a successor; the following request may
+    then come back empty.
+
+    Args:
+        rows: Rows of the current page
+        limit: Page size that was requested
+        sort_key: Returns a row's sort column value
+
+    Returns:
+        Cursor for the next page, or None
+    """
+    if not rows or len(rows) < limit:
+        return None
+
+    last = rows[-1]
+    return encode_cursor(sort_key(last), last.id)
@@ -5,25 +5,30 @@ Manages capacity-aware state and adjusts session parameters.
 """
 import logging
 from typing import Optional
-from datetime import datetime
-from supabase import create_client, Client
-from config import settings
-from models.reduced_mode import ReducedModeState
+from services.supabase_client import SupabaseClient, columns, get_supabase_client
+from services.events import event_bus, REDUCED_MODE_CHANGED
+from services.user_state import UserStateCache, user_state, REDUCED_MODE
+from models.conversion import to_response
+from models.reduced_mode import ReducedModeState, ReducedModeResponse
 
 logger = logging.getLogger(__name__)
 
+REDUCED_MODE_COLUMNS = columns(ReducedModeState)
+
 
 class ReducedModeService:
     """Service for reduced mode management."""
     
-    def __init__(self) -> None:
-        """Initialize reduced mode service with Supabase client."""
-        self.supabase: Client = create_client(
-            settings.supabase_url,
-            settings.supabase_key
-        )
+    def __init__(
+        self,
+        supabase: Optional[SupabaseClient] = None,
+        state: Optional[UserStateCache] = None
+    ) -> None:
+        """Initialize reduced mode service with the shared Supabase client and state cache."""
+        self.supabase = supabase or get_supabase_client()
+        self.state = state or user_state
     
-    def activate_reduced_mode(self, user_id: str) -> ReducedModeState:
+    async def activate_reduced_mode(self, user_id: str) -> ReducedModeState:
         """
         Enable reduced mode with timestamp recording.
         
@@ -35,58 +40,22 @@ class ReducedModeService:
             
         Examples:
             >>> service = ReducedModeService()
-            >>> state = service.activate_reduced_mode(
+            >>> state = await service.activate_reduced_mode(
             ...     "550e8400-e29b-41d4-a716-446655440000"
             ... )
             >>> assert state.is_active == True
         """
         try:
-            # Get or create reduced mode state
-            existing = self.get_reduced_mode_state(user_id)
-            now = datetime.utcnow()
-            
-            if existing:
-                # Update existing state (idempotent)
-                if existing.is_active:
-                    logger.info(f"Reduced mode already active for user: {user_id}")
-                    return existing
-                
-                update_data = {
-                    "is_active": True,
-                    "activated_at": now.isoformat(),
-                    "updated_at": now.isoformat()
-                }
-                
-                result = self.supabase.table("reduced_mode_states").update(
-                    update_data
-                ).eq(
-                    "user_id", user_id
-                ).execute()
-                
-                logger.info(f"Reduced mode activated for user: {user_id}")
-                return ReducedModeState(**result.data[0])
-            
-            # Create new state
-            state_data = {
-                "user_id": user_id,
-                "is_active": True,
-                "activated_at": now.isoformat(),
-                "created_at": now.isoformat(),
-                "updated_at": now.isoformat()
-            }
-            
-            result = self.supabase.table("reduced_mode_states").insert(
-                state_data
-            ).execute()
-            
-            logger.info(f"Reduced mode state created and activated for user: {user_id}")
-            return ReducedModeState(**result.data[0])
+            state = await self._set_reduced_mode(user_id, True)
+            logger.info(f"Reduced mode activated for user: {user_id}")
+            return state
             
         except Exception as e:
+            self.state.invalidate(user_id, REDUCED_MODE)
             logger.error(f"Failed to activate reduced mode: {str(e)}")
             raise
     
-    def deactivate_reduced_mode(self, user_id: str) -> ReducedModeState:
+    async def deactivate_reduced_mode(self, user_id: str) -> ReducedModeState:
         """
         Disable reduced mode with timestamp recording.
         
@@ -98,61 +67,49 @@ class ReducedModeService:
             
         Examples:
             >>> service = ReducedModeService()
-            >>> state = service.deactivate_reduced_mode(
+            >>> state = await service.deactivate_reduced_mode(
             ...     "550e8400-e29b-41d4-a716-446655440000"
             ... )
             >>> assert state.is_active == False
         """
         try:
-            # Get or create reduced mode state
-            existing = self.get_reduced_mode_state(user_id)
-            now = datetime.utcnow()
-            
-            if existing:
-                # Update existing state (idempotent)
-                if not existing.is_active:
-                    logger.info(f"Reduced mode already inactive for user: {user_id}")
-                    return existing
-                
-                update_data = {
-                    "is_active": False,
-                    "deactivated_at": now.isoformat(),
-                    "updated_at": now.isoformat()
-                }
-                
-                result = self.supabase.table("reduced_mode_states").update(
-                    update_data
-                ).eq(
-                    "user_id", user_id
-                ).execute()
-                
-                logger.info(f"Reduced mode deactivated for user: {user_id}")
-                return ReducedModeState(**result.data[0])
-            
-            # Create new state (already inactive by default)
-            state_data = {
-                "user_id": user_id,
-                "is_active": False,
-                "deactivated_at": now.isoformat(),
-                "created_at": now.isoformat(),
-                "updated_at": now.isoformat()
-            }
-            
-            result = self.supabase.table("reduced_mode_states").insert(
-                state_data
-            ).execute()
-            
-            logger.info(f"Reduced mode state created (inactive) for user: {user_id}")
-            return ReducedModeState(**result.data[0])
+            state = await self._set_reduced_mode(user_id, False)
+            logger.info(f"Reduced mode deactivated for user: {user_id}")
+            return state
             
         except Exception as e:
+            self.state.invalidate(user_id, REDUCED_MODE)
             logger.error(f"Failed to deactivate reduced mode: {str(e)}")
             raise
     
-    def get_reduced_mode_state(self, user_id: str) -> Optional[ReducedModeState]:
+    async def _set_reduced_mode(self, user_id: str, is_active: bool) -> ReducedModeState:
+        """
+        Upsert the user's state in one call (see set_reduced_mode() in
+        migrations/006_reduced_mode_upsert_rpc.sql).
+        
+        Creates the row on first use; toggling to the current state is a
+        no-op that returns the stored row. Only a toggle that wrote the row
+        is published to the user's other devices.
+        """
+        result = await self.supabase.rpc("set_reduced_mode", {
+            "p_user_id": user_id,
+            "p_is_active": is_active
+        }).execute()
+        
+        row = result.data[0]
+        state = ReducedModeState(**row["state"])
+        self.state.set(user_id, REDUCED_MODE, state)
+        
+        if row["changed"]:
+            event_bus.publish(user_id, REDUCED_MODE_CHANGED, to_response(ReducedModeResponse, state))
+        return state
+    
+    async def get_reduced_mode_state(self, user_id: str) -> Optional[ReducedModeState]:
         """
         Get current reduced mode state.
         
+        Read through the user state cache.
+        
         Args:
             user_id: User UUID
             
@@ -160,18 +117,36 @@ class ReducedModeService:
             ReducedModeState if found, None otherwise
         """
         try:
-            result = self.supabase.table("reduced_mode_states").select("*").eq(
-                "user_id", user_id
-            ).execute()
-            
-            if result.data:
-                return ReducedModeState(**result.data[0])
-            
-            return None
+            return await self.fetch_reduced_mode_state(user_id)
             
         except Exception as e:
             logger.error(f"Failed to get reduced mode state: {str(e)}")
             return None
+    
+    async def fetch_reduced_mode_state(self, user_id: str) -> Optional[ReducedModeState]:
+        """
+        Get the reduced mode state, raising if it cannot be read.
+        
+        Same read as get_reduced_mode_state, for callers that must tell "none"
+        from "could not load" (the dashboard's failure policy).
+        
+        Raises:
+            Exception: If the database read fails
+        """
+        return await self.state.get_or_load(
+            user_id, REDUCED_MODE, lambda: self._load_state(user_id)
+        )
+    
+    async def _load_state(self, user_id: str) -> Optional[ReducedModeState]:
+        """Query the stored state (errors propagate, so they are not cached)."""
+        result = await self.supabase.table("reduced_mode_states").select(REDUCED_MODE_COLUMNS).eq(
+            "user_id", user_id
+        ).execute()
+        
+        if result.data:
+            return ReducedModeState(**result.data[0])
+        
+        return None
 
 
 # Global reduced mode service instance
@@ -0,0 +1,91 @@
+"""
+Request context.
+
+Per-request state (request ID and downstream call timings) carried through
+async code with a context variable.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional
+
+
+@dataclass
+class CallStats:
+    """Count and cumulative duration of one kind of downstream call."""
+
+    count: int = 0
+    duration_ms: float = 0.0
+
+
+@dataclass
+class RequestMetrics:
+    """Timings collected while one request is handled."""
+
+    request_id: str
+    calls: Dict[str, CallStats] = field(default_factory=dict)
+
+    def record(self, kind: str, duration_ms: float) -> None:
+        """
+        Record one downstream call.
+
+        Args:
+            kind: Call category (e.g. "db", "rpc", "auth")
+            duration_ms: Time the call took
+        """
+        stats = self.calls.setdefault(kind, CallStats())
+        stats.count += 1
+        stats.duration_ms += duration_ms
+
+    @property
+    def call_count(self) -> int:
+        """Total downstream calls."""
+        return sum(stats.count for stats in self.calls.values())
+
+    @property
+    def call_duration_ms(self) -> float:
+        """Cumulative downstream time (concurrent calls overlap)."""
+        return sum(stats.duration_ms for stats in self.calls.values())
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def current_request() -> Optional[RequestMetrics]:
+    """
+    Get metrics for the request being handled.
+
+    Returns:
+        RequestMetrics, or None outside a request
+    """
+    return _current.get()
+
+
+def current_request_id() -> Optional[str]:
+    """
+    Get the ID of the request being handled.
+
+    Returns:
+        Request ID, or None outside a request
+    """
+    metrics = _current.get()
+    return metrics.request_id if metrics is not None else None
+
+
+@contextmanager
+def request_scope(request_id: str) -> Iterator[RequestMetrics]:
+    """
+    Collect metrics for a request within the current context.
+
+    Args:
+        request_id: Request identifier
+
+    Yields:
+        RequestMetrics visible to every task the request spawns
+    """
+    metrics = RequestMetrics(request_id=request_id)
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
@@ -15,6 +15,9 @@ def calculate_session_duration(setup: Setup, reduced_mode: bool) -> int:
     """
     Determine session duration in minutes based on setup and reduced mode.
     
+    Mirrored by the start_session() database function
+    (migrations/002_start_session_rpc.sql); keep both in sync.
+    
     Args:
         setup: The active setup configuration
         reduced_mode: Whether reduced mode is currently active
@@ -4,28 +4,45 @@ Session service.
 Manages Ignition/Braking lifecycle, prevents concurrent sessions, tracks history.
 """
 import logging
-from typing import Optional, List
-from datetime import datetime
-from supabase import create_client, Client
-from config import settings
-from models.session import Session, SessionCreate, SessionEnd
-from models.setup import Setup
-from services.rules_engine import calculate_session_duration
+from typing import List, NoReturn, Optional
+from postgrest.exceptions import APIError
+from services.supabase_client import SupabaseClient, columns, get_supabase_client
+from services.pagination import decode_cursor, seek_after
+from services.events import event_bus, SESSION_STARTED, SESSION_ENDED, SESSION_ABANDONED
+from services.user_state import UserStateCache, user_state, ACTIVE_SESSION
+from pydantic import TypeAdapter
+from models.conversion import to_response
+from models.session import Session, SessionCreate, SessionEnd, SessionResponse, SessionWithSetup
+from models.setup import SetupSummary
 
 logger = logging.getLogger(__name__)
 
+# Postgres error codes raised by the session functions
+UNIQUE_VIOLATION = "23505"
+NO_DATA_FOUND = "P0002"
+INVALID_PARAMETER_VALUE = "22023"
+INVALID_TEXT_REPRESENTATION = "22P02"  # malformed session UUID
+
+SESSION_COLUMNS = columns(Session)
+# Listings embed each session's setup (PostgREST follows sessions.setup_id)
+SESSION_WITH_SETUP_COLUMNS = f"{SESSION_COLUMNS},setup:setups({columns(SetupSummary)})"
+# Validates a list of rows in one pydantic-core call
+SESSION_LIST = TypeAdapter(List[SessionWithSetup])
+
 
 class SessionService:
     """Service for session management."""
     
-    def __init__(self) -> None:
-        """Initialize session service with Supabase client."""
-        self.supabase: Client = create_client(
-            settings.supabase_url,
-            settings.supabase_key
-        )
+    def __init__(
+        self,
+        supabase: Optional[SupabaseClient] = None,
+        state: Optional[UserStateCache] = None
+    ) -> None:
+        """Initialize session service with the shared Supabase client and state cache."""
+        self.supabase = supabase or get_supabase_client()
+        self.state = state or user_state
     
-    def start_session(
+    async def start_session(
         self,
         user_id: str,
         session_data: SessionCreate
@@ -33,6 +50,9 @@ class SessionService:
         """
         Start new session with concurrent session prevention.
         
+        Runs as a single call to the start_session() database function,
+        which resolves the duration and inserts atomically.
+        
         Args:
             user_id: User UUID
             session_data: Session creation data
@@ -41,71 +61,49 @@ class SessionService:
             Created Session
             
         Raises:
-            Exception: If active session already exists
+            Exception: If active session already exists or setup not found
             
         Examples:
             >>> service = SessionService()
-            >>> session = service.start_session(
+            >>> session = await service.start_session(
             ...     "550e8400-e29b-41d4-a716-446655440000",
             ...     SessionCreate(setup_id="00000000-0000-0000-0000-000000000001")
             ... )
             >>> assert session.status == "active"
         """
         try:
-            # Check for existing active session
-            active_session = self.get_active_session(user_id)
-            if active_session:
-                logger.warning(f"User {user_id} already has active session")
-                raise Exception("Unable to start right now. Try again in a moment.")
-            
-            # Get setup for duration calculation
-            setup_result = self.supabase.table("setups").select("*").eq(
-                "id", str(session_data.setup_id)
-            ).execute()
-            
-            if not setup_result.data:
-                raise Exception("Setup not found.")
-            
-            setup = Setup(**setup_result.data[0])
-            
-            # Get reduced mode state
-            reduced_mode_result = self.supabase.table("reduced_mode_states").select("*").eq(
-                "user_id", user_id
-            ).execute()
-            
-            reduced_mode_active = False
-            if reduced_mode_result.data:
-                reduced_mode_active = reduced_mode_result.data[0].get("is_active", False)
-            
-            # Calculate duration
-            duration = calculate_session_duration(setup, reduced_mode_active)
-            
-            # Create new session
-            now = datetime.utcnow()
-            session_record = {
-                "user_id": user_id,
-                "setup_id": str(session_data.setup_id),
-                "start_time": now.isoformat(),
-                "status": "active",
-                "reduced_mode_active": reduced_mode_active,
-                "duration_minutes": duration,
-                "created_at": now.isoformat(),
-                "updated_at": now.isoformat()
-            }
-            
-            result = self.supabase.table("sessions").insert(
-                session_record
-            ).execute()
+            # Active-session check, duration rules and insert run atomically
+            # in one call (see migrations/002_start_session_rpc.sql)
+            result = await self.supabase.rpc("start_session", {
+                "p_user_id": user_id,
+                "p_setup_id": str(session_data.setup_id)
+            }).execute()
             
             logger.info(f"Session started for user: {user_id}")
             
-            return Session(**result.data[0])
+            session = Session(**result.data[0])
+            self.state.set(user_id, ACTIVE_SESSION, session)
+            event_bus.publish(user_id, SESSION_STARTED, to_response(SessionResponse, session))
+            return session
+            
+        except APIError as e:
+            # A rejected write suggests the cached state is stale
+            self.state.invalidate(user_id, ACTIVE_SESSION)
+            if e.code == UNIQUE_VIOLATION:
+                logger.warning(f"User {user_id} already has active session")
+                raise Exception("Unable to start right now. Try again in a moment.")
+            if e.code == NO_DATA_FOUND:
+                raise Exception("Setup not found.")
             
+            logger.error(f"Failed to start session: {e.message}")
+            raise
         except Exception as e:
+            # The write may have committed before the failure
+            self.state.invalidate(user_id, ACTIVE_SESSION)
             logger.error(f"Failed to start session: {str(e)}")
             raise
     
-    def end_session(
+    async def end_session(
         self,
         session_id: str,
         user_id: str,
@@ -114,6 +112,9 @@ class SessionService:
         """
         End session with duration calculation and next step capture.
         
+        Runs as a single conditional update in the end_session() database
+        function, so a session can only be ended (or abandoned) once.
+        
         Args:
             session_id: Session UUID
             user_id: User UUID (for authorization)
@@ -126,55 +127,36 @@ class SessionService:
             Exception: If session not found or not active
         """
         try:
-            # Get session
-            session_result = self.supabase.table("sessions").select("*").eq(
-                "id", session_id
-            ).eq(
-                "user_id", user_id
-            ).execute()
-            
-            if not session_result.data:
-                raise Exception("Session not found.")
-            
-            session = session_result.data[0]
-            
-            if session["status"] != "active":
-                raise Exception("Session is not active.")
-            
-            # Calculate duration
-            now = datetime.utcnow()
-            start_time = datetime.fromisoformat(session["start_time"].replace('Z', '+00:00'))
-            duration_minutes = int((now - start_time).total_seconds() / 60)
-            
-            # Update session
-            update_data = {
-                "end_time": now.isoformat(),
-                "duration_minutes": duration_minutes,
-                "status": "completed",
-                "updated_at": now.isoformat()
-            }
-            
-            if end_data.next_step:
-                update_data["next_step"] = end_data.next_step
-            
-            result = self.supabase.table("sessions").update(
-                update_data
-            ).eq(
-                "id", session_id
-            ).execute()
+            # Active check, duration and update in one statement
+            # (see migrations/005_session_transitions_rpc.sql)
+            result = await self.supabase.rpc("end_session", {
+                "p_user_id": user_id,
+                "p_session_id": session_id,
+                "p_next_step": end_data.next_step
+            }).execute()
             
             logger.info(f"Session ended: {session_id}")
             
-            return Session(**result.data[0])
+            session = Session(**result.data[0])
+            self.state.set(user_id, ACTIVE_SESSION, None)
+            event_bus.publish(user_id, SESSION_ENDED, to_response(SessionResponse, session))
+            return session
             
+        except APIError as e:
+            self.state.invalidate(user_id, ACTIVE_SESSION)
+            self._raise_transition_error(e, "end")
         except Exception as e:
+            self.state.invalidate(user_id, ACTIVE_SESSION)
             logger.error(f"Failed to end session: {str(e)}")
             raise
     
-    def get_active_session(self, user_id: str) -> Optional[Session]:
+    async def get_active_session(self, user_id: str) -> Optional[Session]:
         """
         Find active session for user (at most one).
         
+        Read through the user state cache, which also remembers that there
+        is none.
+        
         Args:
             user_id: User UUID
             
@@ -182,22 +164,55 @@ class SessionService:
             Active Session if found, None otherwise
         """
         try:
-            result = self.supabase.table("sessions").select("*").eq(
-                "user_id", user_id
-            ).eq(
-                "status", "active"
-            ).execute()
-            
-            if result.data:
-                return Session(**result.data[0])
-            
-            return None
+            return await self.fetch_active_session(user_id)
             
         except Exception as e:
             logger.error(f"Failed to get active session: {str(e)}")
             return None
     
-    def abandon_session(
+    async def fetch_active_session(self, user_id: str) -> Optional[Session]:
+        """
+        Find the active session, raising if it cannot be read.
+        
+        Same read as get_active_session, for callers that must tell "none"
+        from "could not load" (the dashboard's failure policy).
+        
+        Raises:
+            Exception: If the database read fails
+        """
+        return await self.state.get_or_load(
+            user_id, ACTIVE_SESSION, lambda: self._load_active_session(user_id)
+        )
+    
+    async def _load_active_session(self, user_id: str) -> Optional[Session]:
+        """Query the active session (errors propagate, so they are not cached)."""
+        result = await self.supabase.table("sessions").select(SESSION_COLUMNS).eq(
+            "user_id", user_id
+        ).eq(
+            "status", "active"
+        ).execute()
+        
+        if result.data:
+            return Session(**result.data[0])
+        
+        return None
+    
+    async def has_active_session(self, user_id: str) -> bool:
+        """
+        Fast boolean check if user has an active session.
+        
+        Answered from the user state cache when the active session is known,
+        so it usually costs no query.
+        
+        Args:
+            user_id: User UUID
+            
+        Returns:
+            True if an active session exists, False otherwise
+        """
+        return await self.get_active_session(user_id) is not None
+    
+    async def abandon_session(
         self,
         session_id: str,
         user_id: str
@@ -205,6 +220,9 @@ class SessionService:
         """
         Mark session as abandoned without penalty.
         
+        Runs as a single conditional update in the abandon_session()
+        database function.
+        
         Args:
             session_id: Session UUID
             user_id: User UUID (for authorization)
@@ -216,69 +234,82 @@ class SessionService:
             Exception: If session not found or not active
         """
         try:
-            # Get session
-            session_result = self.supabase.table("sessions").select("*").eq(
-                "id", session_id
-            ).eq(
-                "user_id", user_id
-            ).execute()
-            
-            if not session_result.data:
-                raise Exception("Session not found.")
-            
-            session = session_result.data[0]
-            
-            if session["status"] != "active":
-                raise Exception("Session is not active.")
-            
-            # Update session
-            now = datetime.utcnow()
-            update_data = {
-                "status": "abandoned",
-                "updated_at": now.isoformat()
-            }
-            
-            result = self.supabase.table("sessions").update(
-                update_data
-            ).eq(
-                "id", session_id
-            ).execute()
+            result = await self.supabase.rpc("abandon_session", {
+                "p_user_id": user_id,
+                "p_session_id": session_id
+            }).execute()
             
             logger.info(f"Session abandoned: {session_id}")
             
-            return Session(**result.data[0])
+            session = Session(**result.data[0])
+            self.state.set(user_id, ACTIVE_SESSION, None)
+            event_bus.publish(user_id, SESSION_ABANDONED, to_response(SessionResponse, session))
+            return session
             
+        except APIError as e:
+            self.state.invalidate(user_id, ACTIVE_SESSION)
+            self._raise_transition_error(e, "abandon")
         except Exception as e:
+            self.state.invalidate(user_id, ACTIVE_SESSION)
             logger.error(f"Failed to abandon session: {str(e)}")
             raise
     
-    def get_recent_sessions(
+    def _raise_transition_error(self, error: APIError, action: str) -> NoReturn:
+        """Map an end_session()/abandon_session() error to the service's messages."""
+        if error.code in (NO_DATA_FOUND, INVALID_TEXT_REPRESENTATION):
+            raise Exception("Session not found.")
+        if error.code == INVALID_PARAMETER_VALUE:
+            raise Exception("Session is not active.")
+        
+        logger.error(f"Failed to {action} session: {error.message}")
+        raise error
+    
+    async def get_recent_sessions(
         self,
         user_id: str,
         limit: int = 30,
-        offset: int = 0
-    ) -> List[Session]:
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> List[SessionWithSetup]:
         """
-        Get recent sessions with pagination.
+        Get recent sessions with pagination, each with its setup embedded.
+        
+        Pages either by offset or, when a cursor is given, by seeking past
+        the last (created_at, id) seen so each page is an index range read.
         
         Args:
             user_id: User UUID
             limit: Maximum number of sessions to return
-            offset: Number of sessions to skip
+            offset: Number of sessions to skip (ignored with a cursor)
+            cursor: Opaque cursor from the previous page
             
         Returns:
-            List of Session in reverse chronological order
+            List of SessionWithSetup in reverse chronological order
+            
+        Raises:
+            ValueError: If the cursor is malformed
         """
+        # Decoded up front so a bad cursor is reported, not read as no rows
+        if cursor is not None:
+            decode_cursor(cursor)
+        
         try:
-            result = self.supabase.table("sessions").select("*").eq(
+            query = self.supabase.table("sessions").select(SESSION_WITH_SETUP_COLUMNS).eq(
                 "user_id", user_id
             ).order(
                 "created_at", desc=True
-            ).range(
-                offset, offset + limit - 1
-            ).execute()
+            ).order(
+                "id", desc=True
+            )
+            
+            if cursor is not None:
+                query = seek_after(query, "created_at", cursor).limit(limit)
+            else:
+                query = query.range(offset, offset + limit - 1)
+            
+            result = await query.execute()
             
-            return [Session(**session) for session in result.data]
+            return SESSION_LIST.validate_python(result.data)
             
         except Exception as e:
             logger.error(f"Failed to get recent sessions: {str(e)}")
@@ -3,27 +3,153 @@ Setup service.
 
 Manages preset configurations and user setup activation.
 """
+import asyncio
+import hashlib
+import json
 import logging
-from typing import List, Optional, Dict, Any
+import time
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Dict, Any, Tuple
 from datetime import datetime
-from supabase import create_client, Client
 from config import settings
+from services.supabase_client import SupabaseClient, columns, get_supabase_client
+from services.user_state import UserStateCache, user_state, ACTIVE_SETUP
+from pydantic import TypeAdapter
 from models.setup import Setup, UserSetup, SetupActivate
 
 logger = logging.getLogger(__name__)
 
+# Seconds to keep serving a stale catalogue before retrying a failed reload
+CATALOGUE_RETRY_SECONDS = 30.0
+
+SETUP_COLUMNS = columns(Setup)
+# The latest activation with its setup embedded (follows user_setups.setup_id)
+ACTIVE_SETUP_COLUMNS = f"setup:setups({SETUP_COLUMNS})"
+# Validates a list of rows in one pydantic-core call
+SETUP_LIST = TypeAdapter(List[Setup])
+
+
+@dataclass(frozen=True)
+class SetupCatalogue:
+    """Immutable snapshot of the setups table, indexed by id and name."""
+    
+    setups: Tuple[Setup, ...]
+    by_id: Mapping[str, Setup]
+    by_name: Mapping[str, Setup]
+    etag: str
+    expires_at: float
+    
+    @classmethod
+    def build(cls, setups: List[Setup], ttl: float) -> "SetupCatalogue":
+        """
+        Build catalogue with indexes and a strong ETag over its contents.
+        
+        Args:
+            setups: Setups ordered by name
+            ttl: Seconds until the catalogue should be reloaded
+            
+        Returns:
+            New SetupCatalogue
+        """
+        body = json.dumps(
+            [setup.model_dump(mode="json") for setup in setups],
+            sort_keys=True
+        )
+        
+        return cls(
+            setups=tuple(setups),
+            by_id=MappingProxyType({str(setup.id): setup for setup in setups}),
+            by_name=MappingProxyType({setup.name: setup for setup in setups}),
+            etag=f'"{hashlib.sha256(body.encode()).hexdigest()}"',
+            expires_at=time.monotonic() + ttl
+        )
+    
+    def is_expired(self) -> bool:
+        """Check whether the catalogue is past its TTL."""
+        return time.monotonic() >= self.expires_at
+
 
 class SetupService:
     """Service for setup management."""
     
-    def __init__(self) -> None:
-        """Initialize setup service with Supabase client."""
-        self.supabase: Client = create_client(
-            settings.supabase_url,
-            settings.supabase_key
+    def __init__(
+        self,
+        supabase: Optional[SupabaseClient] = None,
+        state: Optional[UserStateCache] = None
+    ) -> None:
+        """Initialize setup service with the shared Supabase client and state cache."""
+        self.supabase = supabase or get_supabase_client()
+        self.state = state or user_state
+        self.catalogue_ttl = settings.setup_catalogue_ttl
+        self._catalogue: Optional[SetupCatalogue] = None
+        self._catalogue_lock = asyncio.Lock()
+    
+    async def get_catalogue(self) -> SetupCatalogue:
+        """
+        Return the in-memory setups catalogue, reloading it after the TTL.
+        
+        If a reload fails, the previous catalogue keeps being served.
+        
+        Returns:
+            Current SetupCatalogue
+            
+        Raises:
+            Exception: If the catalogue has never been loaded and loading fails
+        """
+        catalogue = self._catalogue
+        if catalogue is not None and not catalogue.is_expired():
+            return catalogue
+        
+        async with self._catalogue_lock:
+            # Another request may have reloaded while we waited
+            catalogue = self._catalogue
+            if catalogue is not None and not catalogue.is_expired():
+                return catalogue
+            
+            try:
+                return await self._load_catalogue()
+            except Exception as e:
+                if catalogue is None:
+                    raise
+                
+                logger.warning(f"Setup catalogue reload failed, serving previous: {str(e)}")
+                self._catalogue = replace(
+                    catalogue,
+                    expires_at=time.monotonic() + CATALOGUE_RETRY_SECONDS
+                )
+                return self._catalogue
+    
+    @property
+    def catalogue_etag(self) -> Optional[str]:
+        """ETag of the loaded catalogue, if any."""
+        return self._catalogue.etag if self._catalogue else None
+    
+    async def refresh_catalogue(self) -> SetupCatalogue:
+        """
+        Reload the setups catalogue now (startup and admin refresh).
+        
+        Returns:
+            Reloaded SetupCatalogue
+        """
+        async with self._catalogue_lock:
+            return await self._load_catalogue()
+    
+    async def _load_catalogue(self) -> SetupCatalogue:
+        """Fetch all setups and swap in a new catalogue."""
+        result = await self.supabase.table("setups").select(SETUP_COLUMNS).order("name").execute()
+        
+        catalogue = SetupCatalogue.build(
+            SETUP_LIST.validate_python(result.data),
+            self.catalogue_ttl
         )
+        self._catalogue = catalogue
+        
+        logger.info(f"Setup catalogue loaded: {len(catalogue.setups)} setups")
+        
+        return catalogue
     
-    def get_available_setups(self) -> List[Setup]:
+    async def get_available_setups(self) -> List[Setup]:
         """
         Return all preset setups.
         
@@ -32,21 +158,19 @@ class SetupService:
             
         Examples:
             >>> service = SetupService()
-            >>> setups = service.get_available_setups()
+            >>> setups = await service.get_available_setups()
             >>> assert len(setups) == 3  # Calm, Reduced, Vitality
         """
         try:
-            result = self.supabase.table("setups").select("*").eq(
-                "is_preset", True
-            ).order("name").execute()
+            catalogue = await self.get_catalogue()
             
-            return [Setup(**setup) for setup in result.data]
+            return [setup for setup in catalogue.setups if setup.is_preset]
             
         except Exception as e:
             logger.error(f"Failed to get available setups: {str(e)}")
             return []
     
-    def activate_setup(
+    async def activate_setup(
         self,
         user_id: str,
         setup_data: SetupActivate
@@ -66,7 +190,7 @@ class SetupService:
             
         Examples:
             >>> service = SetupService()
-            >>> user_setup = service.activate_setup(
+            >>> user_setup = await service.activate_setup(
             ...     "550e8400-e29b-41d4-a716-446655440000",
             ...     SetupActivate(setup_id="00000000-0000-0000-0000-000000000001")
             ... )
@@ -74,11 +198,9 @@ class SetupService:
         """
         try:
             # Verify setup exists
-            setup_result = self.supabase.table("setups").select("*").eq(
-                "id", str(setup_data.setup_id)
-            ).execute()
+            catalogue = await self.get_catalogue()
             
-            if not setup_result.data:
+            if str(setup_data.setup_id) not in catalogue.by_id:
                 raise Exception("Setup not found.")
             
             # Create user setup record
@@ -90,22 +212,28 @@ class SetupService:
                 "created_at": now.isoformat()
             }
             
-            result = self.supabase.table("user_setups").insert(
+            result = await self.supabase.table("user_setups").insert(
                 user_setup_data
             ).execute()
             
             logger.info(f"Setup activated for user {user_id}: {setup_data.setup_id}")
             
+            self.state.set(user_id, ACTIVE_SETUP, catalogue.by_id[str(setup_data.setup_id)])
             return UserSetup(**result.data[0])
             
         except Exception as e:
+            self.state.invalidate(user_id, ACTIVE_SETUP)
             logger.error(f"Failed to activate setup: {str(e)}")
             raise
     
-    def get_active_setup(self, user_id: str) -> Optional[Setup]:
+    async def get_active_setup(self, user_id: str) -> Optional[Setup]:
         """
         Get current active setup for user.
         
+        Read through the user state cache. On a miss it is one query: the
+        newest activation is an idx_user_setups_user_activated range read,
+        and its setup row comes back embedded in it.
+        
         Args:
             user_id: User UUID
             
@@ -113,34 +241,43 @@ class SetupService:
             Active Setup if found, None otherwise (defaults to Calm)
         """
         try:
-            # Get most recent user setup
-            user_setup_result = self.supabase.table("user_setups").select("*").eq(
-                "user_id", user_id
-            ).order(
-                "activated_at", desc=True
-            ).limit(1).execute()
-            
-            if not user_setup_result.data:
-                # Return default Calm setup if no activation found
-                return self.get_setup_by_name("Calm")
-            
-            setup_id = user_setup_result.data[0]["setup_id"]
-            
-            # Get setup details
-            setup_result = self.supabase.table("setups").select("*").eq(
-                "id", setup_id
-            ).execute()
-            
-            if setup_result.data:
-                return Setup(**setup_result.data[0])
-            
-            return None
+            return await self.fetch_active_setup(user_id)
             
         except Exception as e:
             logger.error(f"Failed to get active setup: {str(e)}")
             return None
     
-    def get_setup_by_name(self, name: str) -> Optional[Setup]:
+    async def fetch_active_setup(self, user_id: str) -> Optional[Setup]:
+        """
+        Get the active setup, raising if it cannot be read.
+        
+        Same read as get_active_setup, for callers that must tell "none"
+        from "could not load" (the dashboard's failure policy).
+        
+        Raises:
+            Exception: If the database read fails
+        """
+        return await self.state.get_or_load(
+            user_id, ACTIVE_SETUP, lambda: self._load_active_setup(user_id)
+        )
+    
+    async def _load_active_setup(self, user_id: str) -> Optional[Setup]:
+        """Query the active setup (errors propagate, so they are not cached)."""
+        # Get most recent user setup, with the setup itself
+        result = await self.supabase.table("user_setups").select(ACTIVE_SETUP_COLUMNS).eq(
+            "user_id", user_id
+        ).order(
+            "activated_at", desc=True
+        ).limit(1).execute()
+        
+        if not result.data:
+            # Return default Calm setup if no activation found
+            catalogue = await self.get_catalogue()
+            return catalogue.by_name.get("Calm")
+        
+        return Setup(**result.data[0]["setup"])
+    
+    async def get_setup_by_name(self, name: str) -> Optional[Setup]:
         """
         Get setup by name.
         
@@ -151,20 +288,15 @@ class SetupService:
             Setup if found, None otherwise
         """
         try:
-            result = self.supabase.table("setups").select("*").eq(
-                "name", name
-            ).execute()
+            catalogue = await self.get_catalogue()
             
-            if result.data:
-                return Setup(**result.data[0])
-            
-            return None
+            return catalogue.by_name.get(name)
             
         except Exception as e:
             logger.error(f"Failed to get setup by name: {str(e)}")
             return None
     
-    def get_setup_defaults(self, setup_id: str) -> Dict[str, Any]:
+    async def get_setup_defaults(self, setup_id: str) -> Dict[str, Any]:
         """
         Get default parameters for a setup.
         
@@ -175,16 +307,14 @@ class SetupService:
             Dictionary with setup parameters
         """
         try:
-            result = self.supabase.table("setups").select("*").eq(
-                "id", setup_id
-            ).execute()
+            catalogue = await self.get_catalogue()
+            setup = catalogue.by_id.get(setup_id)
             
-            if result.data:
-                setup = result.data[0]
+            if setup:
                 return {
-                    "duration": setup["default_session_duration"],
-                    "emphasis": setup["emphasis"],
-                    "name": setup["name"]
+                    "duration": setup.default_session_duration,
+                    "emphasis": setup.emphasis,
+                    "name": setup.name
                 }
             
             return {}
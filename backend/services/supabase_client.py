@@ -0,0 +1,322 @@
+"""
+Supabase client.
+
+Async data-access layer shared by all services (PostgREST + GoTrue) over
+one process-wide, pooled HTTP client.
+"""
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+import httpx
+from gotrue import AsyncGoTrueClient
+from postgrest import AsyncPostgrestClient
+from postgrest._async.request_builder import AsyncRequestBuilder, AsyncRPCFilterRequestBuilder
+from pydantic import BaseModel
+from config import settings
+from services import metrics
+from services.request_context import current_request
+
+logger = logging.getLogger(__name__)
+
+
+def call_kind(url: httpx.URL) -> str:
+    """
+    Categorize a Supabase request for per-request timing.
+
+    Args:
+        url: Request URL
+
+    Returns:
+        "rpc", "db" or "auth" (or "other")
+    """
+    path = url.path
+    if "/rest/v1/rpc/" in path:
+        return "rpc"
+    if "/rest/v1/" in path:
+        return "db"
+    if "/auth/v1/" in path:
+        return "auth"
+    return "other"
+
+
+class PoolStatsTransport(httpx.AsyncBaseTransport):
+    """HTTP transport that records connection pool usage and per-request call timings."""
+
+    def __init__(self, limits: httpx.Limits, http2: bool) -> None:
+        """
+        Initialize pooled transport.
+
+        Args:
+            limits: Connection pool limits
+            http2: Whether to negotiate HTTP/2
+        """
+        self._transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+        self.max_connections = limits.max_connections
+        self.requests_total = 0
+        self.in_flight = 0
+        self.pool_wait_total = 0.0
+        self.pool_wait_max = 0.0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send request, measuring time spent waiting for a pooled connection."""
+        started = time.perf_counter()
+        acquired: Optional[float] = None
+        inner_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            # The first connection-level event marks the end of the pool wait
+            nonlocal acquired
+            if acquired is None:
+                acquired = time.perf_counter()
+            if inner_trace is not None:
+                await inner_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        self.requests_total += 1
+        self.in_flight += 1
+        failed = True
+
+        try:
+            response = await self._transport.handle_async_request(request)
+            failed = response.status_code >= 400
+            return response
+        finally:
+            finished = time.perf_counter()
+            self.in_flight -= 1
+            wait = (acquired or finished) - started
+            self.pool_wait_total += wait
+            self.pool_wait_max = max(self.pool_wait_max, wait)
+
+            # Durations run until response headers arrive
+            labels = metrics.supabase_call_labels(
+                request.method, request.url.path, request.headers.get("prefer", "")
+            )
+            metrics.supabase_call_duration.observe(finished - started, *labels)
+            if failed:
+                metrics.supabase_call_errors.inc(*labels)
+
+            # Attribute the call to the API request being handled
+            request_metrics = current_request()
+            if request_metrics is not None:
+                request_metrics.record(call_kind(request.url), (finished - started) * 1000)
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._transport.aclose()
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Snapshot pool usage.
+
+        Returns:
+            Dictionary with connection counts and pool wait times
+        """
+        # httpx does not expose its connection pool publicly
+        connections = self._transport._pool.connections
+        open_connections = sum(1 for c in connections if not c.is_closed())
+        idle_connections = sum(1 for c in connections if c.is_idle())
+        wait_avg = self.pool_wait_total / self.requests_total if self.requests_total else 0.0
+
+        return {
+            "max_connections": self.max_connections,
+            "open_connections": open_connections,
+            "idle_connections": idle_connections,
+            "in_flight_requests": self.in_flight,
+            "requests_total": self.requests_total,
+            "pool_wait_ms_avg": round(wait_avg * 1000, 3),
+            "pool_wait_ms_max": round(self.pool_wait_max * 1000, 3),
+        }
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Build the pooled HTTP client from settings.
+
+    Returns:
+        AsyncClient with configured limits, HTTP/2, keep-alive and timeouts
+    """
+    limits = httpx.Limits(
+        max_connections=settings.supabase_max_connections,
+        max_keepalive_connections=settings.supabase_max_keepalive_connections,
+        keepalive_expiry=settings.supabase_keepalive_expiry,
+    )
+    timeout = httpx.Timeout(
+        settings.supabase_read_timeout,
+        connect=settings.supabase_connect_timeout,
+        pool=settings.supabase_pool_timeout,
+    )
+
+    return httpx.AsyncClient(
+        transport=PoolStatsTransport(limits, settings.supabase_http2),
+        timeout=timeout,
+        follow_redirects=True,
+    )
+
+
+class _PooledPostgrestClient(AsyncPostgrestClient):
+    """PostgREST client that sends requests through a shared HTTP client."""
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        http_client: httpx.AsyncClient
+    ) -> None:
+        self._http_client = http_client
+        super().__init__(base_url, headers=headers)
+
+    def create_session(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        timeout: Union[int, float, httpx.Timeout],
+        verify: bool = True,
+        proxy: Optional[str] = None,
+    ) -> httpx.AsyncClient:
+        self._http_client.base_url = httpx.URL(base_url)
+        self._http_client.headers.update(headers)
+        return self._http_client
+
+
+class SupabaseClient:
+    """Async Supabase client with awaitable table, RPC and auth operations."""
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        http_client: Optional[httpx.AsyncClient] = None
+    ) -> None:
+        """
+        Initialize PostgREST and GoTrue clients over one HTTP connection pool.
+
+        Args:
+            url: Supabase project URL
+            key: Supabase API key
+            http_client: Pooled HTTP client (defaults to one built from settings)
+        """
+        self.url = url.rstrip("/")
+        self.key = key
+        self.http_client = http_client or create_http_client()
+        headers = {
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+        }
+
+        self.postgrest = _PooledPostgrestClient(
+            f"{self.url}/rest/v1",
+            headers=headers,
+            http_client=self.http_client,
+        )
+
+        # Auth shares the PostgREST connection pool (GoTrue uses absolute URLs)
+        self.auth = AsyncGoTrueClient(
+            url=f"{self.url}/auth/v1",
+            headers=headers,
+            http_client=self.http_client,
+            auto_refresh_token=False,
+            persist_session=False,
+        )
+
+    def table(self, name: str) -> AsyncRequestBuilder[Dict[str, Any]]:
+        """
+        Start a query on a table.
+
+        Args:
+            name: Table name
+
+        Returns:
+            Request builder whose execute() is awaitable
+
+        Examples:
+            >>> client = get_supabase_client()
+            >>> result = await client.table("setups").select("id,name").execute()
+        """
+        return self.postgrest.from_(name)
+
+    def rpc(self, func: str, params: Dict[str, Any]) -> AsyncRPCFilterRequestBuilder[Any]:
+        """
+        Call a Postgres function.
+
+        Args:
+            func: Function name
+            params: Function arguments
+
+        Returns:
+            Request builder whose execute() is awaitable
+        """
+        return self.postgrest.rpc(func, params)
+
+    def pool_stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Get connection pool statistics.
+
+        Returns:
+            Pool statistics, or an empty dict for a non-instrumented client
+        """
+        transport = self.http_client._transport
+        if isinstance(transport, PoolStatsTransport):
+            return transport.stats()
+
+        return {}
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connections."""
+        await self.http_client.aclose()
+
+
+def columns(model: Type[BaseModel]) -> str:
+    """
+    Build a select list naming exactly the fields of a model.
+
+    Args:
+        model: Pydantic model the rows are parsed into
+
+    Returns:
+        Comma-separated column names for select()
+
+    Examples:
+        >>> columns(UserProfile)
+        'id,email,created_at,updated_at'
+    """
+    return ",".join(model.model_fields)
+
+
+_client: Optional[SupabaseClient] = None
+
+
+def _pool_samples(name: str) -> List[Tuple[Dict[str, str], float]]:
+    """Read one pool statistic for /metrics, if the client exists."""
+    stats = _client.pool_stats() if _client is not None else {}
+    return [({}, float(stats[name]))] if name in stats else []
+
+
+for _stat, _help in (
+    ("open_connections", "Open connections in the Supabase HTTP pool."),
+    ("idle_connections", "Idle connections in the Supabase HTTP pool."),
+    ("in_flight_requests", "Supabase requests currently in flight."),
+):
+    metrics.registry.register(metrics.CallbackGauge(
+        f"makana_supabase_pool_{_stat}",
+        _help,
+        lambda _stat=_stat: _pool_samples(_stat),
+    ))
+
+
+def get_supabase_client() -> SupabaseClient:
+    """
+    Return the process-wide Supabase client, creating it on first use.
+
+    Returns:
+        Shared SupabaseClient
+    """
+    global _client
+
+    if _client is None:
+        _client = SupabaseClient(settings.supabase_url, settings.supabase_key)
+        logger.info(
+            f"Supabase client initialized (max_connections={settings.supabase_max_connections}, "
+            f"http2={settings.supabase_http2})"
+        )
+
+    return _client
@@ -0,0 +1,103 @@
+"""
+Sync service.
+
+Applies batches of actions the app queued while offline.
+"""
+import logging
+from typing import List, Optional
+from pydantic import TypeAdapter
+from models.sync import SyncOperation, SyncOperationResult
+from services.events import event_bus, SESSION_STARTED, SESSION_ENDED, SESSION_ABANDONED
+from services.supabase_client import SupabaseClient, get_supabase_client
+from services.user_state import user_state
+
+logger = logging.getLogger(__name__)
+
+# Validates the RPC's result array in one pydantic-core call
+SYNC_RESULT_LIST = TypeAdapter(List[SyncOperationResult])
+
+# Events announced for applied session operations
+SESSION_EVENTS = {
+    "start_session": SESSION_STARTED,
+    "end_session": SESSION_ENDED,
+    "abandon_session": SESSION_ABANDONED,
+}
+
+
+class SyncService:
+    """Service for offline sync batches."""
+
+    def __init__(self, supabase: Optional[SupabaseClient] = None) -> None:
+        """Initialize sync service with the shared Supabase client."""
+        self.supabase = supabase or get_supabase_client()
+
+    async def apply_batch(
+        self,
+        user_id: str,
+        operations: List[SyncOperation]
+    ) -> List[SyncOperationResult]:
+        """
+        Apply queued operations in order with one database call.
+
+        The apply_sync_batch() database function enforces the same rules as
+        SessionService and DailyCheckService (one active session, only
+        active sessions end or abandon, one daily check per day) and records
+        each idempotency key with its result, so replayed operations are
+        reported as duplicates instead of applied twice.
+
+        Args:
+            user_id: User UUID
+            operations: Operations in the order they happened
+
+        Returns:
+            One result per operation, in the same order
+
+        Raises:
+            Exception: If the batch could not be applied (nothing is committed)
+
+        Examples:
+            >>> service = SyncService()
+            >>> results = await service.apply_batch(
+            ...     "550e8400-e29b-41d4-a716-446655440000",
+            ...     [SyncOperation(
+            ...         idempotency_key="1718000000000-k3j2h1g0f",
+            ...         type="daily_check",
+            ...         responses={"energy": "medium"}
+            ...     )]
+            ... )
+            >>> assert results[0].status in ("applied", "rejected", "duplicate")
+        """
+        try:
+            # Validation, writes and idempotency records run in one transaction
+            # (see migrations/004_sync_batch_rpc.sql)
+            result = await self.supabase.rpc("apply_sync_batch", {
+                "p_user_id": user_id,
+                "p_operations": [
+                    operation.model_dump(mode="json", exclude_none=True)
+                    for operation in operations
+                ]
+            }).execute()
+
+            results = SYNC_RESULT_LIST.validate_python(result.data)
+
+            applied = [item for item in results if item.status == "applied"]
+
+            # Tell the user's other devices about session changes
+            for item in applied:
+                if item.session is not None:
+                    event_bus.publish(user_id, SESSION_EVENTS[item.type], item.session)
+
+            logger.info(f"Sync batch for user {user_id}: {len(applied)}/{len(results)} applied")
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Failed to apply sync batch: {str(e)}")
+            raise
+        finally:
+            # Replayed operations may have changed any of the user's hot state
+            user_state.invalidate(user_id)
+
+
+# Global sync service instance
+sync_service = SyncService()
@@ -0,0 +1,164 @@
+"""
+Per-user hot state.
+
+The small per-user facts nearly every request reads (active session, today's
+daily check, reduced mode, active setup), cached in the worker. Services
+read through the cache and update or invalidate it on their own writes.
+"""
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar, cast
+from config import settings
+from services import metrics
+from services.cache import TTLCache
+from services.events import Event, event_bus
+
+# Cached facts
+ACTIVE_SESSION = "active_session"
+TODAY_CHECK = "today_check"
+REDUCED_MODE = "reduced_mode"
+ACTIVE_SETUP = "active_setup"
+FACTS = (ACTIVE_SESSION, TODAY_CHECK, REDUCED_MODE, ACTIVE_SETUP)
+
+T = TypeVar("T")
+
+# Stored for a fact known to be absent (TTLCache.get returns None on a miss)
+_ABSENT = object()
+
+
+class UserStateCache:
+    """Bounded read-through cache of per-user facts, updated by writes."""
+
+    def __init__(
+        self,
+        max_users: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Initialize user state cache.
+
+        Args:
+            max_users: Users whose facts are kept (0 disables caching)
+            ttl: Seconds an entry is trusted; bounds staleness from writes
+                this worker does not see
+            clock: Time source for expiry
+        """
+        self.entries: TTLCache[Tuple[str, str], Tuple[Hashable, Any]] = TTLCache(
+            maxsize=max_users * len(FACTS),
+            ttl=ttl,
+            clock=clock
+        )
+        # Latest load started per entry; a write meanwhile makes its result stale
+        self._loads: Dict[Tuple[str, str], object] = {}
+
+    async def get_or_load(
+        self,
+        user_id: str,
+        fact: str,
+        load: Callable[[], Awaitable[Optional[T]]],
+        scope: Hashable = None
+    ) -> Optional[T]:
+        """
+        Return a cached fact, loading and caching it on a miss.
+
+        None results are cached too, so "no active session" is answered
+        without a query. Errors from load are raised and not cached.
+
+        Args:
+            user_id: User UUID
+            fact: One of the fact constants
+            load: Reads the fact from the database
+            scope: What the value depends on besides the user (e.g. the
+                date of today's check); an entry for another scope is a miss
+
+        Returns:
+            Cached or loaded value
+
+        Examples:
+            >>> session = await user_state.get_or_load(
+            ...     user_id, ACTIVE_SESSION, lambda: load_active_session(user_id)
+            ... )
+        """
+        key = (user_id, fact)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == scope:
+            cached = entry[1]
+            return None if cached is _ABSENT else cast(T, cached)
+
+        token = object()
+        self._loads[key] = token
+        try:
+            value = await load()
+            # Keep the result unless a write or newer load happened meanwhile
+            if self._loads.get(key) is token:
+                self.entries.set(key, (scope, _ABSENT if value is None else value))
+            return value
+        finally:
+            if self._loads.get(key) is token:
+                del self._loads[key]
+
+    def set(self, user_id: str, fact: str, value: Any, scope: Hashable = None) -> None:
+        """
+        Store a fact a write just produced (None records it as absent).
+
+        Args:
+            user_id: User UUID
+            fact: One of the fact constants
+            value: New value
+            scope: As in get_or_load
+        """
+        key = (user_id, fact)
+        self._loads.pop(key, None)
+        self.entries.set(key, (scope, _ABSENT if value is None else value))
+
+    def invalidate(self, user_id: str, *facts: str) -> None:
+        """
+        Drop facts whose new value is unknown, all of the user's by default.
+
+        Args:
+            user_id: User UUID
+            facts: Fact constants to drop
+        """
+        for fact in facts or FACTS:
+            key = (user_id, fact)
+            self._loads.pop(key, None)
+            self.entries.pop(key)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._loads.clear()
+        self.entries.clear()
+
+
+# Global user state cache instance
+user_state = UserStateCache(
+    max_users=settings.user_state_cache_max_users,
+    ttl=settings.user_state_cache_ttl
+)
+
+
+def _invalidate_relayed(user_id: str, event: Event) -> None:
+    """Forget a user's facts when another worker changed their state."""
+    user_state.invalidate(user_id)
+
+
+event_bus.add_relay_listener(_invalidate_relayed)
+
+
+def _cache_samples(stat: str) -> List[Tuple[Dict[str, str], float]]:
+    """Read one cache statistic for /metrics."""
+    return [({}, float(user_state.entries.stats()[stat]))]
+
+
+for _stat, _kind, _help in (
+    ("hits", "counter", "User state cache hits."),
+    ("misses", "counter", "User state cache misses."),
+    ("size", "gauge", "Facts in the user state cache."),
+):
+    metrics.registry.register(metrics.CallbackGauge(
+        f"makana_user_state_cache_{_stat}",
+        _help,
+        partial(_cache_samples, _stat),
+        kind=_kind,
+    ))
@@ -6,25 +6,35 @@ Manages weekly reflection, generates insights, recommends scope adjustments.
 import logging
 from typing import Optional, List, Dict, Any
 from datetime import date, datetime, timedelta
-from supabase import create_client, Client
-from config import settings
+from services.supabase_client import SupabaseClient, columns, get_supabase_client
+from services.pagination import decode_cursor, seek_after
+from pydantic import TypeAdapter
 from models.weekly_check import WeeklyCheck, WeeklyCheckCreate
 from services.rules_engine import generate_insight, should_recommend_reduced_mode
 
 logger = logging.getLogger(__name__)
 
+# Counters returned by the week_stats() RPC
+WEEK_STAT_KEYS = (
+    "sessions_completed",
+    "sessions_abandoned",
+    "sessions_with_next_step",
+    "daily_checks_completed",
+)
+
+WEEKLY_CHECK_COLUMNS = columns(WeeklyCheck)
+# Validates a list of rows in one pydantic-core call
+WEEKLY_CHECK_LIST = TypeAdapter(List[WeeklyCheck])
+
 
 class WeeklyCheckService:
     """Service for weekly check management."""
     
-    def __init__(self) -> None:
-        """Initialize weekly check service with Supabase client."""
-        self.supabase: Client = create_client(
-            settings.supabase_url,
-            settings.supabase_key
-        )
+    def __init__(self, supabase: Optional[SupabaseClient] = None) -> None:
+        """Initialize weekly check service with the shared Supabase client."""
+        self.supabase = supabase or get_supabase_client()
     
-    def create_weekly_check(
+    async def create_weekly_check(
         self,
         user_id: str,
         check_data: WeeklyCheckCreate
@@ -41,7 +51,7 @@ class WeeklyCheckService:
             
         Examples:
             >>> service = WeeklyCheckService()
-            >>> check = service.create_weekly_check(
+            >>> check = await service.create_weekly_check(
             ...     "550e8400-e29b-41d4-a716-446655440000",
             ...     WeeklyCheckCreate(responses={"capacity": "good"})
             ... )
@@ -54,7 +64,7 @@ class WeeklyCheckService:
             week_end = week_start + timedelta(days=6)
             
             # Get week data for insight generation
-            week_data = self.get_week_data(user_id, week_start, week_end)
+            week_data = await self.get_week_data(user_id, week_start, week_end)
             
             # Generate insight (at most one)
             insight = generate_insight(user_id, week_data)
@@ -75,7 +85,7 @@ class WeeklyCheckService:
                 "created_at": now.isoformat()
             }
             
-            result = self.supabase.table("weekly_checks").insert(
+            result = await self.supabase.table("weekly_checks").insert(
                 check_record
             ).execute()
             
@@ -87,7 +97,7 @@ class WeeklyCheckService:
             logger.error(f"Failed to create weekly check: {str(e)}")
             raise
     
-    def get_week_data(
+    async def get_week_data(
         self,
         user_id: str,
         week_start: date,
@@ -96,6 +106,9 @@ class WeeklyCheckService:
         """
         Aggregate week statistics for insight generation.
         
+        Counts are computed by the week_stats() database function, so the
+        payload is a single row however many sessions the week holds.
+        
         Args:
             user_id: User UUID
             week_start: Monday of the week
@@ -105,51 +118,22 @@ class WeeklyCheckService:
             Dictionary with week statistics
         """
         try:
-            # Get sessions for the week
-            sessions_result = self.supabase.table("sessions").select("*").eq(
-                "user_id", user_id
-            ).gte(
-                "created_at", week_start.isoformat()
-            ).lte(
-                "created_at", (week_end + timedelta(days=1)).isoformat()
-            ).execute()
+            # Counted in the database: one row regardless of session volume
+            result = await self.supabase.rpc("week_stats", {
+                "p_user_id": user_id,
+                "p_week_start": week_start.isoformat(),
+                "p_week_end": week_end.isoformat()
+            }).execute()
             
-            sessions = sessions_result.data
-            
-            # Calculate statistics
-            sessions_completed = sum(1 for s in sessions if s["status"] == "completed")
-            sessions_abandoned = sum(1 for s in sessions if s["status"] == "abandoned")
-            sessions_with_next_step = sum(
-                1 for s in sessions 
-                if s["status"] == "completed" and s.get("next_step")
-            )
-            
-            # Get daily checks for the week
-            daily_checks_result = self.supabase.table("daily_checks").select("*").eq(
-                "user_id", user_id
-            ).gte(
-                "check_date", week_start.isoformat()
-            ).lte(
-                "check_date", week_end.isoformat()
-            ).execute()
-            
-            daily_checks_completed = len(daily_checks_result.data)
+            if result.data:
+                row = result.data[0]
+                return {key: row.get(key) or 0 for key in WEEK_STAT_KEYS}
             
-            return {
-                "sessions_completed": sessions_completed,
-                "sessions_abandoned": sessions_abandoned,
-                "sessions_with_next_step": sessions_with_next_step,
-                "daily_checks_completed": daily_checks_completed
-            }
+            return dict.fromkeys(WEEK_STAT_KEYS, 0)
             
         except Exception as e:
             logger.error(f"Failed to get week data: {str(e)}")
-            return {
-                "sessions_completed": 0,
-                "sessions_abandoned": 0,
-                "sessions_with_next_step": 0,
-                "daily_checks_completed": 0
-            }
+            return dict.fromkeys(WEEK_STAT_KEYS, 0)
     
     def recommend_scope_adjustment(self, week_data: Dict[str, Any]) -> Optional[str]:
         """
@@ -166,7 +150,7 @@ class WeeklyCheckService:
         
         return None
     
-    def get_latest_check(self, user_id: str) -> Optional[WeeklyCheck]:
+    async def get_latest_check(self, user_id: str) -> Optional[WeeklyCheck]:
         """
         Get most recent weekly check.
         
@@ -177,48 +161,79 @@ class WeeklyCheckService:
             Latest WeeklyCheck if found, None otherwise
         """
         try:
-            result = self.supabase.table("weekly_checks").select("*").eq(
-                "user_id", user_id
-            ).order(
-                "week_start_date", desc=True
-            ).limit(1).execute()
-            
-            if result.data:
-                return WeeklyCheck(**result.data[0])
-            
-            return None
+            return await self.fetch_latest_check(user_id)
             
         except Exception as e:
             logger.error(f"Failed to get latest check: {str(e)}")
             return None
     
-    def get_check_history(
+    async def fetch_latest_check(self, user_id: str) -> Optional[WeeklyCheck]:
+        """
+        Get the most recent weekly check, raising if it cannot be read.
+        
+        Same read as get_latest_check, for callers that must tell "none"
+        from "could not load" (the dashboard's failure policy).
+        
+        Raises:
+            Exception: If the database read fails
+        """
+        result = await self.supabase.table("weekly_checks").select(WEEKLY_CHECK_COLUMNS).eq(
+            "user_id", user_id
+        ).order(
+            "week_start_date", desc=True
+        ).limit(1).execute()
+        
+        if result.data:
+            return WeeklyCheck(**result.data[0])
+        
+        return None
+    
+    async def get_check_history(
         self,
         user_id: str,
         limit: int = 12,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> List[WeeklyCheck]:
         """
         Get past weekly checks with pagination.
         
+        Pages either by offset or, when a cursor is given, by seeking past
+        the last (week_start_date, id) seen so each page is an index range read.
+        
         Args:
             user_id: User UUID
             limit: Maximum number of checks to return
-            offset: Number of checks to skip
+            offset: Number of checks to skip (ignored with a cursor)
+            cursor: Opaque cursor from the previous page
             
         Returns:
             List of WeeklyCheck in reverse chronological order
+            
+        Raises:
+            ValueError: If the cursor is malformed
         """
+        # Decoded up front so a bad cursor is reported, not read as no rows
+        if cursor is not None:
+            decode_cursor(cursor)
+        
         try:
-            result = self.supabase.table("weekly_checks").select("*").eq(
+            query = self.supabase.table("weekly_checks").select(WEEKLY_CHECK_COLUMNS).eq(
                 "user_id", user_id
             ).order(
                 "week_start_date", desc=True
-            ).range(
-                offset, offset + limit - 1
-            ).execute()
+            ).order(
+                "id", desc=True
+            )
+            
+            if cursor is not None:
+                query = seek_after(query, "week_start_date", cursor).limit(limit)
+            else:
+                query = query.range(offset, offset + limit - 1)
+            
+            result = await query.execute()
             
-            return [WeeklyCheck(**check) for check in result.data]
+            return WEEKLY_CHECK_LIST.validate_python(result.data)
             
         except Exception as e:
             logger.error(f"Failed to get check history: {str(e)}")
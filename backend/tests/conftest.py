@@ -6,6 +6,15 @@ Provides common test fixtures and configuration for all tests.
 import pytest
 from fastapi.testclient import TestClient
 from main import app
+from services.user_state import user_state
+
+
+@pytest.fixture(autouse=True)
+def clear_user_state():
+    """Start every test without per-user state cached by an earlier one."""
+    user_state.clear()
+    yield
+    user_state.clear()
 
 
 @pytest.fixture
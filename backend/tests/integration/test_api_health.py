@@ -107,6 +107,17 @@ class TestWeeklyCheckEndpoints:
         assert response.status_code == 403
 
 
+class TestDashboardEndpoints:
+    """Tests for dashboard endpoint existence."""
+    
+    def test_dashboard_requires_auth(self):
+        """Test that the dashboard requires authentication."""
+        response = client.get("/api/v1/me/dashboard")
+        
+        # Should return 403 for missing auth, not 404
+        assert response.status_code == 403
+
+
 class TestSetupEndpoints:
     """Tests for setup endpoints existence."""
     
@@ -4,6 +4,7 @@ Tests for main application endpoints.
 Validates health check and root endpoints work correctly.
 """
 import pytest
+from config import settings
 
 
 @pytest.mark.unit
@@ -16,6 +17,25 @@ def test_health_check(client):
     assert "environment" in data
 
 
+@pytest.mark.unit
+def test_pool_stats_endpoint(client, monkeypatch):
+    """Test pool stats endpoint exposes connection pool usage."""
+    monkeypatch.setattr(settings, "admin_api_key", "admin-key")
+    response = client.get("/health/pool", headers={"X-Admin-Key": "admin-key"})
+    assert response.status_code == 200
+    data = response.json()
+    assert "open_connections" in data
+    assert "idle_connections" in data
+    assert "pool_wait_ms_avg" in data
+
+
+@pytest.mark.unit
+def test_pool_stats_requires_admin_key(client):
+    """Test pool stats are not exposed without the admin key."""
+    response = client.get("/health/pool")
+    assert response.status_code == 403
+
+
 @pytest.mark.unit
 def test_root_endpoint(client):
     """Test root endpoint returns API information."""
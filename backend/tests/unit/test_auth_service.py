@@ -6,7 +6,7 @@ Tests JWT token verification, user profile creation, and retrieval.
 import pytest
 from datetime import datetime, timedelta
 from jose import jwt
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch
 from services.auth_service import AuthService
 from models.user import User, UserProfile
 
@@ -14,14 +14,10 @@ from models.user import User, UserProfile
 @pytest.fixture
 def auth_service():
     """Create auth service instance with mocked Supabase client."""
-    with patch('services.auth_service.create_client') as mock_create_client:
-        mock_supabase = Mock()
-        mock_create_client.return_value = mock_supabase
-        
-        service = AuthService()
-        service.jwt_secret = "test-secret-key"
-        
-        yield service
+    service = AuthService(supabase=Mock())
+    service.jwt_secret = "test-secret-key"
+    
+    yield service
 
 
 @pytest.fixture
@@ -112,10 +108,54 @@ class TestVerifyToken:
             auth_service.verify_token(token)
 
 
+class TestTokenCache:
+    """Tests for verified token caching."""
+    
+    def test_repeat_verification_hits_cache(self, auth_service, valid_token):
+        """Test that the same token is decoded only once."""
+        with patch('services.auth_service.jwt.decode', wraps=jwt.decode) as mock_decode:
+            first = auth_service.verify_token(valid_token)
+            second = auth_service.verify_token(valid_token)
+        
+        assert first == second
+        assert mock_decode.call_count == 1
+        assert auth_service.token_cache.stats()["hits"] == 1
+        assert auth_service.token_cache.stats()["misses"] == 1
+    
+    def test_cached_entry_expires_with_token(self, auth_service):
+        """Test that cached users are not returned past the token's exp."""
+        from jose import JWTError
+        
+        payload = {
+            "sub": "550e8400-e29b-41d4-a716-446655440000",
+            "email": "test@example.com",
+            "aud": "authenticated",
+            "exp": datetime.utcnow() + timedelta(seconds=30)
+        }
+        token = jwt.encode(payload, auth_service.jwt_secret, algorithm="HS256")
+        auth_service.verify_token(token)
+        
+        # Move the cache clock past exp (jwt.encode converts exp to epoch seconds)
+        auth_service.token_cache.clock = lambda: payload["exp"] + 60
+        
+        with patch('services.auth_service.jwt.decode', side_effect=JWTError("expired")):
+            with pytest.raises(JWTError):
+                auth_service.verify_token(token)
+    
+    def test_invalid_token_is_not_cached(self, auth_service):
+        """Test that failed verifications are not cached."""
+        from jose import JWTError
+        
+        with pytest.raises(JWTError):
+            auth_service.verify_token("invalid.token.here")
+        
+        assert len(auth_service.token_cache) == 0
+
+
 class TestCreateUserProfile:
     """Tests for create_user_profile function."""
     
-    def test_create_new_profile(self, auth_service):
+    async def test_create_new_profile(self, auth_service):
         """Test creating a new user profile."""
         from uuid import UUID
         user_id = "550e8400-e29b-41d4-a716-446655440000"
@@ -128,31 +168,31 @@ class TestCreateUserProfile:
         mock_insert = Mock()
         
         # Mock existing profile check (no existing profile)
-        mock_eq.execute.return_value = Mock(data=[])
+        mock_eq.execute = AsyncMock(return_value=Mock(data=[]))
         mock_select.eq.return_value = mock_eq
         mock_table.select.return_value = mock_select
         
         # Mock profile creation
         now = datetime.utcnow()
-        mock_insert.execute.return_value = Mock(data=[{
+        mock_insert.execute = AsyncMock(return_value=Mock(data=[{
             "id": user_id,
             "email": email,
             "created_at": now.isoformat(),
             "updated_at": now.isoformat()
-        }])
+        }]))
         mock_table.insert.return_value = mock_insert
         
         auth_service.supabase.table.return_value = mock_table
         
         # Create profile
-        profile = auth_service.create_user_profile(user_id, email)
+        profile = await auth_service.create_user_profile(user_id, email)
         
         assert profile.id == UUID(user_id)
         assert profile.email == email
         assert profile.created_at is not None
         assert profile.updated_at is not None
     
-    def test_create_profile_when_already_exists(self, auth_service):
+    async def test_create_profile_when_already_exists(self, auth_service):
         """Test that existing profile is returned without creating duplicate."""
         from uuid import UUID
         user_id = "550e8400-e29b-41d4-a716-446655440000"
@@ -165,19 +205,19 @@ class TestCreateUserProfile:
         
         # Mock existing profile check (profile exists)
         now = datetime.utcnow()
-        mock_eq.execute.return_value = Mock(data=[{
+        mock_eq.execute = AsyncMock(return_value=Mock(data=[{
             "id": user_id,
             "email": email,
             "created_at": now.isoformat(),
             "updated_at": now.isoformat()
-        }])
+        }]))
         mock_select.eq.return_value = mock_eq
         mock_table.select.return_value = mock_select
         
         auth_service.supabase.table.return_value = mock_table
         
         # Create profile (should return existing)
-        profile = auth_service.create_user_profile(user_id, email)
+        profile = await auth_service.create_user_profile(user_id, email)
         
         assert profile.id == UUID(user_id)
         assert profile.email == email
@@ -189,7 +229,7 @@ class TestCreateUserProfile:
 class TestGetUserProfile:
     """Tests for get_user_profile function."""
     
-    def test_get_existing_profile(self, auth_service):
+    async def test_get_existing_profile(self, auth_service):
         """Test retrieving an existing user profile."""
         from uuid import UUID
         user_id = "550e8400-e29b-41d4-a716-446655440000"
@@ -201,25 +241,25 @@ class TestGetUserProfile:
         mock_eq = Mock()
         
         now = datetime.utcnow()
-        mock_eq.execute.return_value = Mock(data=[{
+        mock_eq.execute = AsyncMock(return_value=Mock(data=[{
             "id": user_id,
             "email": email,
             "created_at": now.isoformat(),
             "updated_at": now.isoformat()
-        }])
+        }]))
         mock_select.eq.return_value = mock_eq
         mock_table.select.return_value = mock_select
         
         auth_service.supabase.table.return_value = mock_table
         
         # Get profile
-        profile = auth_service.get_user_profile(user_id)
+        profile = await auth_service.get_user_profile(user_id)
         
         assert profile is not None
         assert profile.id == UUID(user_id)
         assert profile.email == email
     
-    def test_get_nonexistent_profile_returns_none(self, auth_service):
+    async def test_get_nonexistent_profile_returns_none(self, auth_service):
         """Test that nonexistent profile returns None."""
         user_id = "550e8400-e29b-41d4-a716-446655440000"
         
@@ -228,18 +268,18 @@ class TestGetUserProfile:
         mock_select = Mock()
         mock_eq = Mock()
         
-        mock_eq.execute.return_value = Mock(data=[])
+        mock_eq.execute = AsyncMock(return_value=Mock(data=[]))
         mock_select.eq.return_value = mock_eq
         mock_table.select.return_value = mock_select
         
         auth_service.supabase.table.return_value = mock_table
         
         # Get profile
-        profile = auth_service.get_user_profile(user_id)
+        profile = await auth_service.get_user_profile(user_id)
         
         assert profile is None
     
-    def test_get_profile_handles_database_error(self, auth_service):
+    async def test_get_profile_handles_database_error(self, auth_service):
         """Test that database errors are handled gracefully."""
         user_id = "550e8400-e29b-41d4-a716-446655440000"
         
@@ -250,6 +290,6 @@ class TestGetUserProfile:
         auth_service.supabase.table.return_value = mock_table
         
         # Get profile (should return None on error)
-        profile = auth_service.get_user_profile(user_id)
+        profile = await auth_service.get_user_profile(user_id)
         
         assert profile is None
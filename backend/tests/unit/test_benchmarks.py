@@ -0,0 +1,101 @@
+"""
+Unit tests for the benchmark harness.
+
+Tests the Supabase stand-in's query semantics and baseline comparison.
+"""
+import pytest
+from benchmarks.fake_postgrest import CALM_SETUP_ID, FakeDatabase, PostgrestError
+from benchmarks.journeys import compare
+
+USER_ID = "550e8400-e29b-41d4-a716-446655440009"
+
+
+class TestFakeDatabase:
+    """Tests for the in-memory PostgREST stand-in."""
+
+    def test_filters_order_and_limit(self):
+        """Test that eq filters, ordering and limit follow PostgREST."""
+        db = FakeDatabase()
+
+        rows = db.query("setups", [("is_preset", "eq.true"), ("order", "name.desc"), ("limit", "2")])
+
+        assert [row["name"] for row in rows] == ["Vitality", "Reduced"]
+
+    def test_start_session_enforces_one_active(self):
+        """Test that a second active session violates the unique index."""
+        db = FakeDatabase()
+        db.start_session(USER_ID, CALM_SETUP_ID)
+
+        with pytest.raises(PostgrestError) as exc_info:
+            db.start_session(USER_ID, CALM_SETUP_ID)
+
+        assert exc_info.value.code == "23505"
+
+    def test_select_embeds_setup(self):
+        """Test that alias:table(columns) embeds the referenced row."""
+        db = FakeDatabase()
+        session = db.start_session(USER_ID, CALM_SETUP_ID)[0]
+
+        rows = db.project("sessions", [session], "id,setup:setups(id,name)")
+
+        assert rows == [{"id": session["id"], "setup": {"id": CALM_SETUP_ID, "name": "Calm"}}]
+
+    def test_week_stats_counts_completed(self):
+        """Test that week_stats mirrors the SQL aggregate."""
+        db = FakeDatabase()
+        session = db.start_session(USER_ID, CALM_SETUP_ID)[0]
+        db.update("sessions", [("id", f"eq.{session['id']}")], {"status": "completed", "next_step": "Rest"})
+        week = session["created_at"][:10]
+
+        stats = db.week_stats(USER_ID, week, week)[0]
+
+        assert stats["sessions_completed"] == 1
+        assert stats["sessions_with_next_step"] == 1
+
+    def test_end_session_completes_once(self):
+        """Test that end_session keeps a stored next step and rejects a second end."""
+        db = FakeDatabase()
+        session = db.start_session(USER_ID, CALM_SETUP_ID)[0]
+        db.update("sessions", [("id", f"eq.{session['id']}")], {"next_step": "Rest"})
+
+        ended = db.end_session(USER_ID, session["id"], "")[0]
+
+        assert (ended["status"], ended["next_step"], ended["duration_minutes"]) == ("completed", "Rest", 0)
+        with pytest.raises(PostgrestError) as exc_info:
+            db.abandon_session(USER_ID, session["id"])
+        assert exc_info.value.code == "22023"
+
+    def test_transitions_hide_other_users_sessions(self):
+        """Test that ending someone else's session reports it as not found."""
+        db = FakeDatabase()
+        session = db.start_session(USER_ID, CALM_SETUP_ID)[0]
+
+        with pytest.raises(PostgrestError) as exc_info:
+            db.end_session("550e8400-e29b-41d4-a716-446655440008", session["id"])
+
+        assert exc_info.value.code == "P0002"
+
+
+class TestCompare:
+    """Tests for baseline comparison."""
+
+    def make_result(self, p50, rps=100.0, errors=0):
+        return {"endpoints": {"GET /x": {
+            "p50_ms": p50, "p99_ms": p50 * 2, "throughput_rps": rps, "errors": errors
+        }}}
+
+    def test_within_tolerance_passes(self):
+        """Test that small slowdowns are not regressions."""
+        assert compare(self.make_result(11.0), self.make_result(10.0), 0.25) == []
+
+    def test_slowdown_is_regression(self):
+        """Test that latency beyond tolerance is reported."""
+        regressions = compare(self.make_result(20.0), self.make_result(10.0), 0.25)
+
+        assert regressions == ["GET /x p50_ms: 10.0 -> 20.0", "GET /x p99_ms: 20.0 -> 40.0"]
+
+    def test_new_errors_are_regressions(self):
+        """Test that new errors are reported."""
+        assert compare(self.make_result(10.0, errors=1), self.make_result(10.0), 0.25) == [
+            "GET /x errors: 0 -> 1"
+        ]
@@ -0,0 +1,90 @@
+"""
+Unit tests for the in-process TTL cache.
+
+Tests LRU eviction, expiry, and hit/miss counters.
+"""
+from services.cache import TTLCache
+
+
+class FakeClock:
+    """Manually advanced clock."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+    
+    def test_get_returns_stored_value(self):
+        """Test that a stored value is returned and counted as a hit."""
+        cache = TTLCache(maxsize=10)
+        cache.set("a", 1)
+        
+        assert cache.get("a") == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 0
+    
+    def test_missing_key_counts_miss(self):
+        """Test that a missing key returns None and counts a miss."""
+        cache = TTLCache(maxsize=10)
+        
+        assert cache.get("missing") is None
+        assert cache.stats()["misses"] == 1
+    
+    def test_entry_expires_at_deadline(self):
+        """Test that entries are dropped once their deadline passes."""
+        clock = FakeClock()
+        cache = TTLCache(maxsize=10, clock=clock)
+        cache.set("a", 1, expires_at=clock.now + 5)
+        
+        clock.now += 4.9
+        assert cache.get("a") == 1
+        
+        clock.now += 0.1
+        assert cache.get("a") is None
+        assert len(cache) == 0
+    
+    def test_default_ttl_applies(self):
+        """Test that ttl is used when no deadline is given."""
+        clock = FakeClock()
+        cache = TTLCache(maxsize=10, ttl=30, clock=clock)
+        cache.set("a", 1)
+        
+        clock.now += 31
+        assert cache.get("a") is None
+    
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+    
+    def test_zero_maxsize_disables_cache(self):
+        """Test that maxsize 0 stores nothing."""
+        cache = TTLCache(maxsize=0)
+        cache.set("a", 1)
+        
+        assert cache.get("a") is None
+        assert len(cache) == 0
+    
+    def test_pop_and_clear(self):
+        """Test explicit invalidation."""
+        cache = TTLCache(maxsize=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        
+        cache.pop("a")
+        assert cache.get("a") is None
+        
+        cache.clear()
+        assert len(cache) == 0
@@ -0,0 +1,92 @@
+"""
+Unit tests for model conversion.
+
+Tests that response models are validated from service models, singly and
+one list at a time.
+"""
+from datetime import datetime, timezone
+from uuid import uuid4
+import pytest
+from pydantic import ValidationError
+from models.conversion import to_response, to_responses
+from models.reduced_mode import ReducedModeResponse
+from models.session import Session, SessionResponse, SessionWithSetup, SessionWithSetupResponse
+from models.setup import SetupSummary
+from services.session_service import SESSION_LIST
+
+NOW = datetime(2024, 3, 4, 9, 30, tzinfo=timezone.utc)
+
+
+def session(**overrides) -> Session:
+    fields = {
+        "id": uuid4(),
+        "user_id": uuid4(),
+        "setup_id": uuid4(),
+        "start_time": NOW,
+        "status": "completed",
+        "duration_minutes": 25,
+        "created_at": NOW,
+        "updated_at": NOW,
+    }
+    return Session(**{**fields, **overrides})
+
+
+class TestToResponse:
+    """Tests for to_response and to_responses."""
+
+    def test_copies_service_fields(self):
+        """Test that a response carries the service model's values."""
+        source = session()
+
+        response = to_response(SessionResponse, source)
+
+        assert response.model_dump() == {name: getattr(source, name) for name in SessionResponse.model_fields}
+
+    def test_validates(self):
+        """Test that service models are validated, not trusted."""
+        source = session()
+        source.__dict__["status"] = 42
+
+        with pytest.raises(ValidationError):
+            to_response(SessionResponse, source)
+
+    def test_mappings(self):
+        """Test that mappings are accepted too."""
+        response = to_response(ReducedModeResponse, {"is_active": True})
+
+        assert response.is_active is True
+        assert response.activated_at is None
+
+    def test_lists(self):
+        """Test that a list converts in order to response models."""
+        sources = [session(), session()]
+
+        responses = to_responses(SessionResponse, sources)
+
+        assert [response.id for response in responses] == [source.id for source in sources]
+        assert all(type(response) is SessionResponse for response in responses)
+
+
+class TestRowLists:
+    """Tests for list adapters used by services."""
+
+    def test_session_list_parses_rows(self):
+        """Test that rows from PostgREST validate in one call, embedded setup included."""
+        source = session()
+        setup = {"id": str(source.setup_id), "name": "Calm", "emphasis": "rest"}
+        row = {**source.model_dump(mode="json"), "setup": setup}
+
+        sessions = SESSION_LIST.validate_python([row, row])
+
+        assert sessions == [SessionWithSetup(**source.model_dump(), setup=setup)] * 2
+
+    def test_embedded_setup_reaches_response(self):
+        """Test that the fast path copies the embedded setup into listings."""
+        source = SessionWithSetup(
+            **session().model_dump(),
+            setup=SetupSummary(id=uuid4(), name="Calm", emphasis="rest")
+        )
+
+        response = to_responses(SessionWithSetupResponse, [source])[0]
+
+        assert response.setup == source.setup
@@ -0,0 +1,158 @@
+"""
+Unit tests for dashboard service.
+
+Tests concurrent section loading and the per-section failure policy.
+"""
+import asyncio
+import time
+import httpx
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from models.session import Session
+from services.dashboard_service import DashboardService, OPTIONAL, REQUIRED
+from services.daily_check_service import daily_check_service
+from services.reduced_mode_service import reduced_mode_service
+from services.session_service import session_service
+from services.setup_service import setup_service
+from services.supabase_client import SupabaseClient
+from services.weekly_check_service import weekly_check_service
+
+USER_ID = "550e8400-e29b-41d4-a716-446655440000"
+
+
+def make_session():
+    """Build an active session."""
+    now = datetime.utcnow()
+    return Session(
+        id=uuid4(),
+        user_id=USER_ID,
+        setup_id=uuid4(),
+        start_time=now,
+        duration_minutes=25,
+        status="active",
+        created_at=now,
+        updated_at=now
+    )
+
+
+SERVICES = (session_service, daily_check_service, reduced_mode_service, setup_service, weekly_check_service)
+
+
+@pytest.fixture
+def readers(monkeypatch):
+    """Replace every section read with an AsyncMock returning nothing."""
+    mocks = {
+        "active_session": AsyncMock(return_value=None),
+        "today_check": AsyncMock(return_value=None),
+        "reduced_mode": AsyncMock(return_value=None),
+        "active_setup": AsyncMock(return_value=None),
+        "latest_weekly_check": AsyncMock(return_value=None),
+    }
+    monkeypatch.setattr(session_service, "fetch_active_session", mocks["active_session"])
+    monkeypatch.setattr(daily_check_service, "fetch_today_check", mocks["today_check"])
+    monkeypatch.setattr(reduced_mode_service, "fetch_reduced_mode_state", mocks["reduced_mode"])
+    monkeypatch.setattr(setup_service, "fetch_active_setup", mocks["active_setup"])
+    monkeypatch.setattr(weekly_check_service, "fetch_latest_check", mocks["latest_weekly_check"])
+    return mocks
+
+
+@pytest.fixture
+async def database_down(monkeypatch):
+    """Point every service at a Supabase client whose connections are refused."""
+    def refuse(request):
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(refuse))
+    supabase = SupabaseClient("http://database", "service-key", http_client=http_client)
+    for service in SERVICES:
+        monkeypatch.setattr(service, "supabase", supabase)
+    yield supabase
+    await supabase.aclose()
+
+
+class TestGetDashboard:
+    """Tests for get_dashboard function."""
+
+    async def test_sections_load_concurrently(self, readers):
+        """Test that sections run in parallel rather than one after another."""
+        async def slow(*args):
+            await asyncio.sleep(0.1)
+            return None
+
+        for mock in readers.values():
+            mock.side_effect = slow
+
+        started = time.perf_counter()
+        await DashboardService(section_timeout=1.0).get_dashboard(USER_ID)
+
+        assert time.perf_counter() - started < 0.3
+        for mock in readers.values():
+            mock.assert_awaited_once()
+
+    async def test_returns_loaded_sections(self, readers):
+        """Test that loaded records are returned as response models."""
+        session = make_session()
+        readers["active_session"].return_value = session
+
+        dashboard = await DashboardService().get_dashboard(USER_ID)
+
+        assert dashboard.active_session.id == session.id
+        assert dashboard.today_check is None
+        assert dashboard.reduced_mode.is_active is False
+        assert dashboard.unavailable == []
+
+    async def test_optional_failure_is_reported(self, readers):
+        """Test that a failing optional section is omitted and listed."""
+        readers["latest_weekly_check"].side_effect = Exception("Database connection error")
+        readers["active_session"].return_value = make_session()
+
+        dashboard = await DashboardService().get_dashboard(USER_ID)
+
+        assert dashboard.latest_weekly_check is None
+        assert dashboard.active_session is not None
+        assert dashboard.unavailable == ["latest_weekly_check"]
+
+    async def test_optional_timeout_is_reported(self, readers):
+        """Test that a slow optional section is cut off at the timeout."""
+        async def hang(*args):
+            await asyncio.sleep(1)
+
+        readers["active_setup"].side_effect = hang
+
+        dashboard = await DashboardService(section_timeout=0.05).get_dashboard(USER_ID)
+
+        assert dashboard.unavailable == ["active_setup"]
+
+    async def test_required_failure_raises(self, readers):
+        """Test that a failing required section fails the dashboard."""
+        readers["active_session"].side_effect = Exception("Database connection error")
+
+        with pytest.raises(Exception, match="Unable to load dashboard"):
+            await DashboardService().get_dashboard(USER_ID)
+
+    async def test_policy_is_configurable(self, readers):
+        """Test that sections can be made required or optional."""
+        readers["active_session"].side_effect = Exception("Database connection error")
+        readers["today_check"].side_effect = Exception("Database connection error")
+        service = DashboardService(policies={"active_session": OPTIONAL, "today_check": REQUIRED})
+
+        with pytest.raises(Exception, match="Unable to load dashboard"):
+            await service.get_dashboard(USER_ID)
+
+    async def test_database_outage_raises(self, database_down):
+        """Test that a failing database fails the dashboard instead of reading as empty."""
+        with pytest.raises(Exception, match="Unable to load dashboard"):
+            await DashboardService().get_dashboard(USER_ID)
+
+    async def test_database_outage_lists_optional_sections(self, database_down, monkeypatch):
+        """Test that optional sections hit by a database outage are listed as unavailable."""
+        session = make_session()
+        monkeypatch.setattr(session_service, "_load_active_session", AsyncMock(return_value=session))
+
+        dashboard = await DashboardService().get_dashboard(USER_ID)
+
+        assert dashboard.active_session.id == session.id
+        assert dashboard.reduced_mode is None
+        assert dashboard.unavailable == ["today_check", "reduced_mode", "active_setup", "latest_weekly_check"]
@@ -0,0 +1,193 @@
+"""
+Unit tests for live state events.
+
+Tests the per-user event bus, the Redis-compatible relay, publishing from
+services, and the /me/events stream.
+"""
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+import orjson
+from api.v1.me import stream_events
+from models.reduced_mode import ReducedModeResponse
+from models.session import Session
+from models.user import User
+from services import events as events_module
+from services.events import Event, EventBus, RedisEventBackend, event_bus
+from services.reduced_mode_service import reduced_mode_service
+from services.session_service import SessionService, session_service
+
+USER_ID = "550e8400-e29b-41d4-a716-446655440000"
+OTHER_USER_ID = "770e8400-e29b-41d4-a716-446655440000"
+NOW = datetime(2024, 3, 4, 9, 30, tzinfo=timezone.utc)
+
+
+def state(active: bool) -> ReducedModeResponse:
+    return ReducedModeResponse(is_active=active, activated_at=NOW if active else None)
+
+
+def session_row(status: str) -> dict:
+    return {
+        "id": str(uuid4()),
+        "user_id": USER_ID,
+        "setup_id": str(uuid4()),
+        "start_time": NOW.isoformat(),
+        "end_time": None,
+        "duration_minutes": 25,
+        "next_step": None,
+        "status": status,
+        "reduced_mode_active": False,
+        "created_at": NOW.isoformat(),
+        "updated_at": NOW.isoformat(),
+    }
+
+
+class FakePubSub:
+    def __init__(self, broker):
+        self.broker = broker
+        self.messages = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.broker.subscribers.append(self)
+
+    async def listen(self):
+        while True:
+            yield await self.messages.get()
+
+
+class FakeRedis:
+    """Shared in-memory broker with the subset of the Redis API the relay uses."""
+
+    def __init__(self):
+        self.subscribers = []
+
+    async def publish(self, channel, data):
+        for pubsub in self.subscribers:
+            pubsub.messages.put_nowait({"type": "message", "data": data})
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def aclose(self):
+        pass
+
+
+class TestEventBus:
+    """Tests for EventBus."""
+
+    async def test_delivers_to_user_subscribers_only(self):
+        """Test that each user's streams get only that user's events."""
+        bus = EventBus(queue_size=4)
+
+        with bus.subscribe(USER_ID) as mine, bus.subscribe(OTHER_USER_ID) as theirs:
+            bus.publish(USER_ID, "reduced_mode.changed", state(True))
+
+            assert mine.get_nowait() == Event(
+                type="reduced_mode.changed",
+                data={"is_active": True, "activated_at": "2024-03-04T09:30:00Z", "deactivated_at": None}
+            )
+            assert theirs.empty()
+
+        assert bus.subscriber_count() == 0
+
+    async def test_slow_subscriber_loses_oldest(self):
+        """Test that a full queue drops its oldest event instead of blocking."""
+        bus = EventBus(queue_size=2)
+        dropped = events_module.events_dropped.value()
+
+        with bus.subscribe(USER_ID) as events:
+            for active in (True, False, True):
+                bus.publish(USER_ID, "reduced_mode.changed", state(active))
+
+            assert [events.get_nowait().data["is_active"] for _ in range(2)] == [False, True]
+
+        assert events_module.events_dropped.value() == dropped + 1
+
+    def test_sse_frame(self):
+        """Test the Server-Sent Events encoding."""
+        event = Event(type="session.ended", data={"id": "abc"})
+
+        assert event.sse() == b'event: session.ended\ndata: {"id":"abc"}\n\n'
+
+
+class TestRedisRelay:
+    """Tests for relaying events between workers."""
+
+    async def test_other_workers_receive_events(self):
+        """Test that an event published in one worker reaches another once."""
+        broker = FakeRedis()
+        worker_a = EventBus(queue_size=4, backend=RedisEventBackend(client=broker))
+        worker_b = EventBus(queue_size=4, backend=RedisEventBackend(client=broker))
+        await worker_a.start()
+        await worker_b.start()
+        await asyncio.sleep(0)
+
+        with worker_a.subscribe(USER_ID) as local, worker_b.subscribe(USER_ID) as remote:
+            worker_a.publish(USER_ID, "reduced_mode.changed", state(True))
+
+            relayed = await asyncio.wait_for(remote.get(), 1)
+            await asyncio.sleep(0.01)
+
+            assert relayed.data["is_active"] is True
+            assert local.qsize() == 1
+
+        await worker_a.aclose()
+        await worker_b.aclose()
+
+
+class TestServicePublishing:
+    """Tests that services announce state changes."""
+
+    async def test_abandon_publishes(self):
+        """Test that abandoning a session notifies the user's streams."""
+        service = SessionService(supabase=Mock())
+        row = session_row("abandoned")
+        service.supabase.rpc.return_value.execute = AsyncMock(return_value=Mock(data=[row]))
+
+        with event_bus.subscribe(USER_ID) as events:
+            await service.abandon_session(row["id"], USER_ID)
+
+            event = events.get_nowait()
+
+        assert event.type == "session.abandoned"
+        assert event.data["id"] == row["id"]
+        assert "user_id" not in event.data
+
+
+class TestEventsEndpoint:
+    """Tests for GET /me/events."""
+
+    async def test_snapshot_then_changes(self, monkeypatch):
+        """Test that the stream opens with current state and then relays changes."""
+        active = Session(**session_row("active"))
+        monkeypatch.setattr(session_service, "get_active_session", AsyncMock(return_value=active))
+        monkeypatch.setattr(reduced_mode_service, "get_reduced_mode_state", AsyncMock(return_value=None))
+
+        response = await stream_events(current_user=User(id=USER_ID, email="user@example.com"))
+        body = response.body_iterator
+
+        first = await anext(body)
+        event_bus.publish(USER_ID, "reduced_mode.changed", state(True))
+        second = await anext(body)
+        await body.aclose()
+
+        assert response.media_type == "text/event-stream"
+        assert first.startswith(b"retry: 3000\nevent: snapshot\ndata: ")
+        snapshot = orjson.loads(first.split(b"data: ", 1)[1])
+        assert snapshot["active_session"]["id"] == str(active.id)
+        assert snapshot["reduced_mode"] is None
+        assert second.startswith(b"event: reduced_mode.changed\n")
+        assert event_bus.subscriber_count() == 0
+
+    async def test_heartbeat(self, monkeypatch):
+        """Test that idle streams send keep-alive comments."""
+        monkeypatch.setattr(session_service, "get_active_session", AsyncMock(return_value=None))
+        monkeypatch.setattr(reduced_mode_service, "get_reduced_mode_state", AsyncMock(return_value=None))
+        monkeypatch.setattr("api.v1.me.settings.events_heartbeat", 0.01)
+
+        response = await stream_events(current_user=User(id=USER_ID, email="user@example.com"))
+        await anext(response.body_iterator)
+
+        assert await anext(response.body_iterator) == b": keepalive\n\n"
+        await response.body_iterator.aclose()
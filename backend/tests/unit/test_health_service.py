@@ -0,0 +1,137 @@
+"""
+Unit tests for health service.
+
+Tests readiness checks, result caching and the /health/ready endpoint.
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi.testclient import TestClient
+from main import app
+from services import health_service as health_module
+from services.health_service import HealthService
+
+
+def make_supabase(execute):
+    """Create a Supabase mock whose one-row read runs `execute`."""
+    supabase = MagicMock()
+    supabase.table.return_value.select.return_value.limit.return_value.execute = execute
+    return supabase
+
+
+class TestHealthService:
+    """Tests for HealthService."""
+
+    @pytest.mark.asyncio
+    async def test_ready_when_supabase_answers(self):
+        """Test that a successful read reports ready with its latency."""
+        service = HealthService(make_supabase(AsyncMock(return_value=MagicMock(data=[]))))
+
+        readiness, cached = await service.get_readiness()
+
+        assert readiness.ready
+        assert not cached
+        body = readiness.as_dict(cached)
+        assert body["status"] == "ready"
+        assert body["checks"]["supabase"]["status"] == "ok"
+        assert body["checks"]["supabase"]["latency_ms"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_unavailable_when_supabase_fails(self):
+        """Test that a failing read reports the error type."""
+        service = HealthService(make_supabase(AsyncMock(side_effect=ConnectionError("refused"))))
+
+        readiness, _ = await service.get_readiness()
+
+        assert not readiness.ready
+        check = readiness.as_dict(False)["checks"]["supabase"]
+        assert check == {"status": "error", "latency_ms": check["latency_ms"], "error": "ConnectionError"}
+
+    @pytest.mark.asyncio
+    async def test_unavailable_when_supabase_times_out(self):
+        """Test that a slow read counts as down."""
+        async def slow():
+            await asyncio.sleep(1)
+
+        service = HealthService(make_supabase(slow), timeout=0.01)
+
+        readiness, _ = await service.get_readiness()
+
+        assert not readiness.ready
+        assert readiness.checks[0].error == "timed out"
+
+    @pytest.mark.asyncio
+    async def test_result_cached_within_ttl(self):
+        """Test that probes within the TTL reuse the last result."""
+        execute = AsyncMock(return_value=MagicMock(data=[]))
+        service = HealthService(make_supabase(execute), cache_ttl=60)
+
+        await service.get_readiness()
+        readiness, cached = await service.get_readiness()
+
+        assert cached
+        assert readiness.ready
+        assert execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_rechecks_after_ttl(self):
+        """Test that an expired result triggers a new check."""
+        execute = AsyncMock(return_value=MagicMock(data=[]))
+        service = HealthService(make_supabase(execute), cache_ttl=0)
+
+        await service.get_readiness()
+        _, cached = await service.get_readiness()
+
+        assert not cached
+        assert execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_probes_share_one_check(self):
+        """Test that a probe storm makes a single Supabase call."""
+        calls = 0
+
+        async def execute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+
+        service = HealthService(make_supabase(execute), cache_ttl=60)
+
+        results = await asyncio.gather(*(service.get_readiness() for _ in range(20)))
+
+        assert calls == 1
+        assert all(readiness.ready for readiness, _ in results)
+
+
+class TestReadinessEndpoint:
+    """Tests for GET /health/ready."""
+
+    def test_ready(self, monkeypatch):
+        """Test that a reachable Supabase returns 200."""
+        service = HealthService(make_supabase(AsyncMock(return_value=MagicMock(data=[]))))
+        monkeypatch.setattr("main.health_service", service)
+
+        response = TestClient(app).get("/health/ready")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+    def test_unavailable(self, monkeypatch):
+        """Test that an unreachable Supabase returns 503."""
+        service = HealthService(make_supabase(AsyncMock(side_effect=ConnectionError("refused"))))
+        monkeypatch.setattr("main.health_service", service)
+
+        response = TestClient(app).get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "unavailable"
+
+    def test_liveness_makes_no_dependency_calls(self, monkeypatch):
+        """Test that /health stays healthy without touching Supabase."""
+        get_readiness = AsyncMock()
+        monkeypatch.setattr(health_module.health_service, "get_readiness", get_readiness)
+
+        response = TestClient(app).get("/health")
+
+        assert response.status_code == 200
+        get_readiness.assert_not_awaited()
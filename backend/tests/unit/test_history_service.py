@@ -0,0 +1,181 @@
+"""
+Unit tests for history service.
+
+Tests paged NDJSON export and batched, re-runnable NDJSON import.
+"""
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+import httpx
+import pytest
+from benchmarks.fake_postgrest import CALM_SETUP_ID, REDUCED_SETUP_ID, create_app
+from services.history_service import HistoryService
+from services.supabase_client import SupabaseClient
+
+USER_ID = "550e8400-e29b-41d4-a716-446655440000"
+OTHER_USER_ID = "770e8400-e29b-41d4-a716-446655440000"
+NOW = datetime(2024, 3, 4, 9, 30, tzinfo=timezone.utc).isoformat()
+
+
+def session_row(**overrides) -> dict:
+    row = {
+        "id": str(uuid4()),
+        "user_id": USER_ID,
+        "setup_id": str(uuid4()),
+        "start_time": NOW,
+        "end_time": NOW,
+        "duration_minutes": 25,
+        "next_step": None,
+        "status": "completed",
+        "reduced_mode_active": False,
+        "created_at": NOW,
+        "updated_at": NOW,
+    }
+    return {**row, **overrides}
+
+
+def ndjson(*records) -> bytes:
+    return b"".join(json.dumps(record).encode() + b"\n" for record in records)
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def mock_tables(service, pages=None):
+    """Give every table a chainable builder; sessions reads return pages in turn."""
+    builders = {}
+
+    def table(name):
+        if name not in builders:
+            builder = Mock()
+            for method in ("select", "eq", "order", "lte", "or_", "limit"):
+                getattr(builder, method).return_value = builder
+            if name == "sessions" and pages is not None:
+                builder.execute = AsyncMock(side_effect=[Mock(data=page) for page in pages])
+            else:
+                builder.execute = AsyncMock(return_value=Mock(data=[]))
+            writer = Mock()
+            writer.execute = AsyncMock(side_effect=lambda: Mock(data=builder.upsert.call_args.args[0]))
+            builder.upsert.return_value = writer
+            builders[name] = builder
+        return builders[name]
+
+    service.supabase.table.side_effect = table
+    return builders
+
+
+class TestExportHistory:
+    """Tests for export_history function."""
+
+    async def test_pages_with_keyset_cursor(self):
+        """Test that full pages seek past their last row and lines carry the table."""
+        service = HistoryService(supabase=Mock(), batch_size=2)
+        first, second = [session_row(), session_row()], [session_row()]
+        builders = mock_tables(service, pages=[first, second])
+
+        output = b"".join([chunk async for chunk in service.export_history(USER_ID)])
+
+        lines = [json.loads(line) for line in output.splitlines()]
+        assert [line["row"]["id"] for line in lines] == [row["id"] for row in first + second]
+        assert {line["table"] for line in lines} == {"sessions"}
+        assert builders["sessions"].execute.await_count == 2
+        builders["sessions"].or_.assert_called_once()
+        assert first[1]["id"] in builders["sessions"].or_.call_args.args[0]
+        builders["sessions"].eq.assert_called_with("user_id", USER_ID)
+
+    async def test_read_failure_ends_stream(self):
+        """Test that a failed page read propagates to the caller."""
+        service = HistoryService(supabase=Mock(), batch_size=2)
+        mock_tables(service)
+        service.supabase.table("user_setups").execute.side_effect = Exception("timeout")
+
+        with pytest.raises(Exception, match="timeout"):
+            [chunk async for chunk in service.export_history(USER_ID)]
+
+
+class TestImportHistory:
+    """Tests for import_history function."""
+
+    async def test_batches_and_reassigns_owner(self):
+        """Test that rows are written in batches under the importing user."""
+        service = HistoryService(supabase=Mock(), batch_size=2)
+        builders = mock_tables(service)
+        rows = [session_row(user_id=OTHER_USER_ID) for _ in range(3)]
+        data = ndjson(*({"table": "sessions", "row": row} for row in rows))
+
+        result = await service.import_history(USER_ID, chunked(data, 7))
+
+        assert result.imported["sessions"] == 3
+        assert result.skipped == 0
+        upserts = builders["sessions"].upsert.call_args_list
+        assert [len(call.args[0]) for call in upserts] == [2, 1]
+        assert {row["user_id"] for call in upserts for row in call.args[0]} == {USER_ID}
+        assert upserts[0].kwargs == {"ignore_duplicates": True, "on_conflict": "id"}
+
+    async def test_skips_invalid_lines(self):
+        """Test that bad lines are counted and reported without stopping the import."""
+        service = HistoryService(supabase=Mock())
+        mock_tables(service)
+        data = ndjson(
+            {"table": "sessions", "row": session_row()},
+            {"table": "notes", "row": {}},
+            {"table": "sessions", "row": session_row(status="active")},
+            {"table": "sessions", "row": session_row(duration_minutes="long")},
+        ) + b"not json\n"
+
+        result = await service.import_history(USER_ID, chunked(data, 64))
+
+        assert result.imported["sessions"] == 1
+        assert result.skipped == 4
+        assert result.errors[0] == "Line 2: unknown table 'notes'"
+        assert result.errors[1] == "Line 3: active sessions are not imported"
+        assert result.errors[2] == "Line 4: invalid row"
+        assert result.errors[3].startswith("Line 5: ")
+
+    async def test_existing_rows_are_not_counted(self):
+        """Test that rows ignored as duplicates do not count as imported."""
+        service = HistoryService(supabase=Mock())
+        mock_tables(service)
+        builder = service.supabase.table("daily_checks")
+        builder.upsert.return_value.execute = AsyncMock(return_value=Mock(data=[]))
+        row = {
+            "id": str(uuid4()),
+            "user_id": USER_ID,
+            "check_date": "2024-03-04",
+            "responses": {"energy": "medium"},
+            "completed_at": NOW,
+            "created_at": NOW,
+        }
+
+        result = await service.import_history(USER_ID, chunked(ndjson({"table": "daily_checks", "row": row}), 1024))
+
+        assert result.imported["daily_checks"] == 0
+        assert builder.upsert.call_args.kwargs["on_conflict"] == "user_id,check_date"
+
+    async def test_reimport_against_stand_in(self):
+        """Test that an import with several setup activations can be sent twice."""
+        http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(latency_ms=0)))
+        supabase = SupabaseClient("http://stand-in", "service-key", http_client=http_client)
+        service = HistoryService(supabase=supabase)
+        activations = [
+            {"id": str(uuid4()), "user_id": USER_ID, "setup_id": setup_id, "activated_at": NOW, "created_at": NOW}
+            for setup_id in (CALM_SETUP_ID, REDUCED_SETUP_ID)
+        ]
+        data = ndjson(
+            *({"table": "user_setups", "row": row} for row in activations),
+            {"table": "sessions", "row": session_row(setup_id=CALM_SETUP_ID)},
+        )
+
+        try:
+            first = await service.import_history(USER_ID, chunked(data, 256))
+            second = await service.import_history(USER_ID, chunked(data, 256))
+            stored = await supabase.table("user_setups").select("id").eq("user_id", USER_ID).execute()
+        finally:
+            await supabase.aclose()
+
+        assert first.imported == {"user_setups": 2, "sessions": 1, "daily_checks": 0, "weekly_checks": 0}
+        assert second.imported == {"user_setups": 0, "sessions": 0, "daily_checks": 0, "weekly_checks": 0}
+        assert {row["id"] for row in stored.data} == {row["id"] for row in activations}
@@ -0,0 +1,179 @@
+"""
+Unit tests for Idempotency-Key support.
+
+Tests the memory and Redis-compatible stores and that retried requests are
+answered from the store without reaching the route.
+"""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+from uuid import uuid4
+import pytest
+from jose import jwt
+from models.session import Session
+from services.auth_service import auth_service
+from services.idempotency import IdempotencyStore, MemoryIdempotencyStore, RedisIdempotencyStore, StoredResponse
+from services.session_service import session_service
+
+USER_ID = "550e8400-e29b-41d4-a716-446655440000"
+SETUP_ID = "660e8400-e29b-41d4-a716-446655440000"
+
+
+def stored(body: bytes = b'{"id": 1}') -> StoredResponse:
+    return StoredResponse(
+        fingerprint="abc",
+        status_code=201,
+        headers=[(b"content-type", b"application/json")],
+        body=body
+    )
+
+
+class FakeRedis:
+    """Dict-backed client with the subset of the Redis API the store uses."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request):
+    """Each store implementation."""
+    if request.param == "memory":
+        return MemoryIdempotencyStore(maxsize=10, ttl=60, claim_ttl=5)
+    return RedisIdempotencyStore(ttl=60, claim_ttl=5, client=FakeRedis())
+
+
+class TestStores:
+    """Tests shared by the store implementations."""
+
+    async def test_claim_save_get(self, store):
+        """Test that a claimed key blocks others until its response is stored."""
+        assert await store.claim("k")
+        assert not await store.claim("k")
+        assert await store.get("k") is None
+
+        await store.save("k", stored())
+
+        assert await store.get("k") == stored()
+        assert not await store.claim("k")
+
+    async def test_release(self, store):
+        """Test that a released claim can be taken again."""
+        assert await store.claim("k")
+        await store.release("k")
+
+        assert await store.claim("k")
+
+    def test_serialization_round_trip(self):
+        """Test that non-UTF-8 bodies survive an external store."""
+        response = stored(body=b"\xff\x00")
+
+        assert StoredResponse.loads(response.dumps()) == response
+
+    def test_incomplete_store_is_rejected(self):
+        """Test that a store missing part of the interface cannot be created."""
+        class GetOnlyStore(IdempotencyStore):
+            async def get(self, key):
+                return None
+
+        with pytest.raises(TypeError):
+            GetOnlyStore()
+
+
+class TestIdempotencyMiddleware:
+    """Tests for replaying POST /sessions."""
+
+    @pytest.fixture
+    def headers(self):
+        """Bearer token and a fresh Idempotency-Key."""
+        token = jwt.encode({
+            "sub": USER_ID,
+            "email": "user@example.com",
+            "aud": "authenticated",
+            "exp": datetime.now(timezone.utc) + timedelta(hours=1),
+        }, auth_service.jwt_secret, algorithm="HS256")
+        return {"Authorization": f"Bearer {token}", "Idempotency-Key": uuid4().hex}
+
+    @pytest.fixture
+    def start_session(self, monkeypatch):
+        """Count start_session calls."""
+        now = datetime.now(timezone.utc)
+        mock = AsyncMock(return_value=Session(
+            id=uuid4(),
+            user_id=USER_ID,
+            setup_id=SETUP_ID,
+            start_time=now,
+            duration_minutes=25,
+            status="active",
+            created_at=now,
+            updated_at=now
+        ))
+        monkeypatch.setattr(session_service, "start_session", mock)
+        return mock
+
+    def test_retry_is_replayed(self, client, headers, start_session):
+        """Test that a retry gets the first response without running again."""
+        first = client.post("/api/v1/sessions", json={"setup_id": SETUP_ID}, headers=headers)
+        retry = client.post("/api/v1/sessions", json={"setup_id": SETUP_ID}, headers=headers)
+
+        assert first.status_code == retry.status_code == 201
+        assert retry.content == first.content
+        assert retry.headers["idempotent-replayed"] == "true"
+        assert "idempotent-replayed" not in first.headers
+        assert retry.headers["x-request-id"] != first.headers["x-request-id"]
+        start_session.assert_awaited_once()
+
+    def test_key_reused_for_other_request(self, client, headers, start_session):
+        """Test that a key cannot be replayed against a different body."""
+        client.post("/api/v1/sessions", json={"setup_id": SETUP_ID}, headers=headers)
+
+        response = client.post("/api/v1/sessions", json={"setup_id": str(uuid4())}, headers=headers)
+
+        assert response.status_code == 422
+        start_session.assert_awaited_once()
+
+    def test_failures_are_not_stored(self, client, headers, start_session):
+        """Test that a failed request can be retried with the same key."""
+        start_session.side_effect = [Exception("timeout"), start_session.return_value]
+
+        first = client.post("/api/v1/sessions", json={"setup_id": SETUP_ID}, headers=headers)
+        retry = client.post("/api/v1/sessions", json={"setup_id": SETUP_ID}, headers=headers)
+
+        assert first.status_code == 400
+        assert retry.status_code == 201
+        assert start_session.await_count == 2
+
+    def test_without_key(self, client, headers, start_session):
+        """Test that requests without a key always run."""
+        del headers["Idempotency-Key"]
+
+        client.post("/api/v1/sessions", json={"setup_id": SETUP_ID}, headers=headers)
+        client.post("/api/v1/sessions", json={"setup_id": SETUP_ID}, headers=headers)
+
+        assert start_session.await_count == 2
+
+    def test_streamed_body_is_not_buffered(self, client, headers, start_session):
+        """Test that a chunked body without a Content-Length runs as usual."""
+        def chunks():
+            yield b'{"setup_id": '
+            yield f'"{SETUP_ID}"}}'.encode()
+
+        headers["Content-Type"] = "application/json"
+        first = client.post("/api/v1/sessions", content=chunks(), headers=headers)
+        retry = client.post("/api/v1/sessions", content=chunks(), headers=headers)
+
+        assert "content-length" not in first.request.headers
+        assert first.status_code == retry.status_code == 201
+        assert "idempotent-replayed" not in retry.headers
+        assert start_session.await_count == 2
@@ -0,0 +1,129 @@
+"""
+Unit tests for logging configuration.
+
+Tests the queued pipeline, JSON encoding and per-logger sampling.
+"""
+import io
+import json
+import logging
+import queue
+import sys
+from config.logging import (
+    JSONFormatter,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    _parse_sample_rates,
+    create_queue_pipeline,
+    fast_dumps,
+)
+from services.request_context import current_request_id, request_scope
+
+
+def make_record(name="test", level=logging.INFO, msg="hello", args=None, exc_info=None):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, exc_info)
+
+
+class TestJSONFormatter:
+    """Tests for JSONFormatter."""
+
+    def test_encodes_fields(self):
+        """Test that the message and extra fields are encoded."""
+        record = make_record(msg="user %s", args=("abc",))
+        record.status = 200
+
+        data = json.loads(JSONFormatter().format(record))
+
+        assert data["message"] == "user abc"
+        assert data["status"] == 200
+        assert data["level"] == "INFO"
+
+    def test_unknown_types_are_stringified(self):
+        """Test that values orjson can't encode fall back to str."""
+        assert fast_dumps({"value": object}) == '{"value":"<class \'object\'>"}'
+
+
+class TestSamplingFilter:
+    """Tests for SamplingFilter."""
+
+    def test_keeps_one_in_n(self):
+        """Test that a sampled logger keeps a fixed fraction of INFO records."""
+        sampler = SamplingFilter({"services.auth_service.tokens": 0.1})
+
+        kept = [sampler.filter(make_record("services.auth_service.tokens")) for _ in range(100)]
+
+        assert sum(kept) == 10
+
+    def test_kept_records_carry_rate(self):
+        """Test that kept records are annotated for downstream scaling."""
+        record = make_record("noisy")
+
+        assert SamplingFilter({"noisy": 0.5}).filter(record)
+        assert record.sample_rate == 0.5
+
+    def test_applies_to_child_loggers(self):
+        """Test that a rate covers loggers below the configured name."""
+        sampler = SamplingFilter({"services": 0})
+
+        assert not sampler.filter(make_record("services.auth_service"))
+        assert sampler.filter(make_record("api.v1.auth"))
+
+    def test_warnings_never_sampled(self):
+        """Test that records above INFO always pass."""
+        sampler = SamplingFilter({"noisy": 0})
+
+        assert sampler.filter(make_record("noisy", level=logging.WARNING))
+
+    def test_parse_sample_rates(self):
+        """Test parsing of the LOG_SAMPLE_RATES setting."""
+        assert _parse_sample_rates("a.b=0.01, c=0.5,") == {"a.b": 0.01, "c": 0.5}
+        assert _parse_sample_rates("") == {}
+
+
+class TestQueuePipeline:
+    """Tests for the queued logging pipeline."""
+
+    def test_records_written_by_listener(self):
+        """Test that records reach the output handler with request context."""
+        stream = io.StringIO()
+        output = logging.StreamHandler(stream)
+        output.setFormatter(JSONFormatter())
+        handler, listener = create_queue_pipeline(output, {}, 100, current_request_id)
+        logger = logging.getLogger("test.pipeline")
+        logger.addHandler(handler)
+        logger.propagate = False
+
+        listener.start()
+        try:
+            with request_scope("req-9"):
+                logger.info("queued")
+        finally:
+            listener.stop()
+            logger.removeHandler(handler)
+
+        data = json.loads(stream.getvalue())
+        assert data["message"] == "queued"
+        assert data["request_id"] == "req-9"
+
+    def test_drops_when_full(self):
+        """Test that a full queue drops records instead of blocking."""
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+
+        handler.handle(make_record())
+        handler.handle(make_record())
+
+        assert handler.log_queue.qsize() == 1
+        assert handler.dropped == 1
+
+    def test_prepare_renders_exceptions(self):
+        """Test that tracebacks are rendered before crossing threads."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = make_record(level=logging.ERROR, msg="failed %d", args=(1,), exc_info=sys.exc_info())
+
+        prepared = NonBlockingQueueHandler(queue.Queue()).prepare(record)
+
+        assert prepared.msg == "failed 1"
+        assert prepared.exc_info is None
+        assert "ValueError: boom" in json.loads(JSONFormatter().format(prepared))["exception"]
+        assert record.exc_info is not None
@@ -0,0 +1,156 @@
+"""
+Unit tests for Prometheus metrics.
+
+Tests the exposition format, histogram buckets, route and Supabase call
+labels, and the /metrics endpoint.
+"""
+import asyncio
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from config import settings
+from main import app
+from middleware.request_timing import RequestTimingMiddleware
+from services import metrics
+from services.supabase_client import SupabaseClient, create_http_client
+
+
+class TestExpositionFormat:
+    """Tests for metric rendering."""
+
+    def test_counter_renders_total_family(self):
+        """Test that counters expose the _total family with labels."""
+        counter = metrics.Counter("test_events", "Events seen.", ("kind",))
+        counter.inc("a")
+        counter.inc("a", amount=2)
+
+        rendered = counter.render()
+
+        assert "# TYPE test_events_total counter" in rendered
+        assert 'test_events_total{kind="a"} 3' in rendered
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that bucket counts accumulate up to +Inf."""
+        histogram = metrics.Histogram("test_latency", "Latency.", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, "/x")
+
+        rendered = histogram.render()
+
+        assert 'test_latency_bucket{route="/x",le="0.1"} 1' in rendered
+        assert 'test_latency_bucket{route="/x",le="1"} 3' in rendered
+        assert 'test_latency_bucket{route="/x",le="+Inf"} 4' in rendered
+        assert 'test_latency_count{route="/x"} 4' in rendered
+        assert 'test_latency_sum{route="/x"} 6.05' in rendered
+
+    def test_label_values_are_escaped(self):
+        """Test that quotes and backslashes in label values are escaped."""
+        gauge = metrics.Gauge("test_gauge", "Gauge.", ("path",))
+        gauge.set(1, 'a"b\\c')
+
+        assert 'test_gauge{path="a\\"b\\\\c"} 1' in gauge.render()
+
+    def test_registry_includes_process_metrics(self):
+        """Test that the default registry reports process statistics."""
+        rendered = metrics.registry.render()
+
+        assert "process_resident_memory_bytes " in rendered
+        assert "process_cpu_seconds_total " in rendered
+        assert "makana_worker_info{pid=" in rendered
+
+
+class TestSupabaseCallLabels:
+    """Tests for supabase_call_labels."""
+
+    @pytest.mark.parametrize("method,path,prefer,expected", [
+        ("GET", "/rest/v1/sessions", "", ("sessions", "select")),
+        ("POST", "/rest/v1/daily_checks", "return=representation", ("daily_checks", "insert")),
+        ("POST", "/rest/v1/reduced_mode_state", "resolution=merge-duplicates", ("reduced_mode_state", "upsert")),
+        ("PATCH", "/rest/v1/sessions", "", ("sessions", "update")),
+        ("POST", "/rest/v1/rpc/week_stats", "", ("week_stats", "rpc")),
+        ("GET", "/auth/v1/user", "", ("auth", "user")),
+    ])
+    def test_labels(self, method, path, prefer, expected):
+        """Test table and operation labels per request shape."""
+        assert metrics.supabase_call_labels(method, path, prefer) == expected
+
+    def test_transport_records_calls_and_errors(self):
+        """Test that pooled Supabase calls feed the histogram and error counter."""
+        http_client = create_http_client()
+        http_client._transport._transport = httpx.MockTransport(
+            lambda request: httpx.Response(500 if "rpc" in request.url.path else 200, json=[])
+        )
+        supabase = SupabaseClient("https://example.supabase.co", "test-key", http_client=http_client)
+        before = metrics.supabase_call_duration.count("metrics_probe", "select")
+        errors = metrics.supabase_call_errors.value("metrics_fail", "rpc")
+
+        async def calls():
+            await supabase.table("metrics_probe").select("id").execute()
+            try:
+                await supabase.rpc("metrics_fail", {}).execute()
+            except Exception:
+                pass
+
+        asyncio.run(calls())
+
+        assert metrics.supabase_call_duration.count("metrics_probe", "select") == before + 1
+        assert metrics.supabase_call_errors.value("metrics_fail", "rpc") == errors + 1
+
+
+class TestRouteHistogram:
+    """Tests for per-route request metrics."""
+
+    def test_requests_labelled_by_route_template(self):
+        """Test that path parameters collapse into the route template."""
+        test_app = FastAPI()
+        test_app.add_middleware(RequestTimingMiddleware)
+
+        @test_app.get("/metrics-items/{item_id}")
+        async def item(item_id: str):
+            return {"id": item_id}
+
+        client = TestClient(test_app)
+        before = metrics.http_request_duration.count("GET", "/metrics-items/{item_id}", "200")
+
+        client.get("/metrics-items/1")
+        client.get("/metrics-items/2")
+
+        assert metrics.http_request_duration.count("GET", "/metrics-items/{item_id}", "200") == before + 2
+        assert metrics.http_requests_in_flight.value() == 0
+
+    def test_unmatched_paths_share_one_label(self):
+        """Test that unknown paths don't create a series each."""
+        test_app = FastAPI()
+        test_app.add_middleware(RequestTimingMiddleware)
+        client = TestClient(test_app)
+        before = metrics.http_request_duration.count("GET", "unmatched", "404")
+
+        client.get("/nope/1")
+        client.get("/nope/2")
+
+        assert metrics.http_request_duration.count("GET", "unmatched", "404") == before + 2
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
+
+    def test_exposes_metrics(self):
+        """Test that the endpoint serves the text exposition format."""
+        client = TestClient(app)
+        client.get("/health")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'makana_http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+        assert "makana_jwt_cache_hits_total" in response.text
+
+    def test_disabled(self, monkeypatch):
+        """Test that the endpoint is hidden when metrics are disabled."""
+        monkeypatch.setattr(settings, "metrics_enabled", False)
+
+        response = TestClient(app).get("/metrics")
+
+        assert response.status_code == 404
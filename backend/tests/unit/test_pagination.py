@@ -0,0 +1,115 @@
+"""
+Unit tests for keyset pagination.
+
+Tests cursor encoding and the PostgREST queries built from cursors.
+"""
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+import httpx
+import pytest
+from services.pagination import decode_cursor, encode_cursor, next_cursor
+from services.session_service import SessionService
+from services.supabase_client import SupabaseClient
+
+USER_ID = "550e8400-e29b-41d4-a716-446655440000"
+ROW_ID = "770e8400-e29b-41d4-a716-446655440000"
+
+
+class TestCursor:
+    """Tests for cursor encoding."""
+
+    def test_round_trip(self):
+        """Test that a cursor decodes to the row position it encodes."""
+        created_at = datetime(2024, 1, 15, 9, 30, 0, 123456, tzinfo=timezone.utc)
+
+        cursor = encode_cursor(created_at, ROW_ID)
+
+        assert decode_cursor(cursor) == ("2024-01-15T09:30:00.123456+00:00", ROW_ID)
+
+    def test_date_round_trip(self):
+        """Test that date sort values are supported."""
+        assert decode_cursor(encode_cursor(date(2024, 1, 15), ROW_ID)) == ("2024-01-15", ROW_ID)
+
+    @pytest.mark.parametrize("cursor", [
+        "not-a-cursor",
+        encode_cursor("2024-01-15", "not-a-uuid"),
+        encode_cursor('2024-01-15",id.gt.0', ROW_ID),
+    ])
+    def test_invalid_cursor_raises(self, cursor):
+        """Test that malformed or tampered cursors are rejected."""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(cursor)
+
+
+class TestNextCursor:
+    """Tests for next_cursor function."""
+
+    def test_full_page_has_next_cursor(self):
+        """Test that a full page points past its last row."""
+        rows = [
+            SimpleNamespace(id=f"770e8400-e29b-41d4-a716-44665544000{i}", check_date=date(2024, 1, 20 - i))
+            for i in range(2)
+        ]
+
+        cursor = next_cursor(rows, 2, lambda row: row.check_date)
+
+        assert decode_cursor(cursor) == ("2024-01-19", rows[1].id)
+
+    def test_short_page_is_last(self):
+        """Test that a partial page has no next cursor."""
+        rows = [SimpleNamespace(id=ROW_ID, check_date=date(2024, 1, 20))]
+
+        assert next_cursor(rows, 2, lambda row: row.check_date) is None
+        assert next_cursor([], 2, lambda row: row.check_date) is None
+
+
+class TestRecentSessionsQuery:
+    """Tests for the queries get_recent_sessions sends."""
+
+    @pytest.fixture
+    def requests(self):
+        """Capture requests sent by a real client."""
+        return []
+
+    @pytest.fixture
+    def session_service(self, requests):
+        """Create session service over a recording HTTP transport."""
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=[])
+
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        supabase = SupabaseClient("https://example.supabase.co", "test-key", http_client=http_client)
+        yield SessionService(supabase=supabase)
+
+    async def test_cursor_seeks_instead_of_offset(self, session_service, requests):
+        """Test that a cursor page filters on (created_at, id) with no offset."""
+        cursor = encode_cursor("2024-01-15T09:30:00+00:00", ROW_ID)
+
+        await session_service.get_recent_sessions(USER_ID, limit=20, cursor=cursor)
+
+        params = requests[0].url.params
+        assert params["order"] == "created_at.desc,id.desc"
+        # Sargable bound for the index range read, then the exact tie-break
+        assert params["created_at"] == "lte.2024-01-15T09:30:00+00:00"
+        assert params["or"] == (
+            '(created_at.lt."2024-01-15T09:30:00+00:00",'
+            f'and(created_at.eq."2024-01-15T09:30:00+00:00",id.lt.{ROW_ID}))'
+        )
+        assert params["limit"] == "20"
+        assert "offset" not in params
+
+    async def test_offset_paging_still_supported(self, session_service, requests):
+        """Test that offset paging is unchanged without a cursor."""
+        await session_service.get_recent_sessions(USER_ID, limit=20, offset=40)
+
+        params = requests[0].url.params
+        assert params["offset"] == "40"
+        assert "or" not in params
+
+    async def test_invalid_cursor_raises(self, session_service, requests):
+        """Test that an invalid cursor is reported rather than an empty page."""
+        with pytest.raises(ValueError):
+            await session_service.get_recent_sessions(USER_ID, cursor="bogus")
+
+        assert requests == []
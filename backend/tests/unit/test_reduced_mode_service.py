@@ -0,0 +1,95 @@
+"""
+Unit tests for reduced mode service.
+
+Runs the toggles against the local Supabase stand-in, so concurrent calls
+interleave at the HTTP layer as they would against PostgREST.
+"""
+import asyncio
+from uuid import uuid4
+import httpx
+import pytest
+from benchmarks.fake_postgrest import create_app
+from services.events import event_bus
+from services.reduced_mode_service import ReducedModeService
+from services.supabase_client import SupabaseClient
+from services.user_state import user_state
+
+
+@pytest.fixture
+async def service():
+    """Reduced mode service backed by an in-process stand-in."""
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(latency_ms=5)))
+    supabase = SupabaseClient("http://stand-in", "service-key", http_client=http_client)
+    yield ReducedModeService(supabase=supabase)
+    await supabase.aclose()
+
+
+async def stored_rows(service, user_id):
+    result = await service.supabase.table("reduced_mode_states").select("id").eq(
+        "user_id", user_id
+    ).execute()
+    return result.data
+
+
+class TestReducedModeToggles:
+    """Tests for activate_reduced_mode and deactivate_reduced_mode."""
+
+    async def test_parallel_first_toggles_create_one_row(self, service):
+        """Test that concurrent first-time toggles upsert a single state row."""
+        user_id = str(uuid4())
+        toggles = [
+            service.activate_reduced_mode(user_id) if i % 2 else service.deactivate_reduced_mode(user_id)
+            for i in range(10)
+        ]
+
+        states = await asyncio.gather(*toggles)
+
+        assert [state.is_active for state in states] == [bool(i % 2) for i in range(10)]
+        assert len({state.id for state in states}) == 1
+        assert len(await stored_rows(service, user_id)) == 1
+
+    async def test_repeated_activation_is_noop(self, service):
+        """Test that activating an active state keeps its activation time."""
+        user_id = str(uuid4())
+        first = await service.activate_reduced_mode(user_id)
+
+        repeats = await asyncio.gather(*(service.activate_reduced_mode(user_id) for _ in range(5)))
+
+        assert {(state.activated_at, state.updated_at) for state in repeats} == {
+            (first.activated_at, first.updated_at)
+        }
+
+    async def test_deactivate_keeps_activation_time(self, service):
+        """Test that turning reduced mode off records when, keeping activated_at."""
+        user_id = str(uuid4())
+        activated = await service.activate_reduced_mode(user_id)
+
+        state = await service.deactivate_reduced_mode(user_id)
+
+        assert state.is_active is False
+        assert state.activated_at == activated.activated_at
+        assert state.deactivated_at is not None
+
+    async def test_repeated_activation_publishes_once(self, service):
+        """Test that only a toggle that changes the state notifies other devices."""
+        user_id = str(uuid4())
+
+        with event_bus.subscribe(user_id) as events:
+            for _ in range(3):
+                await service.activate_reduced_mode(user_id)
+            await service.deactivate_reduced_mode(user_id)
+
+            changes = [events.get_nowait().data["is_active"] for _ in range(events.qsize())]
+
+        assert changes == [True, False]
+
+    async def test_uncached_repeat_does_not_publish(self, service):
+        """Test that the database, not the cache, decides whether a toggle changed anything."""
+        user_id = str(uuid4())
+        await service.activate_reduced_mode(user_id)
+        user_state.clear()
+
+        with event_bus.subscribe(user_id) as events:
+            await service.activate_reduced_mode(user_id)
+
+            assert events.empty()
@@ -0,0 +1,102 @@
+"""
+Unit tests for request timing middleware.
+
+Tests request IDs, Server-Timing headers and Supabase call attribution.
+"""
+import asyncio
+import json
+import logging
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from config.logging import JSONFormatter, RequestContextFilter
+from middleware.request_timing import RequestTimingMiddleware
+from services.request_context import current_request, current_request_id, request_scope
+from services.supabase_client import SupabaseClient, create_http_client
+
+
+@pytest.fixture
+def supabase():
+    """Create a pooled client whose network layer is mocked."""
+    http_client = create_http_client()
+    http_client._transport._transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, json=[])
+    )
+    yield SupabaseClient("https://example.supabase.co", "test-key", http_client=http_client)
+
+
+@pytest.fixture
+def client(supabase):
+    """Create an app with two table reads and one RPC per request."""
+    app = FastAPI()
+    app.add_middleware(RequestTimingMiddleware)
+
+    @app.get("/fan-out")
+    async def fan_out():
+        await asyncio.gather(
+            supabase.table("sessions").select("id").execute(),
+            supabase.table("setups").select("id").execute(),
+        )
+        await supabase.rpc("week_stats", {}).execute()
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+class TestRequestTimingMiddleware:
+    """Tests for RequestTimingMiddleware."""
+
+    def test_generates_request_id(self, client):
+        """Test that each response carries a new request ID."""
+        first = client.get("/fan-out").headers["X-Request-ID"]
+        second = client.get("/fan-out").headers["X-Request-ID"]
+
+        assert len(first) == 32
+        assert first != second
+
+    def test_reuses_valid_incoming_request_id(self, client):
+        """Test that a well-formed caller request ID is propagated."""
+        response = client.get("/fan-out", headers={"X-Request-ID": "edge-1234"})
+
+        assert response.headers["X-Request-ID"] == "edge-1234"
+
+    def test_replaces_malformed_request_id(self, client):
+        """Test that unsafe caller request IDs are not echoed."""
+        response = client.get("/fan-out", headers={"X-Request-ID": "bad id\"<>"})
+
+        assert response.headers["X-Request-ID"] != "bad id\"<>"
+
+    def test_server_timing_breaks_down_supabase_calls(self, client):
+        """Test that concurrent Supabase calls are counted per kind."""
+        timing = client.get("/fan-out").headers["Server-Timing"]
+
+        assert 'db;dur=' in timing and 'desc="2 calls"' in timing
+        assert 'rpc;dur=' in timing and 'desc="1 call"' in timing
+        assert "app;dur=" in timing
+
+    def test_logs_structured_fields(self, client, caplog):
+        """Test that the request summary carries timing fields."""
+        with caplog.at_level(logging.INFO, logger="middleware.request_timing"):
+            response = client.get("/fan-out")
+
+        record = caplog.records[-1]
+        assert record.request_id == response.headers["X-Request-ID"]
+        assert record.route == "/fan-out"
+        assert record.status == 200
+        assert record.supabase_calls == 3
+        assert record.duration_ms >= record.supabase_ms / 3
+
+
+class TestRequestContextLogging:
+    """Tests for request-scoped log fields."""
+
+    def test_filter_stamps_request_id(self):
+        """Test that records inside a request get its ID in JSON logs."""
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "hello", None, None)
+
+        with request_scope("req-1"):
+            RequestContextFilter(current_request_id).filter(record)
+
+        assert json.loads(JSONFormatter().format(record))["request_id"] == "req-1"
+        assert current_request() is None
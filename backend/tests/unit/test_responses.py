@@ -0,0 +1,145 @@
+"""
+Unit tests for JSON responses.
+
+Tests that model_response produces the same bodies as FastAPI's default
+serialization for UUID, datetime and date fields, and that routes keep
+their status codes and headers.
+"""
+import json
+from datetime import date, datetime, timezone
+from typing import Any, List
+from unittest.mock import AsyncMock
+from uuid import uuid4
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from api.responses import ModelJSONResponse, model_response
+from config import settings
+from dependencies.auth import get_current_user
+from main import app
+from models.daily_check import DailyCheckResponse
+from models.session import Session, SessionResponse
+from models.user import User
+from models.weekly_check import WeeklyCheckResponse
+from services.session_service import session_service
+
+USER_ID = "550e8400-e29b-41d4-a716-446655440000"
+NOW = datetime(2024, 3, 4, 9, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def session_response() -> SessionResponse:
+    return SessionResponse(
+        id=uuid4(),
+        setup_id=uuid4(),
+        start_time=NOW,
+        end_time=None,
+        duration_minutes=25,
+        next_step="Review notes",
+        status="completed",
+        reduced_mode_active=False
+    )
+
+
+def daily_check_response() -> DailyCheckResponse:
+    return DailyCheckResponse(
+        id=uuid4(),
+        check_date=date(2024, 3, 4),
+        responses={"energy": "medium", "intention": "Focus"},
+        completed_at=NOW
+    )
+
+
+def weekly_check_response() -> WeeklyCheckResponse:
+    return WeeklyCheckResponse(
+        id=uuid4(),
+        week_start_date=date(2024, 3, 4),
+        week_end_date=date(2024, 3, 10),
+        responses={"capacity": "good"},
+        completed_at=NOW
+    )
+
+
+async def fastapi_body(model: Any, content: Any) -> bytes:
+    """Serialize content the way FastAPI does for a response_model."""
+    field = create_response_field(name="response", type_=model)
+    return JSONResponse(await serialize_response(field=field, response_content=content, is_coroutine=True)).body
+
+
+class TestModelResponse:
+    """Tests for model_response."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("fast", [True, False])
+    @pytest.mark.parametrize("build", [session_response, daily_check_response, weekly_check_response])
+    async def test_matches_fastapi_serialization(self, monkeypatch, fast, build):
+        """Test that single models and lists encode identically to FastAPI."""
+        monkeypatch.setattr(settings, "fast_json_responses", fast)
+        item = build()
+        items = [item, build()]
+
+        assert model_response(item).body == await fastapi_body(type(item), item)
+        assert model_response(items).body == await fastapi_body(List[type(item)], items)
+
+    def test_formats(self):
+        """Test the wire formats of UUID, datetime and date fields."""
+        check = daily_check_response()
+
+        body = json.loads(model_response(check).body)
+
+        assert body["id"] == str(check.id)
+        assert body["check_date"] == "2024-03-04"
+        assert body["completed_at"] == "2024-03-04T09:30:15.123456Z"
+
+    def test_status_and_headers(self):
+        """Test that status codes and extra headers are applied."""
+        response = model_response([], status_code=201, headers={"X-Next-Cursor": "abc"})
+
+        assert response.status_code == 201
+        assert response.body == b"[]"
+        assert response.headers["x-next-cursor"] == "abc"
+        assert response.headers["content-type"] == "application/json"
+
+    def test_plain_content_uses_orjson(self):
+        """Test that dicts with UUIDs and dates are encoded directly."""
+        user_id = uuid4()
+
+        body = ModelJSONResponse({"id": user_id, "day": date(2024, 3, 4)}).body
+
+        assert json.loads(body) == {"id": str(user_id), "day": "2024-03-04"}
+
+
+class TestRecentSessionsEndpoint:
+    """Tests for the fast path on GET /sessions/recent."""
+
+    @pytest.fixture(autouse=True)
+    def signed_in(self):
+        """Authenticate every request as the sample user."""
+        app.dependency_overrides[get_current_user] = lambda: User(id=USER_ID, email="user@example.com")
+        yield
+        app.dependency_overrides.pop(get_current_user, None)
+
+    @pytest.mark.parametrize("fast", [True, False])
+    def test_page_with_cursor(self, client, monkeypatch, fast):
+        """Test that a full page returns the sessions and next cursor header."""
+        monkeypatch.setattr(settings, "fast_json_responses", fast)
+        sessions = [
+            Session(
+                id=uuid4(),
+                user_id=USER_ID,
+                setup_id=uuid4(),
+                start_time=NOW,
+                status="completed",
+                created_at=NOW,
+                updated_at=NOW
+            )
+            for _ in range(2)
+        ]
+        monkeypatch.setattr(session_service, "get_recent_sessions", AsyncMock(return_value=sessions))
+
+        response = client.get("/api/v1/sessions/recent?limit=2")
+
+        assert response.status_code == 200
+        assert [item["id"] for item in response.json()] == [str(s.id) for s in sessions]
+        assert response.json()[0]["start_time"] == "2024-03-04T09:30:15.123456Z"
+        assert "x-next-cursor" in response.headers
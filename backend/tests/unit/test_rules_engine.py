@@ -71,6 +71,13 @@ class TestCalculateSessionDuration:
         duration1 = calculate_session_duration(calm_setup, reduced_mode=True)
         duration2 = calculate_session_duration(calm_setup, reduced_mode=True)
         assert duration1 == duration2
+    
+    def test_matches_start_session_sql_rule(self, calm_setup):
+        """Test parity with the integer rule used by start_session() in SQL."""
+        for default in range(1, 121):
+            setup = calm_setup.model_copy(update={"default_session_duration": default})
+            assert calculate_session_duration(setup, reduced_mode=True) == (default * 6) // 10
+            assert calculate_session_duration(setup, reduced_mode=False) == default
 
 
 class TestShouldRecommendReducedMode:
@@ -0,0 +1,77 @@
+"""
+Unit tests for service query shape.
+
+Guards against wildcard selects creeping back into the services.
+"""
+import ast
+import importlib
+from pathlib import Path
+import pytest
+from models.user import UserProfile
+from services.supabase_client import columns
+
+SERVICES_DIR = Path(__file__).resolve().parents[2] / "services"
+SERVICE_MODULES = sorted(SERVICES_DIR.glob("*.py"))
+
+
+def select_calls(path):
+    """Yield (line, args) for every .select(...) call in a module."""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "select"
+        ):
+            yield node.lineno, node.args
+
+
+def select_list(arg, namespace):
+    """
+    Evaluate a select() argument against the module's globals.
+
+    Literals, module constants and f-strings built from them resolve to
+    their value; columns(model) names model fields by construction.
+    """
+    if isinstance(arg, ast.Call) and isinstance(arg.func, ast.Name) and arg.func.id == "columns":
+        return ""
+    try:
+        return str(eval(compile(ast.Expression(arg), "<select>", "eval"), namespace))
+    except NameError:
+        return None
+
+
+@pytest.mark.parametrize("path", SERVICE_MODULES, ids=lambda path: path.name)
+def test_no_wildcard_selects(path):
+    """Test that service queries name the columns they read."""
+    namespace = vars(importlib.import_module(f"services.{path.stem}"))
+    wildcards = []
+    unresolved = []
+    for line, args in select_calls(path):
+        for arg in args:
+            value = select_list(arg, namespace)
+            if value is None:
+                unresolved.append(line)
+            elif "*" in value:
+                wildcards.append(line)
+
+    assert wildcards == [], f"{path.name} selects '*' on lines {wildcards}"
+    assert unresolved == [], f"{path.name} builds select lists from locals on lines {unresolved}"
+
+
+@pytest.mark.parametrize("path", SERVICE_MODULES, ids=lambda path: path.name)
+def test_column_constants_name_columns(path):
+    """Test that no *_COLUMNS constant selects '*'."""
+    module = importlib.import_module(f"services.{path.stem}")
+    wildcards = [
+        name
+        for name, value in vars(module).items()
+        if name.endswith("_COLUMNS") and "*" in str(value)
+    ]
+
+    assert wildcards == [], f"{path.name} has wildcard select lists {wildcards}"
+
+
+def test_columns_lists_model_fields():
+    """Test that columns() names exactly the model fields."""
+    assert columns(UserProfile) == "id,email,created_at,updated_at"
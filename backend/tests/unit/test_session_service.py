@@ -0,0 +1,205 @@
+"""
+Unit tests for session service.
+
+Tests session start (Ignition) through the start_session database function.
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock
+from uuid import UUID, uuid4
+from postgrest.exceptions import APIError
+from services.session_service import SessionService
+from models.session import SessionCreate, SessionEnd
+
+
+@pytest.fixture
+def session_service():
+    """Create session service instance with mocked Supabase client."""
+    service = SessionService(supabase=Mock())
+    yield service
+
+
+@pytest.fixture
+def session_data():
+    """Provide session creation data."""
+    return SessionCreate(setup_id="660e8400-e29b-41d4-a716-446655440000")
+
+
+def mock_rpc(service, **execute_kwargs):
+    """Attach an rpc().execute() chain to the mocked client."""
+    mock_builder = Mock()
+    mock_builder.execute = AsyncMock(**execute_kwargs)
+    service.supabase.rpc.return_value = mock_builder
+    return mock_builder
+
+
+class TestStartSession:
+    """Tests for start_session function."""
+    
+    async def test_start_session_single_rpc_call(self, session_service, session_data):
+        """Test that starting a session makes exactly one database call."""
+        user_id = "550e8400-e29b-41d4-a716-446655440000"
+        now = datetime.utcnow().isoformat()
+        mock_rpc(session_service, return_value=Mock(data=[{
+            "id": str(uuid4()),
+            "user_id": user_id,
+            "setup_id": str(session_data.setup_id),
+            "start_time": now,
+            "end_time": None,
+            "duration_minutes": 15,
+            "next_step": None,
+            "status": "active",
+            "reduced_mode_active": True,
+            "created_at": now,
+            "updated_at": now
+        }]))
+        
+        session = await session_service.start_session(user_id, session_data)
+        
+        assert session.status == "active"
+        assert session.user_id == UUID(user_id)
+        assert session.duration_minutes == 15
+        session_service.supabase.rpc.assert_called_once_with("start_session", {
+            "p_user_id": user_id,
+            "p_setup_id": str(session_data.setup_id)
+        })
+        session_service.supabase.table.assert_not_called()
+    
+    async def test_active_session_conflict(self, session_service, session_data):
+        """Test that a unique violation maps to the concurrent session error."""
+        mock_rpc(session_service, side_effect=APIError({
+            "code": "23505",
+            "message": "Unable to start right now. Try again in a moment."
+        }))
+        
+        with pytest.raises(Exception, match="Unable to start right now"):
+            await session_service.start_session(
+                "550e8400-e29b-41d4-a716-446655440000",
+                session_data
+            )
+    
+    async def test_unknown_setup(self, session_service, session_data):
+        """Test that a missing setup maps to setup not found."""
+        mock_rpc(session_service, side_effect=APIError({
+            "code": "P0002",
+            "message": "Setup not found."
+        }))
+        
+        with pytest.raises(Exception, match="Setup not found"):
+            await session_service.start_session(
+                "550e8400-e29b-41d4-a716-446655440000",
+                session_data
+            )
+
+
+def session_row(status: str) -> dict:
+    """Build a sessions row as returned by the transition functions."""
+    now = datetime.utcnow().isoformat()
+    return {
+        "id": "880e8400-e29b-41d4-a716-446655440000",
+        "user_id": "550e8400-e29b-41d4-a716-446655440000",
+        "setup_id": "660e8400-e29b-41d4-a716-446655440000",
+        "start_time": now,
+        "end_time": now,
+        "duration_minutes": 25,
+        "next_step": "Review notes",
+        "status": status,
+        "reduced_mode_active": False,
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+class TestHasActiveSession:
+    """Tests for has_active_session function."""
+    
+    async def test_started_session_is_known_without_query(self, session_service, session_data):
+        """Test that after Ignition the check is answered from the user state cache."""
+        user_id = "550e8400-e29b-41d4-a716-446655440000"
+        now = datetime.utcnow().isoformat()
+        mock_rpc(session_service, return_value=Mock(data=[{
+            "id": str(uuid4()),
+            "user_id": user_id,
+            "setup_id": str(session_data.setup_id),
+            "start_time": now,
+            "end_time": None,
+            "duration_minutes": 25,
+            "next_step": None,
+            "status": "active",
+            "reduced_mode_active": False,
+            "created_at": now,
+            "updated_at": now
+        }]))
+        
+        await session_service.start_session(user_id, session_data)
+        
+        assert await session_service.has_active_session(user_id) is True
+        session_service.supabase.table.assert_not_called()
+    
+    async def test_returns_false_when_no_session(self, session_service):
+        """Test returns False when the user has no active session."""
+        query = session_service.supabase.table.return_value.select.return_value.eq.return_value.eq.return_value
+        query.execute = AsyncMock(return_value=Mock(data=[]))
+        
+        assert await session_service.has_active_session("550e8400-e29b-41d4-a716-446655440000") is False
+
+
+class TestSessionTransitions:
+    """Tests for end_session and abandon_session functions."""
+    
+    SESSION_ID = "880e8400-e29b-41d4-a716-446655440000"
+    USER_ID = "550e8400-e29b-41d4-a716-446655440000"
+    
+    async def test_end_session_single_rpc_call(self, session_service):
+        """Test that Braking is one conditional update."""
+        mock_rpc(session_service, return_value=Mock(data=[session_row("completed")]))
+        
+        session = await session_service.end_session(
+            self.SESSION_ID,
+            self.USER_ID,
+            SessionEnd(next_step="Review notes")
+        )
+        
+        assert session.status == "completed"
+        session_service.supabase.rpc.assert_called_once_with("end_session", {
+            "p_user_id": self.USER_ID,
+            "p_session_id": self.SESSION_ID,
+            "p_next_step": "Review notes"
+        })
+        session_service.supabase.table.assert_not_called()
+    
+    async def test_abandon_session_single_rpc_call(self, session_service):
+        """Test that abandon is one conditional update."""
+        mock_rpc(session_service, return_value=Mock(data=[session_row("abandoned")]))
+        
+        session = await session_service.abandon_session(self.SESSION_ID, self.USER_ID)
+        
+        assert session.status == "abandoned"
+        session_service.supabase.rpc.assert_called_once_with("abandon_session", {
+            "p_user_id": self.USER_ID,
+            "p_session_id": self.SESSION_ID
+        })
+        session_service.supabase.table.assert_not_called()
+    
+    @pytest.mark.parametrize("code,message", [
+        ("P0002", "Session not found"),
+        ("22P02", "Session not found"),
+        ("22023", "Session is not active"),
+    ])
+    async def test_transition_errors(self, session_service, code, message):
+        """Test that not found and not active are told apart by error code."""
+        mock_rpc(session_service, side_effect=APIError({"code": code, "message": "error"}))
+        
+        with pytest.raises(Exception, match=message):
+            await session_service.end_session(self.SESSION_ID, self.USER_ID, SessionEnd())
+        
+        with pytest.raises(Exception, match=message):
+            await session_service.abandon_session(self.SESSION_ID, self.USER_ID)
+    
+    async def test_other_errors_propagate(self, session_service):
+        """Test that unexpected database errors are re-raised unchanged."""
+        error = APIError({"code": "57014", "message": "canceling statement due to statement timeout"})
+        mock_rpc(session_service, side_effect=error)
+        
+        with pytest.raises(APIError):
+            await session_service.abandon_session(self.SESSION_ID, self.USER_ID)
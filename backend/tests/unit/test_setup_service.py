@@ -0,0 +1,199 @@
+"""
+Unit tests for setup service.
+
+Tests the in-memory setups catalogue, lookups, TTL refresh, and ETags.
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock
+from services.setup_service import ACTIVE_SETUP_COLUMNS, SetupService, setup_service as global_setup_service
+from models.setup import SetupActivate
+
+CALM_ID = "550e8400-e29b-41d4-a716-446655440001"
+VITALITY_ID = "550e8400-e29b-41d4-a716-446655440003"
+
+
+def setup_rows(calm_duration=25):
+    """Build setups table rows ordered by name."""
+    now = datetime.utcnow().isoformat()
+    return [
+        {
+            "id": CALM_ID,
+            "name": "Calm",
+            "description": "Default 25 minutes",
+            "default_session_duration": calm_duration,
+            "emphasis": "rest",
+            "is_preset": True,
+            "created_at": now
+        },
+        {
+            "id": VITALITY_ID,
+            "name": "Vitality",
+            "description": "Default 30 minutes",
+            "default_session_duration": 30,
+            "emphasis": "health",
+            "is_preset": True,
+            "created_at": now
+        },
+    ]
+
+
+def mock_setups_table(supabase, rows):
+    """Mock setups select().order().execute() and return the execute mock."""
+    execute = AsyncMock(return_value=Mock(data=rows))
+    supabase.table.return_value.select.return_value.order.return_value.execute = execute
+    return execute
+
+
+@pytest.fixture
+def setup_service():
+    """Create setup service instance with mocked Supabase client."""
+    service = SetupService(supabase=Mock())
+    yield service
+
+
+class TestSetupCatalogue:
+    """Tests for the setups catalogue."""
+
+    async def test_lookups_share_one_load(self, setup_service):
+        """Test that repeated lookups query the database once."""
+        execute = mock_setups_table(setup_service.supabase, setup_rows())
+
+        setups = await setup_service.get_available_setups()
+        calm = await setup_service.get_setup_by_name("Calm")
+        defaults = await setup_service.get_setup_defaults(VITALITY_ID)
+
+        assert [setup.name for setup in setups] == ["Calm", "Vitality"]
+        assert str(calm.id) == CALM_ID
+        assert defaults == {"duration": 30, "emphasis": "health", "name": "Vitality"}
+        assert execute.await_count == 1
+
+    async def test_unknown_lookups(self, setup_service):
+        """Test that unknown names and ids are not found."""
+        mock_setups_table(setup_service.supabase, setup_rows())
+
+        assert await setup_service.get_setup_by_name("Unknown") is None
+        assert await setup_service.get_setup_defaults("not-an-id") == {}
+
+    async def test_reloads_after_ttl(self, setup_service):
+        """Test that an expired catalogue is reloaded."""
+        execute = mock_setups_table(setup_service.supabase, setup_rows())
+        setup_service.catalogue_ttl = 0
+
+        await setup_service.get_available_setups()
+        await setup_service.get_available_setups()
+
+        assert execute.await_count == 2
+
+    async def test_failed_reload_serves_previous(self, setup_service):
+        """Test that a failed reload keeps serving the last catalogue."""
+        execute = mock_setups_table(setup_service.supabase, setup_rows())
+        setup_service.catalogue_ttl = 0
+        await setup_service.get_catalogue()
+
+        execute.side_effect = Exception("Database connection error")
+        setups = await setup_service.get_available_setups()
+
+        assert len(setups) == 2
+
+    async def test_etag_tracks_content(self, setup_service):
+        """Test that the ETag is stable for equal content and changes with it."""
+        mock_setups_table(setup_service.supabase, setup_rows())
+        first = await setup_service.refresh_catalogue()
+        second = await setup_service.refresh_catalogue()
+
+        mock_setups_table(setup_service.supabase, setup_rows(calm_duration=20))
+        changed = await setup_service.refresh_catalogue()
+
+        assert first.etag == second.etag
+        assert first.etag != changed.etag
+        assert first.etag.startswith('"')
+
+    async def test_catalogue_is_immutable(self, setup_service):
+        """Test that catalogue indexes cannot be modified."""
+        mock_setups_table(setup_service.supabase, setup_rows())
+        catalogue = await setup_service.get_catalogue()
+
+        with pytest.raises(TypeError):
+            catalogue.by_name["Calm"] = None
+
+
+class TestActivateSetup:
+    """Tests for activate_setup function."""
+
+    async def test_unknown_setup_raises_without_insert(self, setup_service):
+        """Test that activation of an unknown setup fails before inserting."""
+        mock_setups_table(setup_service.supabase, setup_rows())
+
+        with pytest.raises(Exception, match="Setup not found"):
+            await setup_service.activate_setup(
+                "550e8400-e29b-41d4-a716-446655440000",
+                SetupActivate(setup_id="660e8400-e29b-41d4-a716-446655440009")
+            )
+
+        setup_service.supabase.table.return_value.insert.assert_not_called()
+
+
+class TestGetActiveSetup:
+    """Tests for get_active_setup function."""
+
+    async def test_setup_embedded_in_one_query(self, setup_service):
+        """Test that the latest activation returns its setup without a second lookup."""
+        supabase = setup_service.supabase
+        query = supabase.table.return_value.select.return_value.eq.return_value.order.return_value
+        query.limit.return_value.execute = AsyncMock(return_value=Mock(data=[{"setup": setup_rows()[1]}]))
+
+        setup = await setup_service.get_active_setup("550e8400-e29b-41d4-a716-446655440000")
+
+        assert setup.name == "Vitality"
+        supabase.table.assert_called_once_with("user_setups")
+        supabase.table.return_value.select.assert_called_once_with(ACTIVE_SETUP_COLUMNS)
+        supabase.table.return_value.select.return_value.eq.return_value.order.assert_called_once_with(
+            "activated_at", desc=True
+        )
+
+    async def test_defaults_to_calm(self, setup_service):
+        """Test that a user who never activated a setup gets Calm."""
+        supabase = setup_service.supabase
+        query = supabase.table.return_value.select.return_value.eq.return_value.order.return_value
+        query.limit.return_value.execute = AsyncMock(return_value=Mock(data=[]))
+        mock_setups_table(supabase, setup_rows())
+
+        setup = await setup_service.get_active_setup("550e8400-e29b-41d4-a716-446655440000")
+
+        assert setup.name == "Calm"
+
+
+class TestSetupsEndpoint:
+    """Tests for ETag handling on GET /setups."""
+
+    @pytest.fixture(autouse=True)
+    def mocked_catalogue(self, monkeypatch):
+        """Serve the global setup service from mocked rows."""
+        supabase = Mock()
+        mock_setups_table(supabase, setup_rows())
+        monkeypatch.setattr(global_setup_service, "supabase", supabase)
+        monkeypatch.setattr(global_setup_service, "_catalogue", None)
+
+    def test_returns_strong_etag(self, client):
+        """Test that the list is served with a strong ETag."""
+        response = client.get("/api/v1/setups")
+
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('"')
+        assert len(response.json()) == 2
+
+    def test_matching_if_none_match_returns_304(self, client):
+        """Test that revalidation with the current ETag returns 304."""
+        etag = client.get("/api/v1/setups").headers["etag"]
+
+        response = client.get("/api/v1/setups", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_refresh_requires_admin_key(self, client):
+        """Test that catalogue refresh is rejected without the admin key."""
+        response = client.post("/api/v1/setups/refresh")
+
+        assert response.status_code == 403
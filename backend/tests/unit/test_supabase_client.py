@@ -0,0 +1,97 @@
+"""
+Unit tests for the shared Supabase client.
+
+Tests that services share one async client and its connection pool.
+"""
+import inspect
+from services.supabase_client import (
+    PoolStatsTransport,
+    SupabaseClient,
+    create_http_client,
+    get_supabase_client,
+)
+
+
+class TestSupabaseClient:
+    """Tests for SupabaseClient."""
+
+    def test_table_execute_is_awaitable(self):
+        """Test that table queries are built on the async PostgREST client."""
+        client = SupabaseClient("https://example.supabase.co", "test-key")
+
+        builder = client.table("sessions").select("*").eq("user_id", "abc")
+
+        assert inspect.iscoroutinefunction(builder.execute)
+
+    def test_auth_shares_connection_pool(self):
+        """Test that GoTrue reuses the PostgREST HTTP client."""
+        client = SupabaseClient("https://example.supabase.co/", "test-key")
+
+        assert client.auth._http_client is client.http_client
+        assert client.postgrest.session is client.http_client
+        assert client.url == "https://example.supabase.co"
+
+    def test_postgrest_requests_target_rest_endpoint(self):
+        """Test that the shared HTTP client is configured for PostgREST."""
+        client = SupabaseClient("https://example.supabase.co", "test-key")
+
+        assert str(client.http_client.base_url) == "https://example.supabase.co/rest/v1/"
+        assert client.http_client.headers["apikey"] == "test-key"
+        assert client.http_client.headers["Accept-Profile"] == "public"
+
+    def test_pool_stats_before_any_request(self):
+        """Test that a fresh pool reports no connections."""
+        client = SupabaseClient("https://example.supabase.co", "test-key")
+
+        stats = client.pool_stats()
+
+        assert stats["open_connections"] == 0
+        assert stats["idle_connections"] == 0
+        assert stats["in_flight_requests"] == 0
+        assert stats["requests_total"] == 0
+        assert stats["pool_wait_ms_avg"] == 0.0
+
+
+class TestCreateHttpClient:
+    """Tests for create_http_client function."""
+
+    def test_applies_pool_settings(self):
+        """Test that limits and timeouts come from settings."""
+        from config import settings
+
+        http_client = create_http_client()
+
+        assert isinstance(http_client._transport, PoolStatsTransport)
+        assert http_client._transport.max_connections == settings.supabase_max_connections
+        assert http_client.timeout.pool == settings.supabase_pool_timeout
+        assert http_client.timeout.connect == settings.supabase_connect_timeout
+
+
+class TestGetSupabaseClient:
+    """Tests for get_supabase_client function."""
+
+    def test_returns_same_instance(self):
+        """Test that the client is created once per process."""
+        assert get_supabase_client() is get_supabase_client()
+
+    def test_services_share_client(self):
+        """Test that all service singletons use the shared client."""
+        from services import (
+            auth_service,
+            daily_check_service,
+            session_service,
+            reduced_mode_service,
+            weekly_check_service,
+            setup_service,
+        )
+
+        shared = get_supabase_client()
+        for service in [
+            auth_service,
+            daily_check_service,
+            session_service,
+            reduced_mode_service,
+            weekly_check_service,
+            setup_service,
+        ]:
+            assert service.supabase is shared
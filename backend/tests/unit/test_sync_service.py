@@ -0,0 +1,187 @@
+"""
+Unit tests for sync service.
+
+Tests that a batch is applied through one apply_sync_batch() call and that
+per-operation results come back in order.
+"""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+import httpx
+import pytest
+from pydantic import ValidationError
+from benchmarks.fake_postgrest import CALM_SETUP_ID, create_app
+from config import settings
+from dependencies.auth import get_current_user
+from main import app
+from models.sync import SyncOperation
+from models.user import User
+from services.supabase_client import SupabaseClient
+from services.sync_service import SyncService, sync_service
+
+USER_ID = "550e8400-e29b-41d4-a716-446655440000"
+NOW = datetime(2024, 3, 4, 9, 30, tzinfo=timezone.utc).isoformat()
+
+
+def session_row(status: str = "active") -> dict:
+    return {
+        "id": str(uuid4()),
+        "user_id": USER_ID,
+        "setup_id": str(uuid4()),
+        "start_time": NOW,
+        "end_time": None,
+        "duration_minutes": 25,
+        "next_step": None,
+        "status": status,
+        "reduced_mode_active": False,
+        "created_at": NOW,
+        "updated_at": NOW,
+    }
+
+
+def mock_rpc(service, **execute_kwargs):
+    """Attach an rpc().execute() chain to the mocked client."""
+    mock_builder = Mock()
+    mock_builder.execute = AsyncMock(**execute_kwargs)
+    service.supabase.rpc.return_value = mock_builder
+    return mock_builder
+
+
+class TestSyncOperation:
+    """Tests for operation validation."""
+
+    def test_requires_fields_for_type(self):
+        """Test that each operation type requires the fields it acts on."""
+        with pytest.raises(ValidationError, match="end_session requires session_id"):
+            SyncOperation(idempotency_key="k1", type="end_session")
+
+        with pytest.raises(ValidationError, match="daily_check requires responses"):
+            SyncOperation(idempotency_key="k2", type="daily_check")
+
+    def test_rejects_unknown_type(self):
+        """Test that only the four queued actions are accepted."""
+        with pytest.raises(ValidationError):
+            SyncOperation(idempotency_key="k1", type="delete_account")
+
+
+class TestApplyBatch:
+    """Tests for apply_batch function."""
+
+    async def test_single_rpc_call(self):
+        """Test that the whole batch goes to the database in one call."""
+        service = SyncService(supabase=Mock())
+        session_id = uuid4()
+        started = session_row()
+        mock_rpc(service, return_value=Mock(data=[
+            {"idempotency_key": "k1", "type": "start_session", "status": "applied", "session": started},
+            {"idempotency_key": "k2", "type": "abandon_session", "status": "rejected", "error": "Session is not active."},
+            {"idempotency_key": "k3", "type": "daily_check", "status": "duplicate", "daily_check": {
+                "id": str(uuid4()),
+                "user_id": USER_ID,
+                "check_date": "2024-03-04",
+                "responses": {"energy": "low"},
+                "completed_at": NOW,
+                "created_at": NOW,
+            }},
+        ]))
+        operations = [
+            SyncOperation(idempotency_key="k1", type="start_session", setup_id=uuid4(), session_id=session_id),
+            SyncOperation(idempotency_key="k2", type="abandon_session", session_id=session_id),
+            SyncOperation(idempotency_key="k3", type="daily_check", responses={"energy": "low"}),
+        ]
+
+        results = await service.apply_batch(USER_ID, operations)
+
+        assert [result.status for result in results] == ["applied", "rejected", "duplicate"]
+        assert str(results[0].session.id) == started["id"]
+        assert results[1].error == "Session is not active."
+        assert results[2].daily_check.responses == {"energy": "low"}
+        service.supabase.rpc.assert_called_once()
+        name, params = service.supabase.rpc.call_args.args
+        assert name == "apply_sync_batch"
+        assert params["p_user_id"] == USER_ID
+        assert [op["idempotency_key"] for op in params["p_operations"]] == ["k1", "k2", "k3"]
+        assert params["p_operations"][1] == {
+            "idempotency_key": "k2",
+            "type": "abandon_session",
+            "session_id": str(session_id),
+        }
+
+    async def test_failure_propagates(self):
+        """Test that a failed batch raises so the client can resend it."""
+        service = SyncService(supabase=Mock())
+        mock_rpc(service, side_effect=Exception("connection reset"))
+
+        with pytest.raises(Exception, match="connection reset"):
+            await service.apply_batch(USER_ID, [
+                SyncOperation(idempotency_key="k1", type="daily_check", responses={})
+            ])
+
+    async def test_offline_day_against_stand_in(self):
+        """Test that a queued day replays in order and a resent batch is all duplicates."""
+        http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(latency_ms=0)))
+        service = SyncService(supabase=SupabaseClient("http://stand-in", "service-key", http_client=http_client))
+        user_id = str(uuid4())
+        session_id = uuid4()
+        started_at = datetime.now(timezone.utc) - timedelta(minutes=30)
+        operations = [
+            SyncOperation(
+                idempotency_key="k1", type="start_session", occurred_at=started_at,
+                setup_id=CALM_SETUP_ID, session_id=session_id
+            ),
+            SyncOperation(
+                idempotency_key="k2", type="end_session", occurred_at=started_at + timedelta(minutes=25),
+                session_id=session_id, next_step=""
+            ),
+            SyncOperation(idempotency_key="k3", type="abandon_session", session_id=session_id),
+            SyncOperation(idempotency_key="k4", type="daily_check", responses={"energy": "low"}),
+            SyncOperation(idempotency_key="k5", type="daily_check", responses={"energy": "high"}),
+        ]
+
+        try:
+            first = await service.apply_batch(user_id, operations)
+            second = await service.apply_batch(user_id, operations)
+        finally:
+            await service.supabase.aclose()
+
+        assert [result.status for result in first] == ["applied", "applied", "rejected", "applied", "rejected"]
+        assert first[1].session.id == session_id
+        assert first[1].session.duration_minutes == 25
+        assert first[1].session.next_step is None
+        assert first[2].error == "Session is not active."
+        assert first[4].error == "Already completed today."
+        assert {result.status for result in second} == {"duplicate"}
+        assert second[1].session == first[1].session
+
+
+class TestSyncEndpoint:
+    """Tests for POST /sync."""
+
+    @pytest.fixture(autouse=True)
+    def signed_in(self):
+        """Authenticate every request as the sample user."""
+        app.dependency_overrides[get_current_user] = lambda: User(id=USER_ID, email="user@example.com")
+        yield
+        app.dependency_overrides.pop(get_current_user, None)
+
+    def test_batch_limit(self, client, monkeypatch):
+        """Test that oversized batches are refused before touching the database."""
+        monkeypatch.setattr(settings, "sync_max_operations", 1)
+        apply_batch = AsyncMock()
+        monkeypatch.setattr(sync_service, "apply_batch", apply_batch)
+        operation = {"idempotency_key": "k", "type": "daily_check", "responses": {}}
+
+        response = client.post("/api/v1/sync", json={"operations": [operation, {**operation, "idempotency_key": "k2"}]})
+
+        assert response.status_code == 422
+        apply_batch.assert_not_awaited()
+
+    def test_unavailable(self, client, monkeypatch):
+        """Test that a failed batch maps to 503."""
+        monkeypatch.setattr(sync_service, "apply_batch", AsyncMock(side_effect=Exception("down")))
+
+        response = client.post("/api/v1/sync", json={"operations": [
+            {"idempotency_key": "k", "type": "daily_check", "responses": {}}
+        ]})
+
+        assert response.status_code == 503
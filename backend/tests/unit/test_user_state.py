@@ -0,0 +1,236 @@
+"""
+Unit tests for the per-user hot state cache.
+
+Tests read-through caching (including absent facts), expiry, races between
+loads and writes, service write-through, and invalidation from other workers.
+"""
+import asyncio
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+import pytest
+from models.daily_check import DailyCheckCreate
+from models.session import SessionCreate, SessionEnd
+from services import user_state as user_state_module
+from services.daily_check_service import DailyCheckService
+from services.events import Event, EventBackend, EventBus
+from services.reduced_mode_service import ReducedModeService
+from services.session_service import SessionService
+from services.user_state import ACTIVE_SESSION, REDUCED_MODE, TODAY_CHECK, UserStateCache, user_state
+
+USER_ID = "550e8400-e29b-41d4-a716-446655440000"
+NOW = datetime(2024, 3, 4, 9, 30, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def session_row(status: str) -> dict:
+    return {
+        "id": str(uuid4()),
+        "user_id": USER_ID,
+        "setup_id": str(uuid4()),
+        "start_time": NOW.isoformat(),
+        "end_time": None,
+        "duration_minutes": 25,
+        "next_step": None,
+        "status": status,
+        "reduced_mode_active": False,
+        "created_at": NOW.isoformat(),
+        "updated_at": NOW.isoformat(),
+    }
+
+
+class LocalBackend(EventBackend):
+    """Backend that keeps the relay callback instead of connecting anywhere."""
+
+    async def start(self, deliver):
+        self.deliver = deliver
+
+    async def publish(self, user_id, event):
+        pass
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return UserStateCache(max_users=10, ttl=10, clock=clock)
+
+
+class TestUserStateCache:
+    """Tests for UserStateCache."""
+
+    async def test_absence_is_cached(self, cache):
+        """Test that "no active session" is answered without a second load."""
+        load = AsyncMock(return_value=None)
+
+        assert await cache.get_or_load(USER_ID, ACTIVE_SESSION, load) is None
+        assert await cache.get_or_load(USER_ID, ACTIVE_SESSION, load) is None
+
+        load.assert_awaited_once()
+
+    async def test_errors_are_not_cached(self, cache):
+        """Test that a failed load is retried on the next read."""
+        load = AsyncMock(side_effect=[Exception("timeout"), "state"])
+
+        with pytest.raises(Exception, match="timeout"):
+            await cache.get_or_load(USER_ID, REDUCED_MODE, load)
+
+        assert await cache.get_or_load(USER_ID, REDUCED_MODE, load) == "state"
+
+    async def test_entries_expire(self, cache, clock):
+        """Test that the TTL forces a reload."""
+        load = AsyncMock(side_effect=["old", "new"])
+        await cache.get_or_load(USER_ID, REDUCED_MODE, load)
+
+        clock.now = 11
+
+        assert await cache.get_or_load(USER_ID, REDUCED_MODE, load) == "new"
+
+    async def test_other_scope_is_a_miss(self, cache):
+        """Test that yesterday's answer is not reused for today."""
+        load = AsyncMock(side_effect=["monday", "tuesday"])
+        await cache.get_or_load(USER_ID, TODAY_CHECK, load, scope=date(2024, 3, 4))
+
+        assert await cache.get_or_load(USER_ID, TODAY_CHECK, load, scope=date(2024, 3, 5)) == "tuesday"
+
+    async def test_write_during_load_wins(self, cache):
+        """Test that a load started before a write does not cache its stale result."""
+        release = asyncio.Event()
+
+        async def slow_load():
+            await release.wait()
+            return None
+
+        read = asyncio.create_task(cache.get_or_load(USER_ID, ACTIVE_SESSION, slow_load))
+        await asyncio.sleep(0)
+        cache.set(USER_ID, ACTIVE_SESSION, "started")
+        release.set()
+        await read
+
+        assert await cache.get_or_load(USER_ID, ACTIVE_SESSION, AsyncMock()) == "started"
+
+    async def test_invalidate_all_facts(self, cache):
+        """Test that invalidating a user drops every fact."""
+        cache.set(USER_ID, ACTIVE_SESSION, None)
+        cache.set(USER_ID, REDUCED_MODE, "state")
+        load = AsyncMock(return_value="reloaded")
+
+        cache.invalidate(USER_ID)
+
+        assert await cache.get_or_load(USER_ID, ACTIVE_SESSION, load) == "reloaded"
+        assert await cache.get_or_load(USER_ID, REDUCED_MODE, load) == "reloaded"
+
+    async def test_zero_size_disables(self):
+        """Test that USER_STATE_CACHE_MAX_USERS=0 always reads the database."""
+        cache = UserStateCache(max_users=0, ttl=10)
+        load = AsyncMock(return_value=None)
+
+        await cache.get_or_load(USER_ID, ACTIVE_SESSION, load)
+        await cache.get_or_load(USER_ID, ACTIVE_SESSION, load)
+
+        assert load.await_count == 2
+
+
+class TestWriteThrough:
+    """Tests that services keep the cache current with their own writes."""
+
+    async def test_session_lifecycle_skips_reads(self, cache):
+        """Test that after Ignition and Braking the active session is known without a query."""
+        service = SessionService(supabase=Mock(), state=cache)
+        started = session_row("active")
+        service.supabase.rpc.return_value.execute = AsyncMock(side_effect=[
+            Mock(data=[started]),
+            Mock(data=[{**started, "status": "completed"}]),
+        ])
+
+        await service.start_session(USER_ID, SessionCreate(setup_id=started["setup_id"]))
+        active = await service.get_active_session(USER_ID)
+        await service.end_session(started["id"], USER_ID, SessionEnd())
+        after = await service.get_active_session(USER_ID)
+
+        assert str(active.id) == started["id"]
+        assert after is None
+        service.supabase.table.assert_not_called()
+
+    async def test_failed_transition_invalidates(self, cache):
+        """Test that a rejected Braking drops the cached active session."""
+        service = SessionService(supabase=Mock(), state=cache)
+        service.supabase.rpc.return_value.execute = AsyncMock(side_effect=Exception("timeout"))
+        cache.set(USER_ID, ACTIVE_SESSION, "stale")
+
+        with pytest.raises(Exception):
+            await service.end_session(str(uuid4()), USER_ID, SessionEnd())
+
+        load = AsyncMock(return_value=None)
+        assert await cache.get_or_load(USER_ID, ACTIVE_SESSION, load) is None
+        load.assert_awaited_once()
+
+    async def test_daily_check_is_cached_for_today(self, cache):
+        """Test that today's check is served from the cache after it is created."""
+        service = DailyCheckService(supabase=Mock(), state=cache)
+        today = date.today()
+        service.supabase.table.return_value.upsert.return_value.execute = AsyncMock(return_value=Mock(data=[{
+            "id": str(uuid4()),
+            "user_id": USER_ID,
+            "check_date": today.isoformat(),
+            "responses": {"energy": "low"},
+            "completed_at": NOW.isoformat(),
+            "created_at": NOW.isoformat(),
+        }]))
+
+        created = await service.create_daily_check(USER_ID, DailyCheckCreate(responses={"energy": "low"}))
+
+        assert await service.get_today_check(USER_ID, today) == created
+        service.supabase.table.return_value.select.assert_not_called()
+
+    async def test_reduced_mode_toggle_updates_cache(self, cache):
+        """Test that a toggle's returned state answers the next read."""
+        service = ReducedModeService(supabase=Mock(), state=cache)
+        service.supabase.rpc.return_value.execute = AsyncMock(return_value=Mock(data=[{
+            "state": {
+                "id": str(uuid4()),
+                "user_id": USER_ID,
+                "is_active": True,
+                "activated_at": NOW.isoformat(),
+                "deactivated_at": None,
+                "created_at": NOW.isoformat(),
+                "updated_at": NOW.isoformat(),
+            },
+            "changed": True,
+        }]))
+
+        await service.activate_reduced_mode(USER_ID)
+        state = await service.get_reduced_mode_state(USER_ID)
+
+        assert state.is_active is True
+        service.supabase.table.assert_not_called()
+
+
+class TestRelayedInvalidation:
+    """Tests that writes seen on another worker drop this worker's entries."""
+
+    async def test_relayed_event_invalidates_user(self):
+        """Test that an event relayed from another worker clears the user's facts."""
+        backend = LocalBackend()
+        bus = EventBus(queue_size=4, backend=backend)
+        bus.add_relay_listener(user_state_module._invalidate_relayed)
+        await bus.start()
+        user_state.set(USER_ID, REDUCED_MODE, "stale")
+
+        backend.deliver(USER_ID, Event(type="reduced_mode.changed", data={"is_active": True}))
+
+        load = AsyncMock(return_value="fresh")
+        assert await user_state.get_or_load(USER_ID, REDUCED_MODE, load) == "fresh"
@@ -0,0 +1,73 @@
+"""
+Unit tests for weekly check service.
+
+Tests week statistics through the week_stats database function.
+"""
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock, Mock
+from services.weekly_check_service import WeeklyCheckService
+
+USER_ID = "550e8400-e29b-41d4-a716-446655440000"
+WEEK_START = date(2024, 1, 15)
+WEEK_END = date(2024, 1, 21)
+
+
+@pytest.fixture
+def weekly_check_service():
+    """Create weekly check service instance with mocked Supabase client."""
+    service = WeeklyCheckService(supabase=Mock())
+    yield service
+
+
+def mock_rpc(service, **execute_kwargs):
+    """Attach an rpc().execute() chain to the mocked client."""
+    mock_builder = Mock()
+    mock_builder.execute = AsyncMock(**execute_kwargs)
+    service.supabase.rpc.return_value = mock_builder
+    return mock_builder
+
+
+class TestGetWeekData:
+    """Tests for get_week_data function."""
+
+    async def test_single_aggregate_call(self, weekly_check_service):
+        """Test that week data is one RPC call returning the counters."""
+        counters = {
+            "sessions_completed": 40,
+            "sessions_abandoned": 3,
+            "sessions_with_next_step": 38,
+            "daily_checks_completed": 7
+        }
+        mock_rpc(weekly_check_service, return_value=Mock(data=[counters]))
+
+        week_data = await weekly_check_service.get_week_data(USER_ID, WEEK_START, WEEK_END)
+
+        assert week_data == counters
+        weekly_check_service.supabase.rpc.assert_called_once_with("week_stats", {
+            "p_user_id": USER_ID,
+            "p_week_start": "2024-01-15",
+            "p_week_end": "2024-01-21"
+        })
+        weekly_check_service.supabase.table.assert_not_called()
+
+    async def test_null_counters_default_to_zero(self, weekly_check_service):
+        """Test that missing or null counters are reported as zero."""
+        mock_rpc(weekly_check_service, return_value=Mock(data=[{"sessions_completed": None}]))
+
+        week_data = await weekly_check_service.get_week_data(USER_ID, WEEK_START, WEEK_END)
+
+        assert week_data == {
+            "sessions_completed": 0,
+            "sessions_abandoned": 0,
+            "sessions_with_next_step": 0,
+            "daily_checks_completed": 0
+        }
+
+    async def test_database_error_returns_zeros(self, weekly_check_service):
+        """Test that a database error yields zero counters."""
+        mock_rpc(weekly_check_service, side_effect=Exception("Database connection error"))
+
+        week_data = await weekly_check_service.get_week_data(USER_ID, WEEK_START, WEEK_END)
+
+        assert set(week_data.values()) == {0}
@@ -113,8 +113,8 @@ class ApiClient {
     return request;
   }
 
-  async post<T>(url: string, data?: unknown): Promise<T> {
-    const response = await this.client.post<T>(url, data);
+  async post<T>(url: string, data?: unknown, idempotencyKey?: string): Promise<T> {
+    const response = await this.client.post<T>(url, data, this.idempotencyConfig(idempotencyKey));
     
     // Invalidate related cache entries
     this.invalidateRelatedCache(url);
@@ -122,8 +122,8 @@ class ApiClient {
     return response.data;
   }
 
-  async patch<T>(url: string, data?: unknown): Promise<T> {
-    const response = await this.client.patch<T>(url, data);
+  async patch<T>(url: string, data?: unknown, idempotencyKey?: string): Promise<T> {
+    const response = await this.client.patch<T>(url, data, this.idempotencyConfig(idempotencyKey));
     
     // Invalidate related cache entries
     this.invalidateRelatedCache(url);
@@ -131,8 +131,8 @@ class ApiClient {
     return response.data;
   }
 
-  async delete<T>(url: string): Promise<T> {
-    const response = await this.client.delete<T>(url);
+  async delete<T>(url: string, idempotencyKey?: string): Promise<T> {
+    const response = await this.client.delete<T>(url, this.idempotencyConfig(idempotencyKey));
     
     // Invalidate related cache entries
     this.invalidateRelatedCache(url);
@@ -148,6 +148,14 @@ class ApiClient {
     return `${method}:${url}${paramString}`;
   }
 
+  /**
+   * Request config sending an Idempotency-Key, so the server replays the
+   * original response if a retry of this request already succeeded
+   */
+  private idempotencyConfig(idempotencyKey?: string) {
+    return idempotencyKey ? { headers: { 'Idempotency-Key': idempotencyKey } } : undefined;
+  }
+
   /**
    * Invalidate cache entries related to a URL
    */
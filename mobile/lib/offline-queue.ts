@@ -17,9 +17,27 @@ export interface QueuedChange {
   retryCount: number;
 }
 
+type SyncOperationType = 'start_session' | 'end_session' | 'abandon_session' | 'daily_check';
+
+interface SyncOperation {
+  idempotency_key: string;
+  type: SyncOperationType;
+  occurred_at: string;
+  [field: string]: unknown;
+}
+
+interface SyncOperationResult {
+  idempotency_key: string;
+  status: 'applied' | 'rejected' | 'duplicate';
+  error?: string | null;
+}
+
 const QUEUE_KEY = '@makana_offline_queue';
 const MAX_RETRIES = 3;
 const RETRY_DELAY_MS = 2000; // 2 seconds base delay
+const SYNC_BATCH_SIZE = 100; // matches the backend's SYNC_MAX_OPERATIONS default
+
+const SESSION_ACTION_URL = /^\/sessions\/([^/]+)\/(end|abandon)$/;
 
 class OfflineQueueManager {
   private queue: QueuedChange[] = [];
@@ -131,6 +149,10 @@ class OfflineQueueManager {
 
   /**
    * Sync all queued changes to server
+   *
+   * Session and daily check actions are sent together to /sync, so a long
+   * offline stretch replays in one request per batch instead of one per action.
+   * Other changes are replayed individually, in order.
    */
   public async syncQueue(): Promise<void> {
     if (this.isSyncing || !this.isOnline || this.queue.length === 0) {
@@ -141,27 +163,41 @@ class OfflineQueueManager {
     console.log(`Starting sync of ${this.queue.length} queued changes`);
 
     const failedChanges: QueuedChange[] = [];
+    let batch: QueuedChange[] = [];
+
+    const flush = async () => {
+      if (batch.length > 0) {
+        failedChanges.push(...(await this.syncBatch(batch)));
+        batch = [];
+      }
+    };
 
     for (const change of this.queue) {
+      if (this.toSyncOperation(change)) {
+        batch.push(change);
+        if (batch.length >= SYNC_BATCH_SIZE) {
+          await flush();
+        }
+        continue;
+      }
+
+      // Keep order: anything batched before this change goes first
+      await flush();
+
       try {
         await this.syncChange(change);
         console.log(`Synced ${change.method} ${change.url}`);
       } catch (error) {
         console.error(`Failed to sync ${change.method} ${change.url}:`, error);
-        
-        change.retryCount++;
-        
-        if (change.retryCount < MAX_RETRIES) {
-          failedChanges.push(change);
-        } else {
-          console.error(`Max retries reached for ${change.method} ${change.url}, dropping`);
-        }
+        this.retryLater(change, failedChanges);
       }
 
       // Small delay between requests to avoid overwhelming server
       await this.delay(100);
     }
 
+    await flush();
+
     this.queue = failedChanges;
     await this.saveQueue();
     this.isSyncing = false;
@@ -175,6 +211,74 @@ class OfflineQueueManager {
     }
   }
 
+  /**
+   * Send a batch of session and daily check actions to /sync
+   *
+   * Returns the changes to retry. Changes the server rejected (e.g. the
+   * session was already ended elsewhere) are dropped; retrying cannot help.
+   */
+  private async syncBatch(changes: QueuedChange[]): Promise<QueuedChange[]> {
+    const { apiClient } = await import('./api-client');
+    const operations = changes.map(change => this.toSyncOperation(change) as SyncOperation);
+
+    try {
+      const { results } = await apiClient.post<{ results: SyncOperationResult[] }>('/sync', { operations });
+
+      for (const result of results) {
+        if (result.status === 'rejected') {
+          console.warn(`Sync rejected ${result.idempotency_key}: ${result.error}`);
+        }
+      }
+      console.log(`Synced batch of ${changes.length} changes`);
+      return [];
+    } catch (error) {
+      // Nothing in a failed batch was applied, so all of it can be resent
+      console.error(`Failed to sync batch of ${changes.length} changes:`, error);
+      const failed: QueuedChange[] = [];
+      changes.forEach(change => this.retryLater(change, failed));
+      return failed;
+    }
+  }
+
+  /**
+   * Map a queued request to a /sync operation, or null if /sync does not handle it
+   */
+  private toSyncOperation(change: QueuedChange): SyncOperation | null {
+    const base = {
+      idempotency_key: change.id,
+      occurred_at: new Date(change.timestamp).toISOString(),
+    };
+    const data = (change.data ?? {}) as Record<string, unknown>;
+
+    if (change.method === 'POST' && change.url === '/sessions') {
+      return { ...base, type: 'start_session', ...data };
+    }
+    if (change.method === 'POST' && change.url === '/daily-check') {
+      return { ...base, type: 'daily_check', ...data };
+    }
+
+    const match = change.method === 'PATCH' ? SESSION_ACTION_URL.exec(change.url) : null;
+    if (match) {
+      const type = match[2] === 'end' ? 'end_session' : 'abandon_session';
+      return { ...base, type, session_id: match[1], ...data };
+    }
+
+    return null;
+  }
+
+  /**
+   * Requeue a failed change unless it has used up its retries
+   */
+  private retryLater(change: QueuedChange, failedChanges: QueuedChange[]): void {
+    change.retryCount++;
+
+    if (change.retryCount < MAX_RETRIES) {
+      failedChanges.push(change);
+    } else {
+      console.error(`Max retries reached for ${change.method} ${change.url}, dropping`);
+    }
+  }
+
   /**
    * Sync a single change to the server
    */
@@ -183,13 +287,13 @@ class OfflineQueueManager {
 
     switch (change.method) {
       case 'POST':
-        await apiClient.post(change.url, change.data);
+        await apiClient.post(change.url, change.data, change.id);
         break;
       case 'PATCH':
-        await apiClient.patch(change.url, change.data);
+        await apiClient.patch(change.url, change.data, change.id);
         break;
       case 'DELETE':
-        await apiClient.delete(change.url);
+        await apiClient.delete(change.url, change.id);
         break;
     }
   }
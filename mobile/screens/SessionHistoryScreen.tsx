@@ -25,6 +25,7 @@ interface Session {
   duration_minutes: number;
   next_step: string | null;
   status: 'completed' | 'abandoned';
+  setup: { id: string; name: string; emphasis: string } | null;
 }
 
 interface SessionHistoryScreenProps {
@@ -97,6 +98,7 @@ export function SessionHistoryScreen({ navigation }: SessionHistoryScreenProps)
                           hour: 'numeric',
                           minute: '2-digit',
                         })}
+                        {session.setup && ` · ${session.setup.name}`}
                       </Text>
                     </View>
                     <Text style={styles.duration}>
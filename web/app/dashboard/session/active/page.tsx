@@ -13,6 +13,7 @@ import { Container } from '@/components/ui/container';
 import { Card } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
 import { useAuth } from '@/hooks/useAuth';
+import { useSessionEvents } from '@/hooks/useSessionEvents';
 import { apiClient } from '@/lib/api-client';
 
 export default function ActiveSessionPage() {
@@ -68,6 +69,13 @@ export default function ActiveSessionPage() {
     }
   }, [isAuthenticated, router]);
 
+  // Leave when this session is ended or abandoned on another device
+  useSessionEvents((type, data) => {
+    if ((type === 'session.ended' || type === 'session.abandoned') && data.id === sessionId) {
+      router.push('/dashboard/session');
+    }
+  }, isAuthenticated && sessionId !== null);
+
   useEffect(() => {
     // Countdown timer
     if (timeRemaining <= 0 || fetchingSession) return;
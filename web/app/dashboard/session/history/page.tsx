@@ -22,6 +22,7 @@ interface Session {
   duration_minutes: number;
   next_step: string | null;
   status: 'completed' | 'abandoned';
+  setup: { id: string; name: string; emphasis: string } | null;
 }
 
 export default function SessionHistoryPage() {
@@ -105,6 +106,7 @@ export default function SessionHistoryPage() {
                         hour: 'numeric',
                         minute: '2-digit',
                       })}
+                      {session.setup && ` · ${session.setup.name}`}
                     </p>
                   </div>
                   <span className="text-base font-medium text-[#1f1f1f]">
@@ -0,0 +1,91 @@
+/**
+ * useSessionEvents Hook
+ * 
+ * Subscribes to the backend's live event stream (/me/events) so pages learn
+ * about sessions started or ended on another device without polling.
+ * Reconnects automatically while the component is mounted.
+ */
+
+import { useEffect, useRef } from 'react';
+import { API_BASE_URL, apiClient } from '@/lib/api-client';
+import { apiCache } from '@/lib/api-cache';
+
+export type SessionEventType =
+  | 'snapshot'
+  | 'session.started'
+  | 'session.ended'
+  | 'session.abandoned'
+  | 'reduced_mode.changed';
+
+export type SessionEventHandler = (type: SessionEventType, data: any) => void;
+
+const RECONNECT_DELAY_MS = 3000;
+
+export function useSessionEvents(onEvent: SessionEventHandler, enabled = true) {
+  // Latest handler without reconnecting when it changes
+  const handlerRef = useRef(onEvent);
+  handlerRef.current = onEvent;
+
+  useEffect(() => {
+    if (!enabled) return;
+
+    const controller = new AbortController();
+
+    const dispatch = (frame: string) => {
+      let type = 'message';
+      const data: string[] = [];
+
+      for (const line of frame.split('\n')) {
+        if (line.startsWith('event: ')) type = line.slice(7);
+        else if (line.startsWith('data: ')) data.push(line.slice(6));
+      }
+
+      // Comments (keep-alives) and retry hints carry no data
+      if (data.length === 0) return;
+
+      if (type !== 'snapshot') {
+        // Cached reads of the changed state are now stale
+        apiCache.invalidatePattern(type.startsWith('session.') ? /\/sessions/ : /\/reduced-mode/);
+      }
+      handlerRef.current(type as SessionEventType, JSON.parse(data.join('\n')));
+    };
+
+    const connect = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          const token = apiClient.getToken();
+          const response = await fetch(`${API_BASE_URL}/api/v1/me/events`, {
+            headers: token ? { Authorization: `Bearer ${token}` } : {},
+            signal: controller.signal,
+          });
+
+          if (response.ok && response.body) {
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+
+            while (true) {
+              const { done, value } = await reader.read();
+              if (done) break;
+
+              buffer += decoder.decode(value, { stream: true });
+              let end;
+              while ((end = buffer.indexOf('\n\n')) !== -1) {
+                dispatch(buffer.slice(0, end));
+                buffer = buffer.slice(end + 2);
+              }
+            }
+          }
+        } catch (error) {
+          if (controller.signal.aborted) return;
+        }
+
+        await new Promise(resolve => setTimeout(resolve, RECONNECT_DELAY_MS));
+      }
+    };
+
+    connect();
+
+    return () => controller.abort();
+  }, [enabled]);
+}
@@ -11,7 +11,7 @@
 import axios, { AxiosInstance, AxiosError } from 'axios';
 import { apiCache, CacheKeys } from './api-cache';
 
-const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+export const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
 export interface ApiError {
   code: string;